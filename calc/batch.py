@@ -0,0 +1,341 @@
+"""
+🔥 SmashBuilder - Cálculo em Lote 🔥
+Representação matricial de builds (builds × StatType) para cálculos vetorizados
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+try:
+    from .models import (
+        ChampionStats, Build, FinalStats, StatType, ModifierType,
+        STAT_INDEX, NUM_STATS
+    )
+except ImportError:
+    # Fallback para execução direta
+    from models import (
+        ChampionStats, Build, FinalStats, StatType, ModifierType,
+        STAT_INDEX, NUM_STATS
+    )
+
+MAX_LEVEL = 18
+
+# Atributos do campeão que alimentam cada coluna (base, crescimento)
+CHAMPION_STAT_FIELDS = {
+    StatType.AD: ("base_ad", "growth_ad"),
+    StatType.AP: ("base_ap", "growth_ap"),
+    StatType.AS: ("base_as", "growth_as"),
+    StatType.HP: ("base_hp", "growth_hp"),
+    StatType.MANA: ("base_mana", "growth_mana"),
+    StatType.ARMOR: ("base_armor", "growth_armor"),
+    StatType.MR: ("base_mr", "growth_mr"),
+    StatType.MS: ("base_ms", "growth_ms"),
+}
+
+# Valores fixos independentes do campeão
+DEFAULT_BASE_STATS = {
+    StatType.CRIT_CHANCE: 0.0,
+    StatType.CRIT_DAMAGE: 200.0,  # 200% é o padrão
+}
+
+def champion_vectors(champion: ChampionStats) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converte um campeão em vetores de base e crescimento na ordem STAT_ORDER
+    O crescimento de AS é percentual; os demais são aditivos
+    """
+    base = np.zeros(NUM_STATS)
+    growth = np.zeros(NUM_STATS)
+
+    for stat, (base_field, growth_field) in CHAMPION_STAT_FIELDS.items():
+        base[STAT_INDEX[stat]] = getattr(champion, base_field)
+        growth[STAT_INDEX[stat]] = getattr(champion, growth_field)
+
+    for stat, value in DEFAULT_BASE_STATS.items():
+        base[STAT_INDEX[stat]] = value
+
+    return base, growth
+
+def champion_key(champion: ChampionStats) -> Tuple[float, ...]:
+    """Valores de base e crescimento que definem a tabela de níveis do campeão"""
+    return tuple(getattr(champion, field) for fields in CHAMPION_STAT_FIELDS.values() for field in fields)
+
+def level_table(champion: ChampionStats) -> np.ndarray:
+    """
+    Retorna a tabela (18 × StatType) de stats base do campeão por nível
+    Linha level - 1 = base + growth * (level - 1); calculada uma vez e
+    guardada no próprio campeão (somente leitura), junto com champion_key:
+    cópias (model_copy) ou edições dos stats recalculam a tabela
+    """
+    key = champion_key(champion)
+    cached = champion._level_table
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    base, growth = champion_vectors(champion)
+    level_multiplier = np.arange(MAX_LEVEL, dtype=float)
+
+    table = base + (growth * level_multiplier[:, None])
+    as_column = STAT_INDEX[StatType.AS]
+    table[:, as_column] = base[as_column] * (1 + (growth[as_column] * level_multiplier / 100))
+
+    table.flags.writeable = False
+    champion._level_table = (key, table)
+
+    return table
+
+def pack_modifiers(modifiers: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Empacota modificadores em camadas densas (camadas × StatType)
+
+    A camada k contém o k-ésimo modificador de cada stat, preservando a ordem
+    de aplicação por stat. Camadas flat usam 0.0 como neutro e camadas
+    percentuais guardam o fator (1 + valor / 100), com 1.0 como neutro.
+    """
+    flat_values: Dict[int, List[float]] = {}
+    percent_factors: Dict[int, List[float]] = {}
+
+    for modifier in modifiers:
+        column = STAT_INDEX[modifier.stat]
+        if modifier.modifier_type == ModifierType.FLAT:
+            flat_values.setdefault(column, []).append(modifier.value)
+        elif modifier.modifier_type == ModifierType.PERCENT:
+            percent_factors.setdefault(column, []).append(1 + modifier.value / 100)
+
+    flat_layers = max((len(values) for values in flat_values.values()), default=0)
+    percent_layers = max((len(values) for values in percent_factors.values()), default=0)
+
+    flat = np.zeros((flat_layers, NUM_STATS))
+    for column, values in flat_values.items():
+        flat[:len(values), column] = values
+
+    percent = np.ones((percent_layers, NUM_STATS))
+    for column, values in percent_factors.items():
+        percent[:len(values), column] = values
+
+    return flat, percent
+
+class CompiledModifiers:
+    """
+    Modificadores de um item/runa compilados em vetores densos sobre STAT_ORDER
+    flat: linhas de soma; percent: linhas de fatores multiplicativos
+    flat_vector/percent_vector: as linhas combinadas em um único vetor
+    """
+
+    __slots__ = ("flat", "percent", "touched", "flat_vector", "percent_vector")
+
+    def __init__(self, flat: np.ndarray, percent: np.ndarray, touched: np.ndarray):
+        self.flat = flat
+        self.percent = percent
+        self.touched = touched  # Stats alterados por algum modificador
+        self.flat_vector = flat.sum(axis=0) if flat.shape[0] else np.zeros(NUM_STATS)
+        self.percent_vector = percent.prod(axis=0) if percent.shape[0] else np.ones(NUM_STATS)
+
+    @classmethod
+    def from_modifiers(cls, modifiers: Sequence) -> "CompiledModifiers":
+        """Compila uma lista de modificadores"""
+        flat, percent = pack_modifiers(modifiers)
+        touched = np.zeros(NUM_STATS, dtype=bool)
+        for modifier in modifiers:
+            if modifier.modifier_type in (ModifierType.FLAT, ModifierType.PERCENT):
+                touched[STAT_INDEX[modifier.stat]] = True
+
+        return cls(flat, percent, touched)
+
+def modifiers_key(modifiers: Sequence) -> Tuple[Tuple[StatType, float, ModifierType], ...]:
+    """Conteúdo dos modificadores que define a compilação"""
+    return tuple((modifier.stat, modifier.value, modifier.modifier_type) for modifier in modifiers)
+
+def compile_modifiers(owner) -> CompiledModifiers:
+    """
+    Retorna os modificadores compilados de um Item ou RunePreset
+    A compilação é guardada no próprio objeto junto com modifiers_key:
+    cópias (model_copy) ou edições dos modificadores recompilam
+    """
+    key = modifiers_key(owner.modifiers)
+    cached = owner._compiled
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    compiled = CompiledModifiers.from_modifiers(owner.modifiers)
+    owner._compiled = (key, compiled)
+    return compiled
+
+def _concat_compiled(compiled: Sequence[CompiledModifiers]) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatena as linhas flat e percentuais de vários objetos compilados"""
+    flat = np.concatenate([c.flat for c in compiled]) if compiled else np.zeros((0, NUM_STATS))
+    percent = np.concatenate([c.percent for c in compiled]) if compiled else np.ones((0, NUM_STATS))
+    return flat, percent
+
+def _stack_layers(layers: List[np.ndarray], neutral: float) -> np.ndarray:
+    """Empilha camadas de tamanhos diferentes em um array (builds × camadas × StatType)"""
+    depth = max((layer.shape[0] for layer in layers), default=0)
+    stacked = np.full((len(layers), depth, NUM_STATS), neutral)
+
+    for row, layer in enumerate(layers):
+        stacked[row, :layer.shape[0]] = layer
+
+    return stacked
+
+# Janela do empate em round_half_even, em unidades de np.spacing do valor escalado
+ROUNDING_TIE_ULPS = 4
+
+def round_half_even(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """
+    Arredonda um array reproduzindo exatamente o round() do Python
+
+    np.round escala o valor antes de arredondar; perto de um empate a escala
+    pode mudar o lado do arredondamento. Esses casos raros são refeitos com
+    round() elemento a elemento. A janela do empate acompanha a precisão do
+    valor escalado (alguns np.spacing), então vale para qualquer magnitude.
+    """
+    values = np.asarray(values, dtype=float)
+
+    # Estouros da escala (valores enormes) são refeitos abaixo
+    with np.errstate(invalid="ignore", over="ignore"):
+        rounded = np.round(values, ndigits)
+        scaled = values * (10.0 ** ndigits)
+        distance_to_tie = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5)
+        tolerance = ROUNDING_TIE_ULPS * np.spacing(np.abs(scaled))
+    ambiguous = np.isfinite(values) & ((distance_to_tie <= tolerance) | (np.abs(scaled) >= 2.0 ** 52))
+
+    if ambiguous.any():
+        flat_rounded = rounded.reshape(-1)
+        flat_values = values.reshape(-1)
+        for index in np.flatnonzero(ambiguous.reshape(-1)):
+            flat_rounded[index] = round(float(flat_values[index]), ndigits)
+
+    return rounded
+
+class BuildMatrix:
+    """N builds empilhadas como matrizes (builds × StatType)"""
+
+    __slots__ = (
+        "base", "growth", "levels",
+        "item_flat", "item_percent", "rune_flat", "rune_percent",
+        "target_hp", "target_armor",
+    )
+
+    def __init__(self, base: np.ndarray, growth: np.ndarray, levels: np.ndarray,
+                 item_flat: np.ndarray, item_percent: np.ndarray,
+                 rune_flat: Optional[np.ndarray] = None, rune_percent: Optional[np.ndarray] = None,
+                 target_hp: Optional[np.ndarray] = None, target_armor: Optional[np.ndarray] = None):
+        size = base.shape[0]
+
+        self.base = base
+        self.growth = growth
+        self.levels = np.asarray(levels, dtype=np.int64)
+        self.item_flat = item_flat
+        self.item_percent = item_percent
+        self.rune_flat = rune_flat if rune_flat is not None else np.zeros((size, 0, NUM_STATS))
+        self.rune_percent = rune_percent if rune_percent is not None else np.ones((size, 0, NUM_STATS))
+        # NaN indica build sem alvo (DPS/TTK não calculados)
+        self.target_hp = target_hp if target_hp is not None else np.full(size, np.nan)
+        self.target_armor = target_armor if target_armor is not None else np.full(size, np.nan)
+
+    def __len__(self) -> int:
+        return self.base.shape[0]
+
+    @classmethod
+    def from_builds(cls, builds: Sequence[Build]) -> "BuildMatrix":
+        """Monta a matriz a partir de builds já validadas"""
+        size = len(builds)
+        base = np.zeros((size, NUM_STATS))
+        growth = np.zeros((size, NUM_STATS))
+        item_layers = []
+        rune_layers = []
+        target_hp = np.full(size, np.nan)
+        target_armor = np.full(size, np.nan)
+
+        for row, build in enumerate(builds):
+            base[row], growth[row] = champion_vectors(build.champion)
+            item_layers.append(_concat_compiled([compile_modifiers(item) for item in build.items]))
+            rune_layers.append(_concat_compiled([compile_modifiers(build.runes)] if build.runes else []))
+
+            if build.target:
+                target_hp[row] = build.target.hp
+                target_armor[row] = build.target.armor
+
+        return cls(
+            base=base,
+            growth=growth,
+            levels=np.array([build.level for build in builds], dtype=np.int64),
+            item_flat=_stack_layers([flat for flat, _ in item_layers], 0.0),
+            item_percent=_stack_layers([percent for _, percent in item_layers], 1.0),
+            rune_flat=_stack_layers([flat for flat, _ in rune_layers], 0.0),
+            rune_percent=_stack_layers([percent for _, percent in rune_layers], 1.0),
+            target_hp=target_hp,
+            target_armor=target_armor,
+        )
+
+    def with_levels(self, levels: Sequence[int]) -> "BuildMatrix":
+        """
+        Repete cada build em cada nível (linhas build-major: build b no nível
+        levels[j] fica na linha b * len(levels) + j)
+        """
+        count = len(levels)
+
+        def repeat(values: np.ndarray) -> np.ndarray:
+            return np.repeat(values, count, axis=0)
+
+        return BuildMatrix(
+            base=repeat(self.base),
+            growth=repeat(self.growth),
+            levels=np.tile(np.asarray(levels, dtype=np.int64), len(self)),
+            item_flat=repeat(self.item_flat),
+            item_percent=repeat(self.item_percent),
+            rune_flat=repeat(self.rune_flat),
+            rune_percent=repeat(self.rune_percent),
+            target_hp=repeat(self.target_hp),
+            target_armor=repeat(self.target_armor),
+        )
+
+class BatchStats:
+    """Resultado de calculate_final_stats_batch: uma linha por build"""
+
+    __slots__ = ("levels", "stats", "dps", "ttk", "effective_hp_physical", "effective_hp_magical", "groups")
+
+    def __init__(self, levels: np.ndarray, stats: np.ndarray, dps: np.ndarray, ttk: np.ndarray,
+                 effective_hp_physical: np.ndarray, effective_hp_magical: np.ndarray, groups=None):
+        self.levels = levels
+        self.stats = stats
+        self.dps = dps
+        self.ttk = ttk
+        self.effective_hp_physical = effective_hp_physical
+        self.effective_hp_magical = effective_hp_magical
+        # Grupos de builds equivalentes (calc.dedup.StatGroups) quando calculado com dedup
+        self.groups = groups
+
+    def __len__(self) -> int:
+        return self.stats.shape[0]
+
+    def column(self, stat: StatType) -> np.ndarray:
+        """Retorna a coluna de um stat para todas as builds"""
+        return self.stats[:, STAT_INDEX[stat]]
+
+    def to_final_stats(self, index: int, trusted: bool = False) -> FinalStats:
+        """Converte uma linha do lote no modelo FinalStats"""
+        row = self.stats[index]
+
+        constructor = FinalStats.trusted if trusted else FinalStats
+        final_stats = constructor(
+            level=int(self.levels[index]),
+            ad=float(row[STAT_INDEX[StatType.AD]]),
+            ap=float(row[STAT_INDEX[StatType.AP]]),
+            as_=float(row[STAT_INDEX[StatType.AS]]),
+            crit_chance=float(row[STAT_INDEX[StatType.CRIT_CHANCE]]),
+            crit_damage=float(row[STAT_INDEX[StatType.CRIT_DAMAGE]]),
+            hp=float(row[STAT_INDEX[StatType.HP]]),
+            mana=float(row[STAT_INDEX[StatType.MANA]]),
+            armor=float(row[STAT_INDEX[StatType.ARMOR]]),
+            mr=float(row[STAT_INDEX[StatType.MR]]),
+            ms=float(row[STAT_INDEX[StatType.MS]]),
+        )
+
+        if not np.isnan(self.dps[index]):
+            final_stats.dps = float(self.dps[index])
+            final_stats.ttk = float(self.ttk[index])
+
+        final_stats.effective_hp_physical = float(self.effective_hp_physical[index])
+        final_stats.effective_hp_magical = float(self.effective_hp_magical[index])
+
+        return final_stats
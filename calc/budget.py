@@ -0,0 +1,301 @@
+"""
+🔥 SmashBuilder - Otimização por Orçamento 🔥
+Melhores builds por faixa de gold (mochila com poda por dominância)
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+from functools import reduce
+import heapq
+import math
+import numpy as np
+
+try:
+    from .models import ChampionStats, Item, RunePreset, Target, Build, StatType, PRESET_TARGETS, STAT_INDEX
+    from .formulas import FormulaEngine
+    from .optimizer import SearchSpace, MAX_BUILD_ITEMS, optimization_result
+    from .pareto import dominance_counts
+except ImportError:
+    # Fallback para execução direta
+    from models import ChampionStats, Item, RunePreset, Target, Build, StatType, PRESET_TARGETS, STAT_INDEX
+    from formulas import FormulaEngine
+    from optimizer import SearchSpace, MAX_BUILD_ITEMS, optimization_result
+    from pareto import dominance_counts
+
+# Stats que entram no cálculo de DPS (os demais não afetam a escolha)
+DPS_STATS = (StatType.AD, StatType.AS, StatType.CRIT_CHANCE, StatType.CRIT_DAMAGE)
+
+class BudgetStates:
+    """
+    Builds parciais da programação dinâmica, em forma vetorial
+    units: custo em unidades de gold discretizado
+    """
+
+    __slots__ = ("flat", "percent", "units", "slots", "mythic", "chosen")
+
+    def __init__(self, flat: np.ndarray, percent: np.ndarray, units: np.ndarray,
+                 slots: np.ndarray, mythic: np.ndarray, chosen: List[Tuple[int, ...]]):
+        self.flat = flat
+        self.percent = percent
+        self.units = units
+        self.slots = slots
+        self.mythic = mythic
+        self.chosen = chosen
+
+    def __len__(self) -> int:
+        return self.units.shape[0]
+
+    def select(self, mask: np.ndarray) -> "BudgetStates":
+        """Subconjunto dos estados (máscara booleana ou índices)"""
+        indices = np.flatnonzero(mask) if mask.dtype == bool else mask
+        return BudgetStates(
+            self.flat[indices], self.percent[indices], self.units[indices],
+            self.slots[indices], self.mythic[indices], [self.chosen[index] for index in indices]
+        )
+
+    @staticmethod
+    def concatenate(parts: Sequence["BudgetStates"]) -> "BudgetStates":
+        """Junta vários conjuntos de estados"""
+        return BudgetStates(
+            np.concatenate([part.flat for part in parts]),
+            np.concatenate([part.percent for part in parts]),
+            np.concatenate([part.units for part in parts]),
+            np.concatenate([part.slots for part in parts]),
+            np.concatenate([part.mythic for part in parts]),
+            [chosen for part in parts for chosen in part.chosen],
+        )
+
+class BudgetSolver:
+    """Melhores builds para cada orçamento de gold em uma única passada"""
+
+    def __init__(self, formula_engine: Optional[FormulaEngine] = None):
+        self.formula_engine = formula_engine or FormulaEngine()
+
+    def solve(self, champion: ChampionStats, level: int, items: Sequence[Item], budgets: Sequence[int],
+              runes: Optional[RunePreset] = None, target: Optional[Target] = None, top_k: int = 1,
+              max_items: int = MAX_BUILD_ITEMS, gold_step: Optional[int] = None) -> Dict[str, any]:
+        """
+        Calcula as top_k builds de maior DPS para cada orçamento
+
+        Programação dinâmica item a item sobre o gold discretizado (gold_step;
+        padrão = MDC dos custos, ou seja, exato). Custos são arredondados para
+        cima, então nenhuma build ultrapassa o orçamento. A cada item são
+        descartados os estados dominados por top_k outros (custo menor ou
+        igual e stats de DPS maiores ou iguais) e os que nem no melhor caso
+        alcançam as top_k builds já encontradas com o mesmo custo. Das builds
+        com os mesmos stats de DPS, custo, slots e mítico seguem no máximo
+        top_k (têm as mesmas extensões, então bastam para qualquer top_k).
+
+        Itens não únicos podem se repetir; no máximo um mítico por build.
+        """
+        budgets = sorted({int(budget) for budget in budgets})
+        if not budgets or budgets[0] < 0:
+            raise ValueError("Informe ao menos um orçamento não negativo")
+        if not (1 <= max_items <= MAX_BUILD_ITEMS):
+            raise ValueError(f"max_items deve estar entre 1 e {MAX_BUILD_ITEMS}, recebido: {max_items}")
+        if top_k < 1:
+            raise ValueError(f"top_k deve ser positivo, recebido: {top_k}")
+
+        target = target or PRESET_TARGETS["dummy"]
+        space = SearchSpace(champion, level, items, runes, target, self.formula_engine)
+
+        if gold_step is None:
+            gold_step = reduce(math.gcd, [int(cost) for cost in space.cost] + budgets, 0) or 1
+        if gold_step < 1:
+            raise ValueError(f"gold_step deve ser positivo, recebido: {gold_step}")
+
+        item_units = -(-space.cost // gold_step)  # Arredondamento para cima
+        capacity = budgets[-1] // gold_step
+
+        states = BudgetStates(
+            flat=space.base[None, :].copy(),
+            percent=np.ones((1, space.base.shape[0])),
+            units=np.zeros(1, dtype=np.int64),
+            slots=np.zeros(1, dtype=np.int64),
+            mythic=np.zeros(1, dtype=bool),
+            chosen=[()],
+        )
+        columns = self._dominance_columns(space)
+        states_evaluated = 1
+
+        for index in range(len(space)):
+            max_copies = 1 if (space.unique[index] or space.mythic[index]) else max_items
+            parts = [states]
+
+            for copies in range(1, max_copies + 1):
+                mask = (states.slots + copies <= max_items) & (states.units + copies * item_units[index] <= capacity)
+                if space.mythic[index]:
+                    mask &= ~states.mythic
+                if not mask.any():
+                    break
+
+                extended = states.select(mask)
+                extended.flat = extended.flat + copies * space.flat[index]
+                extended.percent = extended.percent * space.percent[index] ** copies
+                extended.units = extended.units + copies * item_units[index]
+                extended.slots = extended.slots + copies
+                extended.mythic = extended.mythic | space.mythic[index]
+                extended.chosen = [chosen + (index,) * copies for chosen in extended.chosen]
+                parts.append(extended)
+
+            states = BudgetStates.concatenate(parts)
+            states_evaluated += len(states)
+            states = self._prune(space, states, columns, index + 1, max_items, top_k)
+
+        dps, _ = space.evaluate(self._sequential_stats(space, states, max_items))
+        curve = self._budget_curve(states, dps, budgets, gold_step, top_k)
+
+        results = {}
+        for budget, entries in curve.items():
+            results[budget] = [
+                optimization_result(
+                    Build(
+                        name=f"{champion.name} {budget}g",
+                        champion=champion,
+                        level=level,
+                        items=[space.items[index] for index in states.chosen[state]],
+                        runes=runes,
+                        target=target
+                    ),
+                    self.formula_engine
+                )
+                for state in entries
+            ]
+
+        return {
+            'budgets': results,
+            'gold_step': gold_step,
+            'states_evaluated': states_evaluated,
+            'final_states': len(states),
+        }
+
+    def budget_curve(self, champion: ChampionStats, level: int, items: Sequence[Item],
+                     start: int = 1000, stop: int = 20000, step: int = 250, **options) -> Dict[str, any]:
+        """Atalho para solve() com orçamentos start..stop (inclusive) a cada step"""
+        return self.solve(champion, level, items, list(range(start, stop + 1, step)), **options)
+
+    def _dominance_columns(self, space: SearchSpace) -> List[Tuple[str, int]]:
+        """Colunas (flat/percent) de stats de DPS que algum item altera"""
+        columns = []
+        for stat in DPS_STATS:
+            column = STAT_INDEX[stat]
+            if np.any(space.flat[:, column] != 0):
+                columns.append(("flat", column))
+            if np.any(space.percent[:, column] != 1):
+                columns.append(("percent", column))
+        return columns
+
+    def _bound_mask(self, space: SearchSpace, states: BudgetStates, start: int,
+                    max_items: int, top_k: int) -> np.ndarray:
+        """
+        Marca os estados cujo limite superior de DPS alcança a top_k-ésima
+        melhor build (os próprios estados) com custo menor ou igual
+        O melhor DPS por orçamento só cresce, então o custo do estado é o
+        orçamento mais difícil de perder
+        """
+        if start >= len(space) or len(states) <= top_k:
+            return np.ones(len(states), dtype=bool)
+
+        dps, _ = space.evaluate(states.flat * states.percent)
+        order = np.lexsort((-dps, states.units))
+        threshold = np.full(len(states), -np.inf)
+        heap: List[float] = []
+        for state in order:
+            if len(heap) < top_k:
+                heapq.heappush(heap, float(dps[state]))
+            elif dps[state] > heap[0]:
+                heapq.heapreplace(heap, float(dps[state]))
+            if len(heap) == top_k:
+                threshold[state] = heap[0]
+
+        # Estados de mesmo custo compartilham o limiar do último deles
+        sorted_units = states.units[order]
+        last = np.searchsorted(sorted_units, sorted_units, side="right") - 1
+        threshold[order] = threshold[order][last]
+
+        remaining = (max_items - states.slots)[:, None]
+        starts = np.full(len(states), start)
+        bounds = space.upper_bound(states.flat, states.percent, starts, states.mythic, remaining)
+        return bounds >= threshold
+
+    def _prune(self, space: SearchSpace, states: BudgetStates, columns: List[Tuple[str, int]],
+               start: int, max_items: int, top_k: int) -> BudgetStates:
+        """
+        Remove o excesso de estados equivalentes (mesmos custo, slots, mítico
+        e stats de DPS: ficam os top_k primeiros de cada grupo), os que não
+        alcançam as top_k builds de custo menor ou igual e os dominados por
+        top_k ou mais estados
+
+        A dominância é testada dentro de cada grupo (slots, mítico): poda um
+        pouco menos, mas cada comparação par a par fica bem menor
+        """
+        keys = np.column_stack(
+            [states.units, states.slots, states.mythic]
+            + [getattr(states, kind)[:, column] for kind, column in columns]
+        ).astype(float)
+        _, groups = np.unique(keys, axis=0, return_inverse=True)
+        groups = groups.reshape(-1)
+        order = np.argsort(groups, kind="stable")
+        starts = np.searchsorted(groups[order], groups[order], side="left")
+        rank = np.empty(len(states), dtype=np.int64)
+        rank[order] = np.arange(len(states)) - starts
+        states = states.select(np.flatnonzero(rank < top_k))
+
+        states = states.select(self._bound_mask(space, states, start, max_items, top_k))
+
+        keys = np.column_stack(
+            [states.units] + [getattr(states, kind)[:, column] for kind, column in columns]
+        ).astype(float)
+        maximize = [False] + [True] * len(columns)
+        groups = states.slots * 2 + states.mythic
+
+        keep = np.zeros(len(states), dtype=bool)
+        for group in np.unique(groups):
+            members = np.flatnonzero(groups == group)
+            keep[members[dominance_counts(keys[members], maximize) < top_k]] = True
+
+        return states.select(keep)
+
+    def _sequential_stats(self, space: SearchSpace, states: BudgetStates, max_items: int) -> np.ndarray:
+        """
+        Recalcula os stats dos estados finais item a item, na ordem do cálculo
+        escalar (somas e produtos acumulados podem diferir no último bit)
+        """
+        padding = len(space)  # Linha neutra: flat 0, percentual 1
+        flat = np.vstack([space.flat, np.zeros(space.flat.shape[1])])
+        percent = np.vstack([space.percent, np.ones(space.percent.shape[1])])
+        indices = np.full((len(states), max_items), padding, dtype=np.int64)
+        for row, chosen in enumerate(states.chosen):
+            indices[row, :len(chosen)] = chosen
+
+        stats = np.repeat(space.base[None, :], len(states), axis=0)
+        for column in range(max_items):
+            stats += flat[indices[:, column]]
+        for column in range(max_items):
+            stats *= percent[indices[:, column]]
+        return stats
+
+    def _budget_curve(self, states: BudgetStates, dps: np.ndarray, budgets: List[int],
+                      gold_step: int, top_k: int) -> Dict[int, List[int]]:
+        """Top_k estados por orçamento, varrendo os estados por custo crescente"""
+        order = np.lexsort((-dps, states.units))
+        heap: List[Tuple[float, int, int]] = []
+        curve = {}
+        position = 0
+
+        for budget in budgets:
+            limit = budget // gold_step
+            while position < order.size and states.units[order[position]] <= limit:
+                state = int(order[position])
+                entry = (float(dps[state]), -int(states.units[state]), -state)
+                if len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+                position += 1
+
+            curve[budget] = [-entry[2] for entry in sorted(heap, reverse=True)]
+
+        return curve
+
+# Instância global do solver
+budget_solver = BudgetSolver()
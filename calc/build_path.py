@@ -0,0 +1,256 @@
+"""
+🔥 SmashBuilder - Ordem de Compra 🔥
+Planejamento da ordem de compra dos itens ao longo da partida
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+try:
+    from .models import ChampionStats, Item, RunePreset, Target, Build, IncomeModel, StatType, PRESET_TARGETS
+    from .formulas import FormulaEngine
+    from .batch import BuildMatrix, BatchStats
+    from .optimizer import MAX_BUILD_ITEMS
+except ImportError:
+    # Fallback para execução direta
+    from models import ChampionStats, Item, RunePreset, Target, Build, IncomeModel, StatType, PRESET_TARGETS
+    from formulas import FormulaEngine
+    from batch import BuildMatrix, BatchStats
+    from optimizer import MAX_BUILD_ITEMS
+
+# Métricas cuja área sob a curva pode ser maximizada
+PATH_METRICS = ("dps", "effective_hp_physical", "effective_hp_magical") + tuple(stat.value for stat in StatType)
+
+def metric_values(batch: BatchStats, metric: str) -> np.ndarray:
+    """Coluna de uma métrica de PATH_METRICS em um lote"""
+    if metric in ("dps", "effective_hp_physical", "effective_hp_magical"):
+        return np.nan_to_num(getattr(batch, metric))
+    return batch.column(StatType(metric))
+
+class PathContext:
+    """
+    Checkpoints da partida e curvas da métrica memorizadas por inventário
+    Inventário = tupla ordenada de índices de itens; ordens de compra
+    diferentes com o mesmo inventário são avaliadas uma única vez
+    """
+
+    def __init__(self, formula_engine: FormulaEngine, champion: ChampionStats, items: Sequence[Item],
+                 income: IncomeModel, metric: str, runes: Optional[RunePreset], target: Target):
+        self.formula_engine = formula_engine
+        self.champion = champion
+        self.items = list(items)
+        self.income = income
+        self.metric = metric
+        self.runes = runes
+        self.target = target
+
+        self.minutes = np.array(income.checkpoints())
+        self.gold = income.starting_gold + income.gold_per_minute * self.minutes
+        checkpoint_levels = [income.level_at(minute) for minute in self.minutes]
+        self.levels = np.unique(checkpoint_levels)
+        self.level_positions = np.searchsorted(self.levels, checkpoint_levels)
+
+        self.curves: Dict[Tuple[int, ...], np.ndarray] = {}
+        self._cumulative: Dict[Tuple[int, ...], np.ndarray] = {}
+
+    @property
+    def evaluated(self) -> int:
+        return len(self.curves)
+
+    def prepare(self, inventories: Sequence[Tuple[int, ...]]):
+        """Calcula em lote as curvas dos inventários ainda não avaliados"""
+        missing = [inventory for inventory in dict.fromkeys(inventories) if inventory not in self.curves]
+        if not missing:
+            return
+
+        builds = [
+            Build.trusted(
+                name="Build Path",
+                champion=self.champion,
+                level=int(level),
+                items=[self.items[index] for index in inventory],
+                runes=self.runes,
+                target=self.target
+            )
+            for inventory in missing
+            for level in self.levels
+        ]
+        batch = self.formula_engine.calculate_final_stats_batch(BuildMatrix.from_builds(builds))
+        values = metric_values(batch, self.metric).reshape(len(missing), len(self.levels))
+
+        for inventory, row in zip(missing, values):
+            curve = row[self.level_positions]
+            self.curves[inventory] = curve
+            self._cumulative[inventory] = np.concatenate([[0.0], np.cumsum(curve)])
+
+    def segment(self, inventory: Tuple[int, ...], gold_from: float, gold_to: float = np.inf) -> float:
+        """Área da curva do inventário nos checkpoints com gold em [gold_from, gold_to)"""
+        start = int(np.searchsorted(self.gold, gold_from, side="left"))
+        end = int(np.searchsorted(self.gold, gold_to, side="left"))
+        cumulative = self._cumulative[inventory]
+        return float(cumulative[end] - cumulative[start]) * self.income.step
+
+class BuildPathPlanner:
+    """Ordem de compra que maximiza a área sob a curva de uma métrica"""
+
+    def __init__(self, formula_engine: Optional[FormulaEngine] = None):
+        self.formula_engine = formula_engine or FormulaEngine()
+
+    def plan_order(self, champion: ChampionStats, items: Sequence[Item], income: Optional[IncomeModel] = None,
+                   metric: str = "dps", runes: Optional[RunePreset] = None,
+                   target: Optional[Target] = None) -> Dict[str, any]:
+        """
+        Melhor ordem de compra para um conjunto fixo de itens
+
+        Programação dinâmica exata sobre os subconjuntos já comprados: o
+        momento de cada compra depende só do custo acumulado, então ordens
+        que levam ao mesmo inventário compartilham todo o futuro e apenas a
+        de maior área acumulada é mantida.
+        """
+        if len(items) > MAX_BUILD_ITEMS:
+            raise ValueError(f"Uma build tem no máximo {MAX_BUILD_ITEMS} itens, recebido: {len(items)}")
+        if sum(1 for item in items if item.mythic) > 1:
+            raise ValueError('Apenas um item mítico é permitido por build')
+
+        # Itens repetidos viram um único índice com contagem
+        catalog = list({item.name: item for item in items}.values())
+        required = Counter(next(index for index, candidate in enumerate(catalog) if candidate.name == item.name)
+                           for item in items)
+
+        context = self._context(champion, catalog, income, metric, runes, target)
+        return self._search(context, len(items), beam_width=None, required=required)
+
+    def plan(self, champion: ChampionStats, candidates: Sequence[Item], income: Optional[IncomeModel] = None,
+             metric: str = "dps", max_items: int = MAX_BUILD_ITEMS, beam_width: int = 64,
+             runes: Optional[RunePreset] = None, target: Optional[Target] = None) -> Dict[str, any]:
+        """
+        Escolhe itens e ordem de compra entre os candidatos
+
+        Beam search sobre inventários parciais: estados com o mesmo
+        inventário são mesclados (como na programação dinâmica) e cada
+        camada mantém os beam_width melhores pela área acumulada mais a área
+        de manter o inventário até o fim. Só entram compras que cabem no
+        gold da partida.
+        """
+        if not (1 <= max_items <= MAX_BUILD_ITEMS):
+            raise ValueError(f"max_items deve estar entre 1 e {MAX_BUILD_ITEMS}, recebido: {max_items}")
+        if beam_width < 1:
+            raise ValueError(f"beam_width deve ser positivo, recebido: {beam_width}")
+
+        context = self._context(champion, candidates, income, metric, runes, target)
+        return self._search(context, max_items, beam_width=beam_width)
+
+    def _context(self, champion: ChampionStats, items: Sequence[Item], income: Optional[IncomeModel],
+                 metric: str, runes: Optional[RunePreset], target: Optional[Target]) -> PathContext:
+        """Valida a métrica e monta o contexto de avaliação"""
+        if metric not in PATH_METRICS:
+            raise ValueError(f"Métrica inválida: {metric} (use {', '.join(PATH_METRICS)})")
+
+        return PathContext(
+            self.formula_engine, champion, items, income or IncomeModel(), metric,
+            runes, target or PRESET_TARGETS["dummy"]
+        )
+
+    def _search(self, context: PathContext, max_items: int, beam_width: Optional[int],
+                required: Optional[Counter] = None) -> Dict[str, any]:
+        """
+        Busca em camadas (uma compra por camada)
+        Estado: inventário -> (área acumulada até a última compra, ordem, custo)
+        """
+        items = context.items
+        final_gold = float(context.gold[-1])
+        layer = {(): (0.0, (), 0)}
+        best = None
+
+        for depth in range(max_items + 1):
+            context.prepare(list(layer))
+
+            for inventory, (accrued, order, cost) in layer.items():
+                if required is not None and depth < max_items:
+                    continue
+                total = accrued + context.segment(inventory, cost)
+                if best is None or total > best[0]:
+                    best = (total, order)
+
+            if depth == max_items:
+                break
+
+            following: Dict[Tuple[int, ...], Tuple[float, Tuple[int, ...], int]] = {}
+            for inventory, (accrued, order, cost) in layer.items():
+                has_mythic = any(items[index].mythic for index in inventory)
+                for index, item in enumerate(items):
+                    if required is not None:
+                        if inventory.count(index) >= required[index]:
+                            continue
+                    else:
+                        if item.unique and index in inventory:
+                            continue
+                        if item.mythic and has_mythic:
+                            continue
+                        if cost + item.cost > final_gold:
+                            continue
+
+                    new_inventory = tuple(sorted(inventory + (index,)))
+                    new_accrued = accrued + context.segment(inventory, cost, cost + item.cost)
+                    current = following.get(new_inventory)
+                    if current is None or new_accrued > current[0]:
+                        following[new_inventory] = (new_accrued, order + (index,), cost + item.cost)
+
+            if not following:
+                break
+
+            if beam_width is not None and len(following) > beam_width:
+                context.prepare(list(following))
+                ranked = sorted(
+                    following.items(),
+                    key=lambda entry: -(entry[1][0] + context.segment(entry[0], entry[1][2]))
+                )
+                following = dict(ranked[:beam_width])
+
+            layer = following
+
+        return self._path_result(context, best[0], best[1])
+
+    def _path_result(self, context: PathContext, area: float, order: Tuple[int, ...]) -> Dict[str, any]:
+        """Descreve a ordem escolhida: compras, linha do tempo e área"""
+        items = context.items
+        income = context.income
+
+        purchases = []
+        inventories = [()]
+        cost = 0
+        for index in order:
+            cost += items[index].cost
+            minute = income.purchase_minute(cost)
+            purchases.append({
+                'item': items[index].name,
+                'cost': items[index].cost,
+                'minute': round(minute, 2),
+                'level': income.level_at(minute),
+            })
+            inventories.append(tuple(sorted(inventories[-1] + (index,))))
+
+        cumulative_costs = np.cumsum([0] + [items[index].cost for index in order])
+        timeline = []
+        for position, minute in enumerate(context.minutes):
+            owned = int(np.searchsorted(cumulative_costs, context.gold[position], side="right")) - 1
+            timeline.append({
+                'minute': float(minute),
+                'level': income.level_at(minute),
+                'gold': float(context.gold[position]),
+                'items': owned,
+                'value': float(context.curves[inventories[owned]][position]),
+            })
+
+        return {
+            'metric': context.metric,
+            'area': round(area, 2),
+            'order': [items[index].name for index in order],
+            'purchases': purchases,
+            'timeline': timeline,
+            'inventories_evaluated': context.evaluated,
+        }
+
+# Instância global do planejador
+build_path_planner = BuildPathPlanner()
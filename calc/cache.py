@@ -0,0 +1,171 @@
+"""
+🔥 SmashBuilder - Cache de Builds 🔥
+Memoização LRU do cálculo de stats finais por hash canônico da build
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+import hashlib
+import json
+
+try:
+    from .models import Build, FinalStats
+    from .formulas import FormulaEngine
+    from .batch import champion_key
+except ImportError:
+    # Fallback para execução direta
+    from models import Build, FinalStats
+    from formulas import FormulaEngine
+    from batch import champion_key
+
+DEFAULT_CACHE_SIZE = 4096
+
+def _modifiers_content(modifiers: Sequence) -> List[Tuple[str, float, str]]:
+    """Modificadores em forma serializável (stat, valor, tipo)"""
+    return [(m.stat.value, m.value, m.modifier_type.value) for m in modifiers]
+
+def canonical_build_hash(build: Build, data_version: str = "") -> str:
+    """
+    Hash canônico de uma build: campeão (nome e stats de base/crescimento),
+    nível, itens ordenados (nome e modificadores), runas, alvo e versão dos
+    dados. O conteúdo entra na chave, então editar ou substituir um item com
+    o mesmo nome (ex.: DataLoader.add_item) gera outra chave. Percentuais de
+    itens são multiplicativos, então permutações dos mesmos itens têm o
+    mesmo hash
+    """
+    runes = None
+    if build.runes:
+        runes = [build.runes.name, _modifiers_content(build.runes.modifiers)]
+    target = [build.target.hp, build.target.armor, build.target.mr] if build.target else None
+
+    content = [
+        data_version,
+        build.champion.name.lower(),
+        list(champion_key(build.champion)),
+        build.level,
+        sorted([item.name.lower(), _modifiers_content(item.modifiers)] for item in build.items),
+        runes,
+        target,
+    ]
+    return hashlib.blake2b(json.dumps(content).encode("utf-8"), digest_size=16).hexdigest()
+
+class BuildCache:
+    """
+    Cache LRU de FinalStats por hash canônico
+    Contadores de acertos, faltas e remoções ficam em stats()
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        if maxsize < 1:
+            raise ValueError(f"maxsize deve ser positivo, recebido: {maxsize}")
+
+        self.maxsize = maxsize
+        # Entrada: (stats, validada); entradas de cálculos trusted não foram validadas
+        self._entries: "OrderedDict[str, Tuple[FinalStats, bool]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str, validated: bool = False) -> Optional[FinalStats]:
+        """Busca uma entrada (exigindo validação, se pedido) e a marca como recente"""
+        entry = self._entries.get(key)
+        if entry is None or (validated and not entry[1]):
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: str, stats: FinalStats, validated: bool = True):
+        """Guarda uma entrada, removendo a menos recente se o cache estiver cheio"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = (stats, validated)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, maxsize: int):
+        """Altera o tamanho máximo (remove as entradas menos recentes excedentes)"""
+        if maxsize < 1:
+            raise ValueError(f"maxsize deve ser positivo, recebido: {maxsize}")
+        self.maxsize = maxsize
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Esvazia o cache e zera os contadores"""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Contadores do cache"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+class CachedFormulaEngine(FormulaEngine):
+    """
+    FormulaEngine com memoização de calculate_final_stats
+    data_version identifica os dados carregados: uma string ou uma função
+    consultada a cada cálculo (ex.: DataLoader.data_version); ao mudar, as
+    entradas antigas deixam de ser encontradas
+    Não há instância global: quem tem os dados (cli/app.py, o terminal)
+    cria o engine com data_version=DataLoader.data_version
+    store: segundo nível persistente opcional com get(key) / put(key, stats,
+    validated) (ex.: data_io.result_store.ResultStore)
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE, data_version: Union[str, Callable[[], str]] = "",
+                 store=None):
+        super().__init__()
+        self.cache = BuildCache(maxsize)
+        self._data_version = data_version
+        self.store = store
+        self.store_hits = 0
+
+    @property
+    def data_version(self) -> str:
+        """Versão atual dos dados"""
+        return self._data_version() if callable(self._data_version) else self._data_version
+
+    @data_version.setter
+    def data_version(self, data_version: Union[str, Callable[[], str]]):
+        self._data_version = data_version
+
+    def calculate_final_stats(self, build: Build, trusted: bool = False) -> FinalStats:
+        """Stats finais memorizados; retorna sempre uma cópia da entrada"""
+        key = canonical_build_hash(build, self.data_version)
+        cached = self.cache.get(key, validated=not trusted)
+        if cached is None:
+            # Entradas persistidas foram validadas antes de gravadas
+            cached = self.store.get(key) if self.store is not None else None
+            if cached is not None:
+                self.store_hits += 1
+                self.cache.put(key, cached, validated=True)
+            else:
+                cached = super().calculate_final_stats(build, trusted=trusted)
+                self.cache.put(key, cached, validated=not trusted)
+                if self.store is not None:
+                    self.store.put(key, cached, validated=not trusted)
+
+        return cached.model_copy()
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Contadores do cache (ver BuildCache.stats) e acertos no armazenamento persistente"""
+        return {**self.cache.stats(), 'store_hits': self.store_hits}
@@ -0,0 +1,116 @@
+"""
+🔥 SmashBuilder - Catálogo Colunar 🔥
+Visão em colunas (array estruturado NumPy) dos itens carregados
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+try:
+    from .models import Item, StatType, ModifierType, STAT_ORDER, NUM_STATS
+    from .batch import compile_modifiers
+except ImportError:
+    # Fallback para execução direta
+    from models import Item, StatType, ModifierType, STAT_ORDER, NUM_STATS
+    from batch import compile_modifiers
+
+# Colunas de stats: flat de cada StatType seguidos dos percentuais (em pontos %)
+STAT_COLUMNS: Tuple[Tuple[StatType, ModifierType], ...] = (
+    tuple((stat, ModifierType.FLAT) for stat in STAT_ORDER) +
+    tuple((stat, ModifierType.PERCENT) for stat in STAT_ORDER)
+)
+
+def column_name(stat: StatType, modifier_type: ModifierType = ModifierType.FLAT) -> str:
+    """Nome da coluna de um stat no array estruturado (ex.: flat_attack_damage)"""
+    return f"{modifier_type.value}_{stat.value}"
+
+class ItemCatalog:
+    """
+    Itens em forma colunar, construída uma vez por carga do catálogo
+
+    table: array estruturado com id, name, cost, unique, mythic e uma coluna
+    por (StatType, ModifierType) de STAT_COLUMNS; colunas percentuais em
+    pontos percentuais ((fator - 1) × 100)
+    flat / percent: vetores compilados (itens × StatType), percent como fatores
+    Os arrays são somente leitura; ids seguem a ordem dos itens recebidos
+    """
+
+    __slots__ = ("items", "table", "flat", "percent", "_ids", "__weakref__")
+
+    def __init__(self, items: Sequence[Item]):
+        self.items = list(items)
+        size = len(self.items)
+
+        compiled = [compile_modifiers(item) for item in self.items]
+        self.flat = np.array([c.flat_vector for c in compiled], dtype=float).reshape(size, NUM_STATS)
+        self.percent = np.array([c.percent_vector for c in compiled], dtype=float).reshape(size, NUM_STATS)
+
+        name_length = max((len(item.name) for item in self.items), default=1)
+        dtype = [('id', np.int64), ('name', f'U{name_length}'), ('cost', np.int64),
+                 ('unique', np.bool_), ('mythic', np.bool_)]
+        dtype += [(column_name(stat, modifier_type), np.float64) for stat, modifier_type in STAT_COLUMNS]
+
+        table = np.zeros(size, dtype=dtype)
+        table['id'] = np.arange(size)
+        table['name'] = [item.name for item in self.items]
+        table['cost'] = [item.cost for item in self.items]
+        table['unique'] = [item.unique for item in self.items]
+        table['mythic'] = [item.mythic for item in self.items]
+        for column, stat in enumerate(STAT_ORDER):
+            table[column_name(stat, ModifierType.FLAT)] = self.flat[:, column]
+            table[column_name(stat, ModifierType.PERCENT)] = (self.percent[:, column] - 1) * 100
+
+        self.table = table
+        self._ids = {item.name.lower(): index for index, item in enumerate(self.items)}
+        for array in (self.table, self.flat, self.percent):
+            array.flags.writeable = False
+
+    @classmethod
+    def of(cls, items: Union["ItemCatalog", Sequence[Item]]) -> "ItemCatalog":
+        """O próprio catálogo ou um catálogo montado a partir da lista de itens"""
+        return items if isinstance(items, cls) else cls(items)
+
+    def __len__(self) -> int:
+        return self.table.shape[0]
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, index: int) -> Item:
+        return self.items[index]
+
+    @property
+    def cost(self) -> np.ndarray:
+        return self.table['cost']
+
+    @property
+    def unique(self) -> np.ndarray:
+        return self.table['unique']
+
+    @property
+    def mythic(self) -> np.ndarray:
+        return self.table['mythic']
+
+    def id_of(self, name: str) -> Optional[int]:
+        """Id de um item pelo nome (sem diferenciar maiúsculas)"""
+        return self._ids.get(name.lower())
+
+    def column(self, stat: StatType, modifier_type: ModifierType = ModifierType.FLAT) -> np.ndarray:
+        """Quantidade de um stat em todos os itens"""
+        return self.table[column_name(stat, modifier_type)]
+
+    def stat_matrix(self) -> np.ndarray:
+        """Matriz (itens × STAT_COLUMNS) com as colunas de stats"""
+        return np.stack([self.column(stat, modifier_type) for stat, modifier_type in STAT_COLUMNS], axis=1)
+
+    def score(self, weights: Dict[Tuple[StatType, ModifierType], float]) -> np.ndarray:
+        """Pontuação linear de todos os itens: soma de coluna × peso"""
+        scores = np.zeros(len(self))
+        for (stat, modifier_type), weight in weights.items():
+            scores += self.column(stat, modifier_type) * weight
+        return scores
+
+    def select(self, mask: np.ndarray) -> List[Item]:
+        """Itens de uma máscara booleana ou lista de ids"""
+        ids = np.flatnonzero(mask) if np.asarray(mask).dtype == bool else mask
+        return [self.items[index] for index in ids]
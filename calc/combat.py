@@ -0,0 +1,196 @@
+"""
+🔥 SmashBuilder - Simulador de Combate 🔥
+Simulação por eventos discretos de ataques básicos contra um alvo
+"""
+
+from typing import Dict, List, Optional, Sequence, Union
+import heapq
+import math
+import numpy as np
+
+try:
+    from .models import FinalStats, Target, PRESET_TARGETS
+    from .formulas import FormulaEngine
+except ImportError:
+    # Fallback para execução direta
+    from models import FinalStats, Target, PRESET_TARGETS
+    from formulas import FormulaEngine
+
+# Fração do intervalo entre ataques gasta na animação antes do golpe
+DEFAULT_WINDUP = 0.2
+
+# Duração máxima de um duelo (segundos)
+DEFAULT_MAX_TIME = 60.0
+
+CRIT_MODES = ("expected", "random")
+
+# Tipos de evento (o valor desempata eventos no mesmo instante: golpes antes de novos ataques)
+EVENT_HIT = 0
+EVENT_ATTACK = 1
+
+class CombatSimulator:
+    """
+    Duelo de um ou mais atacantes contra um Target, dirigido por uma fila
+    de eventos (heap). Cada ataque começa a cada 1 / attack speed segundos
+    e o dano chega após a animação (windup); o golpe final registra o
+    excesso de dano (overkill).
+    """
+
+    def __init__(self, formula_engine: Optional[FormulaEngine] = None, windup: float = DEFAULT_WINDUP,
+                 max_time: float = DEFAULT_MAX_TIME):
+        if not (0 <= windup < 1):
+            raise ValueError(f"windup deve estar em [0, 1), recebido: {windup}")
+        if max_time <= 0:
+            raise ValueError(f"max_time deve ser positivo, recebido: {max_time}")
+
+        self.formula_engine = formula_engine or FormulaEngine()
+        self.windup = windup
+        self.max_time = max_time
+
+    def simulate(self, stats: Union[FinalStats, Sequence[FinalStats]], target: Target,
+                 crit_mode: str = "expected", seed: Optional[int] = None, start_delay: float = 0.0,
+                 record_hits: bool = False, rng: Optional[np.random.Generator] = None) -> Dict[str, any]:
+        """
+        Simula um duelo até a morte do alvo ou max_time
+        crit_mode: "expected" (dano médio por golpe) ou "random" (crítico sorteado
+        com um gerador NumPy: rng ou np.random.default_rng(seed), como em calc.dps)
+        start_delay: atraso antes do primeiro ataque de cada atacante
+        """
+        if crit_mode not in CRIT_MODES:
+            raise ValueError(f"Modo de crítico inválido: {crit_mode} (use {', '.join(CRIT_MODES)})")
+
+        attackers = self._attackers(stats)
+        rolls = None
+        if crit_mode == "random":
+            rng = rng if rng is not None else np.random.default_rng(seed)
+            rolls = rng.random(self._hit_limit(attackers, start_delay))
+        return self._duel(attackers, target, rolls, start_delay, record_hits)
+
+    @staticmethod
+    def _attackers(stats: Union[FinalStats, Sequence[FinalStats]]) -> List[FinalStats]:
+        attackers = [stats] if isinstance(stats, FinalStats) else list(stats)
+        if not attackers:
+            raise ValueError("Informe ao menos um atacante")
+        return attackers
+
+    def _hit_limit(self, attackers: Sequence[FinalStats], start_delay: float) -> int:
+        """Máximo de golpes possíveis até max_time (sorteios de crítico necessários)"""
+        limit = 0
+        for attacker in attackers:
+            attack_speed = min(attacker.as_, self.formula_engine.MAX_ATTACK_SPEED)
+            if attack_speed > 0 and start_delay <= self.max_time:
+                # +1 de folga para arredondamentos na soma dos intervalos
+                limit += math.floor((self.max_time - start_delay) * attack_speed) + 2
+        return limit
+
+    def _duel(self, attackers: Sequence[FinalStats], target: Target, rolls: Optional[np.ndarray],
+              start_delay: float, record_hits: bool) -> Dict[str, any]:
+        """
+        Um duelo; rolls: um número uniforme em [0, 1) por golpe (críticos
+        sorteados) ou None (dano médio)
+        """
+        damage_reduction = self.formula_engine.calculate_damage_reduction(target.armor)
+        max_attack_speed = self.formula_engine.MAX_ATTACK_SPEED
+
+        periods = []
+        queue = []
+        for index, attacker in enumerate(attackers):
+            attack_speed = min(attacker.as_, max_attack_speed)
+            periods.append(1 / attack_speed if attack_speed > 0 else float('inf'))
+            if attack_speed > 0:
+                queue.append((start_delay, EVENT_ATTACK, index, index))
+        heapq.heapify(queue)
+        sequence = len(attackers)
+
+        hp = target.hp
+        attacks = hits = crits = 0
+        damage_dealt = 0.0
+        kill_time = None
+        hit_log: List[Dict[str, float]] = []
+
+        while queue:
+            time, kind, _, index = heapq.heappop(queue)
+            if time > self.max_time:
+                break
+
+            attacker = attackers[index]
+            if kind == EVENT_ATTACK:
+                # Novo ataque: golpe após a animação e próximo ataque após o intervalo
+                attacks += 1
+                sequence += 1
+                heapq.heappush(queue, (time + self.windup * periods[index], EVENT_HIT, sequence, index))
+                sequence += 1
+                heapq.heappush(queue, (time + periods[index], EVENT_ATTACK, sequence, index))
+                continue
+
+            # Golpe: dano com crítico e redução por armor aplicados a cada acerto
+            if rolls is not None:
+                is_crit = rolls[hits] < attacker.crit_chance / 100
+                multiplier = attacker.crit_damage / 100 if is_crit else 1.0
+                crits += is_crit
+            else:
+                multiplier = 1 + (attacker.crit_chance / 100) * (attacker.crit_damage / 100 - 1)
+
+            damage = attacker.ad * multiplier * (1 - damage_reduction)
+            hp -= damage
+            damage_dealt += damage
+            hits += 1
+
+            if record_hits:
+                hit_log.append({'time': round(time, 4), 'attacker': index, 'damage': round(damage, 2),
+                                'remaining_hp': round(max(hp, 0.0), 2)})
+
+            if hp <= 0:
+                kill_time = time
+                break
+
+        killed = kill_time is not None
+        result = {
+            'killed': killed,
+            'time_to_kill': round(kill_time, 4) if killed else float('inf'),
+            'attacks': attacks,
+            'hits': hits,
+            'crits': crits,
+            'damage_dealt': round(damage_dealt, 2),
+            'overkill': round(-hp, 2) if killed else 0.0,
+            'effective_dps': round(target.hp / kill_time, 2) if killed and kill_time > 0 else 0.0,
+        }
+        if record_hits:
+            result['hits_log'] = hit_log
+        return result
+
+    def simulate_many(self, stats: Union[FinalStats, Sequence[FinalStats]], target: Target,
+                      duels: int = 1000, seed: Optional[int] = None,
+                      percentiles: Sequence[float] = (5, 50, 95), start_delay: float = 0.0) -> Dict[str, any]:
+        """
+        Repete o duelo com críticos sorteados e resume os TTKs
+        Os sorteios de todos os duelos saem de uma única chamada ao gerador
+        (np.random.default_rng(seed)); o primeiro duelo é igual a
+        simulate(crit_mode="random", seed=seed)
+        """
+        if duels < 1:
+            raise ValueError(f"duels deve ser positivo, recebido: {duels}")
+
+        attackers = self._attackers(stats)
+        rolls = np.random.default_rng(seed).random((duels, self._hit_limit(attackers, start_delay)))
+        results = [self._duel(attackers, target, rolls[duel], start_delay, False) for duel in range(duels)]
+        ttk = np.array([result['time_to_kill'] for result in results])
+        overkill = np.array([result['overkill'] for result in results])
+
+        return {
+            'duels': duels,
+            'seed': seed,
+            'kill_rate': round(float(np.mean(np.isfinite(ttk))), 4),
+            'mean_ttk': round(float(ttk.mean()), 4) if np.all(np.isfinite(ttk)) else float('inf'),
+            'ttk_percentiles': {p: round(float(v), 4) for p, v in zip(percentiles, np.percentile(ttk, percentiles))},
+            'mean_overkill': round(float(overkill.mean()), 2),
+        }
+
+    def simulate_presets(self, stats: Union[FinalStats, Sequence[FinalStats]],
+                         targets: Optional[Dict[str, Target]] = None, **options) -> Dict[str, Dict[str, any]]:
+        """Duelo contra cada alvo (padrão: PRESET_TARGETS)"""
+        targets = targets or PRESET_TARGETS
+        return {name: self.simulate(stats, target, **options) for name, target in targets.items()}
+
+# Instância global do simulador
+combat_simulator = CombatSimulator()
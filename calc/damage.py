@@ -0,0 +1,177 @@
+"""
+🔥 SmashBuilder - Dano Misto 🔥
+Kernel vetorizado de dano físico e mágico com letalidade e penetração mágica
+"""
+
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+try:
+    from .models import Build, DamageProfile, Target, StatType, PRESET_DAMAGE_PROFILES, STAT_INDEX
+    from .formulas import FormulaEngine
+    from .batch import BuildMatrix, round_half_even
+except ImportError:
+    # Fallback para execução direta
+    from models import Build, DamageProfile, Target, StatType, PRESET_DAMAGE_PROFILES, STAT_INDEX
+    from formulas import FormulaEngine
+    from batch import BuildMatrix, round_half_even
+
+DAMAGE_METRICS = ("physical_dps", "magic_dps", "dps", "ttk")
+
+class DamageBreakdown:
+    """
+    Resultado de DamageKernel.evaluate
+    stats: (builds × StatType); métricas de DAMAGE_METRICS: (builds × alvos)
+    """
+
+    __slots__ = ("builds", "targets", "profile", "stats", "physical_dps", "magic_dps", "dps", "ttk")
+
+    def __init__(self, builds: List[str], targets: List[str], profile: str, stats: np.ndarray,
+                 physical_dps: np.ndarray, magic_dps: np.ndarray, dps: np.ndarray, ttk: np.ndarray):
+        self.builds = builds
+        self.targets = targets
+        self.profile = profile
+        self.stats = stats
+        self.physical_dps = physical_dps
+        self.magic_dps = magic_dps
+        self.dps = dps
+        self.ttk = ttk
+
+    @property
+    def shape(self):
+        return (len(self.builds), len(self.targets))
+
+    def metric(self, name: str) -> np.ndarray:
+        """Métrica de DAMAGE_METRICS (builds × alvos)"""
+        if name not in DAMAGE_METRICS:
+            raise ValueError(f"Métrica inválida: {name} (use {', '.join(DAMAGE_METRICS)})")
+        return getattr(self, name)
+
+    def rows(self) -> List[Dict[str, any]]:
+        """Formato longo: uma linha por build e alvo"""
+        rows = []
+        for b, build in enumerate(self.builds):
+            for t, target in enumerate(self.targets):
+                row = {'build': build, 'target': target, 'profile': self.profile}
+                for name in DAMAGE_METRICS:
+                    row[name] = float(getattr(self, name)[b, t])
+                rows.append(row)
+        return rows
+
+class DamageKernel:
+    """
+    Dano por segundo separado em canais físico e mágico
+
+    Letalidade reduz a armor e penetração mágica reduz a MR do alvo (valores
+    flat, sem levar a resistência abaixo de 0) antes da redução de dano de
+    FormulaEngine. Com o perfil basic_attack e sem penetração, o DPS total é
+    idêntico bit a bit ao de calculate_dps_batch.
+    """
+
+    def __init__(self, formula_engine: Optional[FormulaEngine] = None):
+        self.formula_engine = formula_engine or FormulaEngine()
+
+    @staticmethod
+    def resolve_profile(profile=None) -> DamageProfile:
+        """Perfil por instância ou nome de PRESET_DAMAGE_PROFILES (padrão: basic_attack)"""
+        if profile is None:
+            return PRESET_DAMAGE_PROFILES["basic_attack"]
+        if isinstance(profile, DamageProfile):
+            return profile
+        if profile not in PRESET_DAMAGE_PROFILES:
+            raise ValueError(f"Perfil de dano inválido: {profile} (use {', '.join(PRESET_DAMAGE_PROFILES)})")
+        return PRESET_DAMAGE_PROFILES[profile]
+
+    @staticmethod
+    def effective_resistance_batch(resistances: np.ndarray, penetration: np.ndarray) -> np.ndarray:
+        """Resistência após penetração flat; resistências negativas não são afetadas"""
+        resistances = np.asarray(resistances, dtype=float)
+        return np.where(resistances > 0, np.maximum(resistances - penetration, 0.0), resistances)
+
+    def raw_damage_batch(self, stats: np.ndarray, target_armor: np.ndarray, target_mr: np.ndarray,
+                         profile=None) -> Dict[str, np.ndarray]:
+        """
+        DPS físico e mágico sem arredondamento
+        stats: (..., StatType); alvos fazem broadcast com stats.shape[:-1]
+        """
+        profile = self.resolve_profile(profile)
+        engine = self.formula_engine
+
+        def column(stat: StatType) -> np.ndarray:
+            return stats[..., STAT_INDEX[stat]]
+
+        attack_speed = column(StatType.AS)
+        ability_power = column(StatType.AP)
+
+        # Canal físico: ataques básicos com crítico contra armor após letalidade
+        crit_chance = column(StatType.CRIT_CHANCE) / 100
+        crit_multiplier = column(StatType.CRIT_DAMAGE) / 100
+        average_damage = (column(StatType.AD) * profile.ad_ratio) * (1 + crit_chance * (crit_multiplier - 1))
+        armor = self.effective_resistance_batch(target_armor, column(StatType.LETHALITY))
+        physical = average_damage * (1 - engine.calculate_damage_reduction_batch(armor)) * attack_speed
+
+        # Canal mágico: on-hit por ataque e habilidades por segundo contra MR após penetração
+        on_hit = (profile.on_hit_magic + profile.on_hit_ap_ratio * ability_power) * attack_speed
+        abilities = (profile.ability_damage + profile.ability_ap_ratio * ability_power) * profile.casts_per_second
+        mr = self.effective_resistance_batch(target_mr, column(StatType.MAGIC_PEN))
+        magic = (on_hit + abilities) * (1 - engine.calculate_damage_reduction_batch(mr))
+
+        return {'physical_dps': physical, 'magic_dps': magic}
+
+    def damage_batch(self, stats: np.ndarray, target_hp: np.ndarray, target_armor: np.ndarray,
+                     target_mr: np.ndarray, profile=None) -> Dict[str, np.ndarray]:
+        """
+        DPS por canal, DPS total e TTK (arredondados como calculate_dps_batch)
+        stats: (..., StatType) já finalizados; alvos fazem broadcast com stats.shape[:-1]
+        """
+        precision = self.formula_engine.precision
+        raw = self.raw_damage_batch(stats, target_armor, target_mr, profile)
+        dps = round_half_even(raw['physical_dps'] + raw['magic_dps'], precision)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ttk = np.where(dps > 0, round_half_even(np.asarray(target_hp, dtype=float) / dps, precision),
+                           float('inf'))
+
+        return {
+            'physical_dps': round_half_even(raw['physical_dps'], precision),
+            'magic_dps': round_half_even(raw['magic_dps'], precision),
+            'dps': dps,
+            'ttk': ttk,
+        }
+
+    def evaluate(self, builds: Sequence[Build], targets: Sequence[Target], profile=None) -> DamageBreakdown:
+        """
+        Dano misto de cada build contra cada alvo (builds × alvos)
+        Os stats são calculados uma vez por build (no nível dela, ignorando o
+        alvo da própria build) e a parte dependente do alvo vai por broadcast
+        """
+        if not targets:
+            raise ValueError("Informe ao menos um alvo")
+        profile = self.resolve_profile(profile)
+
+        matrix = BuildMatrix.from_builds(builds)
+        matrix.target_hp = np.full(len(matrix), np.nan)
+        matrix.target_armor = np.full(len(matrix), np.nan)
+        stats = self.formula_engine.calculate_final_stats_batch(matrix).stats
+
+        def target_column(values: List[float]) -> np.ndarray:
+            return np.array(values, dtype=float)[None, :]
+
+        damage = self.damage_batch(
+            stats[:, None, :],
+            target_column([target.hp for target in targets]),
+            target_column([target.armor for target in targets]),
+            target_column([target.mr for target in targets]),
+            profile,
+        )
+
+        return DamageBreakdown(
+            builds=[build.name for build in builds],
+            targets=[target.name for target in targets],
+            profile=profile.name,
+            stats=stats,
+            **damage,
+        )
+
+# Instância global do kernel de dano
+damage_kernel = DamageKernel()
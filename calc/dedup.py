@@ -0,0 +1,72 @@
+"""
+🔥 SmashBuilder - Deduplicação de Stats 🔥
+Agrupamento de builds com vetores de stats finais idênticos
+"""
+
+from typing import List
+import numpy as np
+
+class StatGroups:
+    """
+    Grupos de linhas idênticas de um lote
+    first: índice da primeira linha de cada grupo (ordem de aparição)
+    inverse: grupo de cada linha; expand(valores por grupo) devolve um valor por linha
+    """
+
+    __slots__ = ("first", "inverse", "counts")
+
+    def __init__(self, first: np.ndarray, inverse: np.ndarray, counts: np.ndarray):
+        self.first = first
+        self.inverse = inverse
+        self.counts = counts
+
+    def __len__(self) -> int:
+        return self.first.shape[0]
+
+    @property
+    def total(self) -> int:
+        """Número de linhas do lote original"""
+        return self.inverse.shape[0]
+
+    @property
+    def duplicates(self) -> int:
+        """Linhas que não precisaram ser calculadas"""
+        return self.total - len(self)
+
+    def unique(self, values: np.ndarray) -> np.ndarray:
+        """Uma linha (a primeira) de cada grupo"""
+        return values[self.first]
+
+    def expand(self, values: np.ndarray) -> np.ndarray:
+        """Espalha valores por grupo de volta para todas as linhas"""
+        return values[self.inverse]
+
+    def members(self) -> List[np.ndarray]:
+        """Índices das linhas de cada grupo"""
+        order = np.argsort(self.inverse, kind="stable")
+        return np.split(order, np.cumsum(self.counts)[:-1])
+
+def group_rows(*columns: np.ndarray) -> StatGroups:
+    """
+    Agrupa linhas idênticas de colunas/matrizes com o mesmo número de linhas
+    Cada linha vira uma chave de bytes (-0.0 e 0.0 são iguais, NaNs também);
+    os grupos ficam na ordem da primeira aparição
+    """
+    parts = [np.asarray(column, dtype=float).reshape(len(column), -1) for column in columns]
+    values = np.ascontiguousarray(np.concatenate(parts, axis=1)) + 0.0  # -0.0 -> 0.0
+    values[np.isnan(values)] = np.nan
+    size = values.shape[0]
+
+    if size == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return StatGroups(empty, empty, empty)
+
+    keys = values.view(np.dtype((np.void, values.dtype.itemsize * values.shape[1]))).ravel()
+    _, first, inverse, counts = np.unique(keys, return_index=True, return_inverse=True, return_counts=True)
+
+    # Renumerar os grupos pela ordem da primeira aparição
+    order = np.argsort(first, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.shape[0])
+
+    return StatGroups(first[order], rank[inverse.reshape(-1)], counts[order])
@@ -0,0 +1,231 @@
+"""
+🔥 SmashBuilder - Distribuição de Abate 🔥
+Distribuição exata de ataques e tempo até o abate, sem amostragem
+"""
+
+from typing import Dict, Sequence
+import numpy as np
+
+try:
+    from .models import StatType, STAT_INDEX
+    from .formulas import FormulaEngine
+    from .dedup import group_rows
+except ImportError:
+    # Fallback para execução direta
+    from models import StatType, STAT_INDEX
+    from formulas import FormulaEngine
+    from dedup import group_rows
+
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# Largura máxima da cdf em ataques: builds que precisariam de mais ataques
+# para o abate certo (dano baixo contra HP alto) ficam truncadas aqui, sem
+# alocar matrizes do tamanho de HP / dano
+MAX_KILL_ATTACKS = 1024
+
+def critical_hits_needed_batch(damage: np.ndarray, crit_bonus: np.ndarray, target_hp: np.ndarray,
+                               max_attacks: int) -> np.ndarray:
+    """
+    Mínimo de críticos entre os n primeiros ataques (n = 1..max_attacks,
+    colunas) para que n * damage + críticos * crit_bonus >= target_hp.
+    Sem crítico possível e sem abate, retorna max_attacks + 1 (inalcançável)
+    """
+    damage = np.asarray(damage, dtype=float)[:, None]
+    crit_bonus = np.asarray(crit_bonus, dtype=float)[:, None]
+    target_hp = np.asarray(target_hp, dtype=float)[:, None]
+
+    attack_numbers = np.arange(1, max_attacks + 1)
+    regular = attack_numbers * damage
+    missing = target_hp - regular
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        needed = np.maximum(np.ceil(missing / crit_bonus), 0)
+    needed = np.where(crit_bonus > 0, needed, np.where(missing <= 0, 0, max_attacks + 1))
+    needed = np.minimum(needed, max_attacks + 1)
+
+    # Ajuste fino para reproduzir exatamente a comparação em ponto flutuante
+    bonus = np.where(crit_bonus > 0, crit_bonus, 0)
+    needed -= (needed > 0) & (needed <= max_attacks) & (regular + (needed - 1) * bonus >= target_hp)
+    needed += (needed <= max_attacks) & (regular + needed * bonus < target_hp)
+    return needed.astype(np.int64)
+
+class KillDistribution:
+    """
+    Distribuição exata de N = ataques até o abate, uma linha por build
+    cdf[b, n - 1] = P(N <= n); builds que nunca matam têm cdf nula
+    O n-ésimo ataque acontece em n / attack speed
+
+    Builds truncadas em MAX_KILL_ATTACKS terminam com cdf < 1: não contam
+    como abate certo (esperança infinita), e P(abate até t) e os quantis
+    só enxergam os primeiros MAX_KILL_ATTACKS ataques
+    """
+
+    __slots__ = ("cdf", "attack_speed")
+
+    def __init__(self, cdf: np.ndarray, attack_speed: np.ndarray):
+        self.cdf = cdf
+        self.attack_speed = attack_speed
+
+    def __len__(self) -> int:
+        return self.cdf.shape[0]
+
+    @property
+    def attacks(self) -> np.ndarray:
+        """Número de ataques de cada coluna (1..max)"""
+        return np.arange(1, self.cdf.shape[1] + 1)
+
+    @property
+    def pmf(self) -> np.ndarray:
+        """P(N = n) por build"""
+        return np.diff(self.cdf, axis=1, prepend=0.0)
+
+    @property
+    def kills(self) -> np.ndarray:
+        """Builds que matam o alvo com certeza (dentro da largura da cdf)"""
+        if self.cdf.shape[1] == 0:
+            return np.zeros(len(self), dtype=bool)
+        return (self.cdf[:, -1] >= 1.0) & (self.attack_speed > 0)
+
+    def expected_attacks(self) -> np.ndarray:
+        """E[N] por build (inf se nunca mata)"""
+        expected = self.pmf @ self.attacks if self.cdf.shape[1] else np.zeros(len(self))
+        return np.where(self.kills, expected, np.inf)
+
+    def expected_ttk(self) -> np.ndarray:
+        """E[N] / attack speed por build"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.kills, self.expected_attacks() / self.attack_speed, np.inf)
+
+    def kill_probability(self, times: Sequence[float]) -> np.ndarray:
+        """P(TTK <= t) por build (linhas) e tempo (colunas)"""
+        times = np.asarray(times, dtype=float)
+        # Ataques completados até t: floor(t * attack speed), com tolerância de arredondamento
+        completed = np.floor(self.attack_speed[:, None] * times[None, :] + 1e-9).astype(np.int64)
+        completed = np.clip(completed, 0, self.cdf.shape[1])
+
+        padded = np.concatenate([np.zeros((len(self), 1)), self.cdf], axis=1)
+        probability = np.take_along_axis(padded, completed, axis=1)
+        return np.where(self.attack_speed[:, None] > 0, probability, 0.0)
+
+    def quantiles(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> np.ndarray:
+        """TTK no quantil q (menor tempo com P(TTK <= t) >= q) por build e quantil"""
+        quantiles = np.asarray(quantiles, dtype=float)
+        reached = self.cdf[:, None, :] >= quantiles[None, :, None] - 1e-12
+        attacks = np.where(reached.any(axis=2), np.argmax(reached, axis=2) + 1, np.inf)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.attack_speed[:, None] > 0, attacks / self.attack_speed[:, None], np.inf)
+
+    def summary(self, index: int, times: Sequence[float],
+                quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict[str, any]:
+        """Resumo de uma build: esperança, quantis, P(abate até t) e massa por ataque"""
+        pmf = self.pmf[index]
+        support = np.flatnonzero(pmf > 0)
+
+        return {
+            'expected_attacks': round(float(self.expected_attacks()[index]), 4),
+            'expected_ttk': round(float(self.expected_ttk()[index]), 4),
+            'ttk_quantiles': {
+                float(q): round(float(value), 4)
+                for q, value in zip(quantiles, self.quantiles(quantiles)[index])
+            },
+            'kill_probability': {
+                float(t): round(float(value), 4)
+                for t, value in zip(times, self.kill_probability(times)[index])
+            },
+            'attacks_pmf': {int(n + 1): float(pmf[n]) for n in support},
+        }
+
+def _killing_cdf(damage: np.ndarray, crit_bonus: np.ndarray, crit_chance: np.ndarray,
+                 target_hp: np.ndarray, own_max: np.ndarray) -> np.ndarray:
+    """
+    cdf (builds × min(max(own_max), MAX_KILL_ATTACKS)) de builds que matam;
+    own_max[b] é o ataque em que a build b mata mesmo sem críticos
+    """
+    size = damage.shape[0]
+    max_attacks = min(int(own_max.max()), MAX_KILL_ATTACKS)
+
+    needed = critical_hits_needed_batch(damage, crit_bonus, target_hp, max_attacks)
+    # Sem críticos o abate é garantido no último ataque de cada build
+    columns = np.arange(1, max_attacks + 1)
+    certain = columns[None, :] >= own_max[:, None]
+    needed[certain] = 0
+
+    # tail[b, k] = P(k ou mais críticos nos n primeiros ataques); a coluna
+    # max_attacks + 1 fica sempre nula ("inalcançável")
+    tail = np.zeros((size, max_attacks + 2))
+    tail[:, 0] = 1.0
+    hit = crit_chance[:, None]
+    miss = 1.0 - hit
+    cdf = np.zeros((size, max_attacks))
+    rows = np.arange(size)
+
+    for attack in range(1, max_attacks + 1):
+        # P(C_n >= k) = P(C_n-1 >= k) * (1 - p) + P(C_n-1 >= k - 1) * p
+        tail[:, 1:attack + 1] = tail[:, 1:attack + 1] * miss + tail[:, :attack] * hit
+        cdf[:, attack - 1] = tail[rows, needed[:, attack - 1]]
+
+    # Garantir monotonicidade e o abate certo após erros de ponto flutuante
+    cdf = np.minimum(np.maximum.accumulate(cdf, axis=1), 1.0)
+    cdf[certain] = 1.0
+    return cdf
+
+def kill_distribution(damage: np.ndarray, crit_bonus: np.ndarray, crit_chance: np.ndarray,
+                      attack_speed: np.ndarray, target_hp: np.ndarray) -> KillDistribution:
+    """
+    Distribuição exata de ataques até o abate para um lote de builds
+
+    Críticos são Bernoulli(crit_chance) independentes. Se o alvo morre com
+    C_m críticos em m ataques, também morre em qualquer n > m (o dano por
+    crítico exigido só cai), então P(N <= n) = P(Binomial(n, p) >= need[n]).
+    A cauda binomial é atualizada pela recorrência (convolução com uma
+    Bernoulli) uma vez por ataque, para todas as builds ao mesmo tempo.
+
+    As builds são agrupadas por faixa (potência de 2) do ataque em que
+    matam sem críticos: cada uma custa O(own_max²), não O(max²) do lote.
+    A largura é limitada a MAX_KILL_ATTACKS (ver KillDistribution).
+    """
+    damage = np.asarray(damage, dtype=float)
+    size = damage.shape[0]
+    crit_bonus = np.broadcast_to(np.asarray(crit_bonus, dtype=float), (size,))
+    crit_chance = np.broadcast_to(np.clip(np.asarray(crit_chance, dtype=float), 0.0, 1.0), (size,))
+    attack_speed = np.asarray(attack_speed, dtype=float)
+    target_hp = np.broadcast_to(np.asarray(target_hp, dtype=float), (size,))
+
+    kills = damage > 0
+    with np.errstate(divide="ignore"):
+        own_max = np.where(kills, np.maximum(np.ceil(target_hp / np.where(kills, damage, 1.0)), 1), 0)
+    max_attacks = min(int(own_max.max()), MAX_KILL_ATTACKS) if size else 0
+
+    # Builds sem dano nunca matam: cdf nula; as truncadas ficam na mesma faixa
+    cdf = np.zeros((size, max_attacks))
+    killing = np.flatnonzero(kills)
+    buckets = np.ceil(np.log2(np.minimum(own_max[killing], MAX_KILL_ATTACKS + 1))).astype(np.int64)
+    for bucket in np.unique(buckets):
+        rows = killing[buckets == bucket]
+        part = _killing_cdf(damage[rows], crit_bonus[rows], crit_chance[rows], target_hp[rows], own_max[rows])
+        cdf[rows, :part.shape[1]] = part
+        cdf[rows, part.shape[1]:] = 1.0
+
+    return KillDistribution(cdf, attack_speed)
+
+def kill_distribution_from_stats(stats: np.ndarray, target_hp: np.ndarray, target_armor: np.ndarray,
+                                 formula_engine: FormulaEngine) -> KillDistribution:
+    """
+    Distribuição de abate a partir de stats finais em lote (N × StatType)
+    A recorrência roda uma vez por combinação distinta de dano, crítico,
+    attack speed e HP do alvo; builds equivalentes compartilham a linha
+    """
+    ad = stats[:, STAT_INDEX[StatType.AD]]
+    crit_chance = stats[:, STAT_INDEX[StatType.CRIT_CHANCE]] / 100
+    crit_multiplier = stats[:, STAT_INDEX[StatType.CRIT_DAMAGE]] / 100
+
+    damage_reduction = formula_engine.calculate_damage_reduction_batch(target_armor)
+    damage = ad * (1 - damage_reduction)
+    crit_bonus = ad * crit_multiplier * (1 - damage_reduction) - damage
+    attack_speed = stats[:, STAT_INDEX[StatType.AS]]
+    target_hp = np.broadcast_to(np.asarray(target_hp, dtype=float), damage.shape)
+
+    groups = group_rows(damage, crit_bonus, crit_chance, attack_speed, target_hp)
+    distribution = kill_distribution(*(groups.unique(values) for values in
+                                       (damage, crit_bonus, crit_chance, attack_speed, target_hp)))
+    return KillDistribution(groups.expand(distribution.cdf), attack_speed)
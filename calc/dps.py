@@ -3,16 +3,102 @@
 Módulo especializado em cálculos de DPS e análise de combate
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 import math
+import numpy as np
 
 try:
-    from .models import FinalStats, Target, ChampionStats
+    from .models import Build, FinalStats, Target, ChampionStats, Item, StatType, STAT_INDEX
+    from .batch import compile_modifiers
     from .formulas import FormulaEngine
+    from .damage import DamageKernel, DAMAGE_METRICS
+    from .distribution import DEFAULT_QUANTILES, MAX_KILL_ATTACKS, critical_hits_needed_batch, kill_distribution
+    from .gold_values import DEFAULT_GOLD_VALUES, gold_value_solver
+    from .recommender import UpgradeRecommender
+    from .power_curve import PowerCurveEngine
 except ImportError:
     # Fallback para execução direta
-    from models import FinalStats, Target, ChampionStats
+    from models import Build, FinalStats, Target, ChampionStats, Item, StatType, STAT_INDEX
+    from batch import compile_modifiers
     from formulas import FormulaEngine
+    from damage import DamageKernel, DAMAGE_METRICS
+    from distribution import DEFAULT_QUANTILES, MAX_KILL_ATTACKS, critical_hits_needed_batch, kill_distribution
+    from gold_values import DEFAULT_GOLD_VALUES, gold_value_solver
+    from recommender import UpgradeRecommender
+    from power_curve import PowerCurveEngine
+
+# Parâmetros padrão da simulação de Monte Carlo
+MONTE_CARLO_TRIALS = 100_000
+MONTE_CARLO_PERCENTILES = (5, 25, 50, 75, 95)
+MONTE_CARLO_KILL_TIMES = (1.0, 2.0, 3.0, 5.0, 10.0)
+
+def critical_hits_needed(damage: float, crit_bonus: float, target_hp: float, max_attacks: int) -> np.ndarray:
+    """
+    Para cada número de ataques n (1..max_attacks), o mínimo de críticos
+    entre eles para que n * damage + críticos * crit_bonus >= target_hp
+    """
+    return critical_hits_needed_batch(np.array([damage]), np.array([crit_bonus]),
+                                      np.array([target_hp]), max_attacks)[0]
+
+def simulate_attacks_to_kill(damage: float, crit_bonus: float, crit_chance: float, target_hp: float,
+                             trials: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Sorteia os críticos ataque a ataque e retorna, por tentativa, quantos
+    ataques são necessários para matar o alvo (inf se o dano for nulo)
+    damage: dano efetivo sem crítico; crit_bonus: dano extra de um crítico
+    Como em KillDistribution, só os primeiros MAX_KILL_ATTACKS ataques são
+    sorteados: tentativas que não matam até lá ficam com inf
+    """
+    if damage <= 0:
+        return np.full(trials, np.inf)
+
+    # Sem nenhum crítico o alvo morre em kill_attacks ataques; com todos, em min_attacks
+    kill_attacks = max(1, math.ceil(target_hp / damage))
+    max_attacks = min(kill_attacks, MAX_KILL_ATTACKS)
+    needed = critical_hits_needed(damage, crit_bonus, target_hp, max_attacks)
+    if max_attacks == kill_attacks:
+        needed[-1] = 0  # Garantido sem críticos (protege arredondamentos)
+    reachable = needed <= np.arange(1, max_attacks + 1)
+    if not reachable.any():
+        return np.full(trials, np.inf)
+    min_attacks = int(np.argmax(reachable) + 1)
+
+    # Antes de min_attacks ninguém morre: críticos acumulados em um único sorteio binomial
+    crits = rng.binomial(min_attacks - 1, crit_chance, size=trials)
+    attacks = np.full(trials, np.inf)
+    alive = np.arange(trials)
+
+    for attack in range(min_attacks, max_attacks + 1):
+        crits += rng.random(alive.size) < crit_chance
+        killed = crits >= needed[attack - 1]
+        attacks[alive[killed]] = attack
+        alive = alive[~killed]
+        crits = crits[~killed]
+        if alive.size == 0:
+            break
+
+    return attacks
+
+def distribution_summary(values: np.ndarray, percentiles: Sequence[float]) -> Dict[str, any]:
+    """Média, desvio, extremos e percentis de uma amostra"""
+    finite = values[np.isfinite(values)]
+    if finite.size < values.size:
+        return {
+            'mean': float('inf'),
+            'std': float('inf'),
+            'min': float(values.min()),
+            'max': float('inf'),
+            # Sem interpolação: entre um valor finito e inf ela daria nan
+            'percentiles': {p: float(np.percentile(values, p, method="higher")) for p in percentiles},
+        }
+
+    return {
+        'mean': round(float(values.mean()), 2),
+        'std': round(float(values.std()), 2),
+        'min': round(float(values.min()), 2),
+        'max': round(float(values.max()), 2),
+        'percentiles': {p: round(float(v), 2) for p, v in zip(percentiles, np.percentile(values, percentiles))},
+    }
 
 class DPSCalculator:
     """Calculadora especializada em DPS e análise de combate"""
@@ -57,6 +143,7 @@ class DPSCalculator:
     def calculate_burst_damage(self, stats: FinalStats, target: Target, num_attacks: int = 3) -> Dict[str, float]:
         """
         Calcula dano de burst (primeiros X ataques)
+        Críticos distribuídos de forma fixa; a distribuição real está em simulate_burst_and_ttk
         """
         # Dano por ataque
         base_damage = stats.ad
@@ -92,6 +179,76 @@ class DPSCalculator:
             'remaining_target_hp': max(0, target.hp - total_damage)
         }
 
+    def simulate_burst_and_ttk(self, stats: FinalStats, target: Target, num_attacks: int = 3,
+                               trials: int = MONTE_CARLO_TRIALS, seed: Optional[int] = None,
+                               kill_times: Sequence[float] = MONTE_CARLO_KILL_TIMES,
+                               percentiles: Sequence[float] = MONTE_CARLO_PERCENTILES) -> Dict[str, any]:
+        """
+        Simulação de Monte Carlo dos críticos (versão aleatória do burst)
+
+        Cada ataque é crítico com probabilidade crit_chance, sorteado com um
+        gerador NumPy semeado (seed reproduz os resultados). Retorna as
+        distribuições do burst dos primeiros num_attacks ataques e do TTK
+        (ataques necessários / attack speed) e a probabilidade de matar o
+        alvo até cada tempo de kill_times.
+        """
+        if trials < 1:
+            raise ValueError(f"trials deve ser positivo, recebido: {trials}")
+        if num_attacks < 1:
+            raise ValueError(f"num_attacks deve ser positivo, recebido: {num_attacks}")
+
+        rng = np.random.default_rng(seed)
+        crit_chance = stats.crit_chance / 100
+        crit_multiplier = stats.crit_damage / 100
+
+        armor_reduction = self.formula_engine.calculate_damage_reduction(target.armor)
+        damage = stats.ad * (1 - armor_reduction)
+        crit_bonus = stats.ad * crit_multiplier * (1 - armor_reduction) - damage
+
+        # Burst: número de críticos em num_attacks ataques
+        crits = rng.binomial(num_attacks, crit_chance, size=trials)
+        burst = num_attacks * damage + crits * crit_bonus
+
+        # TTK: o n-ésimo ataque acontece em n / attack speed
+        attacks = simulate_attacks_to_kill(damage, crit_bonus, crit_chance, target.hp, trials, rng)
+        ttk = attacks / stats.as_ if stats.as_ > 0 else np.full(trials, np.inf)
+
+        return {
+            'trials': trials,
+            'seed': seed,
+            'burst': {
+                'num_attacks': num_attacks,
+                'time_for_burst': round(num_attacks / stats.as_, 2) if stats.as_ > 0 else float('inf'),
+                'critical_attacks_mean': round(float(crits.mean()), 4),
+                'kill_probability': round(float(np.mean(burst >= target.hp)), 4),
+                **distribution_summary(burst, percentiles),
+            },
+            'ttk': {
+                'attacks_mean': round(float(attacks.mean()), 4) if np.all(np.isfinite(attacks)) else float('inf'),
+                **distribution_summary(ttk, percentiles),
+            },
+            'kill_probability': {time: round(float(np.mean(ttk <= time)), 4) for time in kill_times},
+        }
+
+    def calculate_kill_distribution(self, stats: FinalStats, target: Target,
+                                    kill_times: Sequence[float] = MONTE_CARLO_KILL_TIMES,
+                                    quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict[str, any]:
+        """
+        Distribuição exata (sem amostragem) de ataques e tempo até o abate
+        Mesmo modelo de simulate_burst_and_ttk; para lotes use
+        calc.distribution.kill_distribution_from_stats
+        """
+        crit_multiplier = stats.crit_damage / 100
+        armor_reduction = self.formula_engine.calculate_damage_reduction(target.armor)
+        damage = stats.ad * (1 - armor_reduction)
+        crit_bonus = stats.ad * crit_multiplier * (1 - armor_reduction) - damage
+
+        distribution = kill_distribution(
+            np.array([damage]), np.array([crit_bonus]), np.array([stats.crit_chance / 100]),
+            np.array([stats.as_]), np.array([target.hp])
+        )
+        return distribution.summary(0, kill_times, quantiles)
+
     def calculate_dps_vs_multiple_targets(self, stats: FinalStats, targets: List[Target]) -> Dict[str, Dict[str, float]]:
         """
         Calcula DPS contra múltiplos alvos
@@ -104,65 +261,63 @@ class DPSCalculator:
 
         return results
 
+    def calculate_mixed_damage(self, build: Build, profile=None,
+                               targets: Optional[List[Target]] = None) -> Dict[str, any]:
+        """
+        DPS físico e mágico de uma build com um perfil de dano (ver calc.damage)
+        profile: DamageProfile ou nome (ex.: DataLoader.get_template_damage_profile)
+        targets: alvos avaliados (padrão: o alvo da build)
+        """
+        targets = targets or ([build.target] if build.target else [])
+        breakdown = DamageKernel(self.formula_engine).evaluate([build], targets, profile)
+
+        return {
+            'profile': breakdown.profile,
+            'targets': {
+                row['target']: {name: row[name] for name in DAMAGE_METRICS}
+                for row in breakdown.rows()
+            },
+        }
+
     def calculate_power_curve(self, champion: ChampionStats, items: List, levels: List[int] = None) -> Dict[int, Dict[str, float]]:
         """
         Calcula curva de poder por nível
+        Todos os níveis em uma única computação (ver PowerCurveEngine)
         """
         if levels is None:
             levels = [1, 6, 11, 16, 18]
+        if not levels:
+            return {}
+
+        curves = PowerCurveEngine(self.formula_engine).compute([champion], [items], levels)
+        table = curves.level_table()
+
+        return {
+            level: {metric: table[level][metric] for metric in ('ad', 'as', 'hp', 'dps', 'effective_damage')}
+            for level in levels
+        }
 
-        try:
-            from .models import Build, PRESET_TARGETS
-        except ImportError:
-            from models import Build, PRESET_TARGETS
-
-        power_curve = {}
-        dummy_target = PRESET_TARGETS["dummy"]
-
-        for level in levels:
-            # Criar build temporária
-            build = Build(
-                name=f"Power Curve Level {level}",
-                champion=champion,
-                level=level,
-                items=items,
-                target=dummy_target
-            )
-
-            # Calcular stats
-            final_stats = self.formula_engine.calculate_final_stats(build)
-            dps_data = self.calculate_basic_attack_dps(final_stats, dummy_target)
-
-            power_curve[level] = {
-                'ad': final_stats.ad,
-                'as': final_stats.as_,
-                'hp': final_stats.hp,
-                'dps': dps_data['dps'],
-                'effective_damage': dps_data['effective_damage']
-            }
-
-        return power_curve
-
-    def calculate_gold_efficiency(self, stats_before: FinalStats, stats_after: FinalStats, item_cost: int) -> Dict[str, float]:
+    def calculate_gold_efficiency(self, stats_before: FinalStats, stats_after: FinalStats, item_cost: int,
+                                  items: Optional[Sequence] = None, item: Optional[Item] = None) -> Dict[str, float]:
         """
         Calcula eficiência de gold de um item
+        items: catálogo de onde derivar o valor de cada stat (ver gold_values);
+        sem catálogo, usa os valores aproximados do LoL
+        item: o item comprado; se informado, o ganho de AS vem dos modificadores
+        dele, sem o piso/teto do AS final
+        Sem items nem item, o ganho de AS é a diferença absoluta × 100, como
+        antes dos valores derivados do catálogo
         """
-        # Valores base de gold por stat (aproximados do LoL)
-        gold_values = {
-            'ad': 35,      # ~35 gold por AD
-            'ap': 21.75,   # ~21.75 gold por AP
-            'as': 25,      # ~25 gold por 1% AS
-            'hp': 2.67,    # ~2.67 gold por HP
-            'armor': 20,   # ~20 gold por Armor
-            'mr': 18,      # ~18 gold por MR
-            'crit_chance': 40,  # ~40 gold por 1% crit
-        }
+        if items:
+            gold_values = gold_value_solver.solve(items).efficiency_values()
+        else:
+            gold_values = DEFAULT_GOLD_VALUES
 
         # Calcular diferenças
         stat_gains = {
             'ad': stats_after.ad - stats_before.ad,
             'ap': stats_after.ap - stats_before.ap,
-            'as': (stats_after.as_ - stats_before.as_) * 100,  # Converter para %
+            'as': self._attack_speed_points(stats_before, stats_after, item, relative=bool(items)),
             'hp': stats_after.hp - stats_before.hp,
             'armor': stats_after.armor - stats_before.armor,
             'mr': stats_after.mr - stats_before.mr,
@@ -186,61 +341,46 @@ class DPSCalculator:
                              for stat, gain in stat_gains.items() if gain > 0}
         }
 
-    def analyze_build_optimization(self, base_build, alternative_items: List) -> Dict[str, any]:
+    def calculate_build_gold_efficiency(self, build: Build, items: Optional[Sequence] = None) -> List[Dict[str, any]]:
+        """
+        Eficiência de gold de cada item da build: o ganho de stats ao
+        adicioná-lo por último, valorado com o catálogo items
+        """
+        stats_after = self.formula_engine.calculate_final_stats(build)
+        rows = []
+        for position, item in enumerate(build.items):
+            others = build.items[:position] + build.items[position + 1:]
+            stats_before = self.formula_engine.calculate_final_stats(build.model_copy(update={'items': others}))
+            efficiency = self.calculate_gold_efficiency(stats_before, stats_after, item.cost, items=items, item=item)
+            rows.append({'item_name': item.name, **efficiency})
+        return rows
+
+    @staticmethod
+    def _attack_speed_points(stats_before: FinalStats, stats_after: FinalStats, item: Optional[Item],
+                             relative: bool) -> float:
+        """
+        Ganho de AS na unidade dos valores em gold: pontos de modificador
+        percentual com item ou relative (valores do catálogo), senão a
+        diferença absoluta × 100 (DEFAULT_GOLD_VALUES)
+        """
+        if item is not None:
+            return (compile_modifiers(item).percent_vector[STAT_INDEX[StatType.AS]] - 1) * 100
+        if not relative:
+            return (stats_after.as_ - stats_before.as_) * 100  # Converter para %
+        if stats_before.as_ <= 0:
+            return 0.0
+        return (stats_after.as_ / stats_before.as_ - 1) * 100
+
+    def analyze_build_optimization(self, base_build, alternative_items: List, combo_size: int = 1,
+                                   top_k: int = 5, catalog: Optional[Sequence] = None) -> Dict[str, any]:
         """
         Analisa otimizações possíveis para uma build
+        Avalia cada item (ou par/trio, combo_size) como delta sobre a build
+        base em lote; ver UpgradeRecommender
         """
-        try:
-            from .models import Build
-        except ImportError:
-            from models import Build
-
-        base_stats = self.formula_engine.calculate_final_stats(base_build)
-        base_dps = self.calculate_basic_attack_dps(base_stats, base_build.target)
-
-        recommendations = []
-
-        for item in alternative_items:
-            # Criar build com item alternativo
-            new_items = base_build.items.copy()
-            new_items.append(item)
-
-            new_build = Build(
-                name=f"With {item.name}",
-                champion=base_build.champion,
-                level=base_build.level,
-                items=new_items,
-                runes=base_build.runes,
-                target=base_build.target
-            )
-
-            new_stats = self.formula_engine.calculate_final_stats(new_build)
-            new_dps = self.calculate_basic_attack_dps(new_stats, base_build.target)
-
-            # Calcular melhoria
-            dps_improvement = new_dps['dps'] - base_dps['dps']
-            dps_improvement_percent = (dps_improvement / base_dps['dps'] * 100) if base_dps['dps'] > 0 else 0
-
-            # Eficiência de gold
-            efficiency = self.calculate_gold_efficiency(base_stats, new_stats, item.cost)
-
-            recommendations.append({
-                'item_name': item.name,
-                'dps_improvement': round(dps_improvement, 2),
-                'dps_improvement_percent': round(dps_improvement_percent, 2),
-                'gold_efficiency': efficiency['efficiency_percent'],
-                'cost': item.cost,
-                'dps_per_gold': round(dps_improvement / item.cost, 4) if item.cost > 0 else 0
-            })
-
-        # Ordenar por DPS por gold
-        recommendations.sort(key=lambda x: x['dps_per_gold'], reverse=True)
-
-        return {
-            'base_dps': base_dps['dps'],
-            'recommendations': recommendations[:5],  # Top 5
-            'total_cost': sum(item.cost for item in base_build.items)
-        }
+        return UpgradeRecommender(self.formula_engine).recommend(
+            base_build, alternative_items, combo_size=combo_size, top_k=top_k, catalog=catalog
+        )
 
     def calculate_survivability_metrics(self, stats: FinalStats) -> Dict[str, float]:
         """
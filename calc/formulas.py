@@ -3,20 +3,42 @@
 Sistema de aplicação de modificadores e cálculos de stats
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 import math
+import numpy as np
 
 try:
     from .models import (
         ChampionStats, Item, RunePreset, FinalStats, Build,
-        StatType, ModifierType, ItemModifier, RuneModifier
+        StatType, ModifierType, ItemModifier, RuneModifier, StatVector,
+        STAT_INDEX
     )
+    from .batch import (
+        BuildMatrix, BatchStats, CompiledModifiers, compile_modifiers, level_table, round_half_even
+    )
+    from .dedup import group_rows
 except ImportError:
     # Fallback para execução direta
     from models import (
         ChampionStats, Item, RunePreset, FinalStats, Build,
-        StatType, ModifierType, ItemModifier, RuneModifier
+        StatType, ModifierType, ItemModifier, RuneModifier, StatVector,
+        STAT_INDEX
+    )
+    from batch import (
+        BuildMatrix, BatchStats, CompiledModifiers, compile_modifiers, level_table, round_half_even
     )
+    from dedup import group_rows
+
+# Stats cuja unidade de sensibilidade é 1% do valor atual (e não +1)
+SENSITIVITY_RELATIVE_STATS = (StatType.AS,)
+
+# Stats sondados por padrão: os que afetam o DPS físico ou o HP efetivo
+SENSITIVITY_STATS = (
+    StatType.AD, StatType.AS, StatType.CRIT_CHANCE, StatType.CRIT_DAMAGE,
+    StatType.HP, StatType.ARMOR, StatType.MR,
+)
+# Com um kernel de dano misto (calc.damage), também AP e penetrações
+SENSITIVITY_MIXED_STATS = SENSITIVITY_STATS + (StatType.AP, StatType.LETHALITY, StatType.MAGIC_PEN)
 
 class FormulaEngine:
     """Engine principal para cálculos de fórmulas"""
@@ -30,7 +52,7 @@ class FormulaEngine:
     def __init__(self):
         self.precision = 2  # Casas decimais para arredondamento
 
-    def calculate_base_stats_at_level(self, champion: ChampionStats, level: int) -> Dict[str, float]:
+    def calculate_base_stats_at_level(self, champion: ChampionStats, level: int) -> StatVector:
         """
         Calcula os stats base do campeão em um nível específico
         Fórmula: base + (growth * (level - 1))
@@ -38,124 +60,100 @@ class FormulaEngine:
         if not (1 <= level <= 18):
             raise ValueError(f"Nível deve estar entre 1 e 18, recebido: {level}")
 
-        level_multiplier = level - 1
-
-        base_stats = {
-            StatType.AD: champion.base_ad + (champion.growth_ad * level_multiplier),
-            StatType.AP: champion.base_ap + (champion.growth_ap * level_multiplier),
-            StatType.AS: champion.base_as * (1 + (champion.growth_as * level_multiplier / 100)),
-            StatType.HP: champion.base_hp + (champion.growth_hp * level_multiplier),
-            StatType.MANA: champion.base_mana + (champion.growth_mana * level_multiplier),
-            StatType.ARMOR: champion.base_armor + (champion.growth_armor * level_multiplier),
-            StatType.MR: champion.base_mr + (champion.growth_mr * level_multiplier),
-            StatType.MS: champion.base_ms + (champion.growth_ms * level_multiplier),
-            StatType.CRIT_CHANCE: 0.0,
-            StatType.CRIT_DAMAGE: 200.0,  # 200% é o padrão
-        }
-
-        return base_stats
+        # Cópia da linha pré-calculada da tabela de níveis do campeão
+        return StatVector(level_table(champion)[level - 1])
 
-    def apply_item_modifiers(self, base_stats: Dict[str, float], items: List[Item]) -> Dict[str, float]:
+    def apply_item_modifiers(self, base_stats: Union[StatVector, Dict[str, float]], items: List[Item]) -> StatVector:
         """
-        Aplica modificadores de itens aos stats base
+        Aplica modificadores de itens aos stats base (in place em StatVector)
         Ordem: flat primeiro, depois percentuais
         """
-        stats = base_stats.copy()
+        stats = StatVector.coerce(base_stats)
+        return self._apply_compiled(stats, [compile_modifiers(item) for item in items])
 
-        # Primeira passada: modificadores flat
-        for item in items:
-            for modifier in item.modifiers:
-                if modifier.modifier_type == ModifierType.FLAT:
-                    current_value = stats.get(modifier.stat, 0.0)
-                    stats[modifier.stat] = current_value + modifier.value
-
-        # Segunda passada: modificadores percentuais
-        for item in items:
-            for modifier in item.modifiers:
-                if modifier.modifier_type == ModifierType.PERCENT:
-                    current_value = stats.get(modifier.stat, 0.0)
-                    # Percentual é aplicado sobre o valor atual
-                    stats[modifier.stat] = current_value * (1 + modifier.value / 100)
-
-        return stats
-
-    def apply_rune_modifiers(self, stats: Dict[str, float], runes: RunePreset) -> Dict[str, float]:
+    def apply_rune_modifiers(self, stats: Union[StatVector, Dict[str, float]], runes: RunePreset) -> StatVector:
         """
-        Aplica modificadores de runas
+        Aplica modificadores de runas (in place em StatVector)
         """
+        stats = StatVector.coerce(stats)
         if not runes:
             return stats
 
-        modified_stats = stats.copy()
+        return self._apply_compiled(stats, [compile_modifiers(runes)])
 
-        # Primeira passada: modificadores flat
-        for modifier in runes.modifiers:
-            if modifier.modifier_type == ModifierType.FLAT:
-                current_value = modified_stats.get(modifier.stat, 0.0)
-                modified_stats[modifier.stat] = current_value + modifier.value
+    def _apply_compiled(self, stats: StatVector, compiled: List[CompiledModifiers]) -> StatVector:
+        """
+        Aplica modificadores compilados: soma das linhas flat, depois produto
+        das linhas percentuais, sempre na ordem dos itens
+        """
+        vector = stats.array
 
-        # Segunda passada: modificadores percentuais
-        for modifier in runes.modifiers:
-            if modifier.modifier_type == ModifierType.PERCENT:
-                current_value = modified_stats.get(modifier.stat, 0.0)
-                modified_stats[modifier.stat] = current_value * (1 + modifier.value / 100)
+        for modifiers in compiled:
+            for row in modifiers.flat:
+                vector += row
 
-        return modified_stats
+        for modifiers in compiled:
+            for row in modifiers.percent:
+                vector *= row
 
-    def apply_caps_and_limits(self, stats: Dict[str, float]) -> Dict[str, float]:
+        return stats
+
+    def apply_caps_and_limits(self, stats: Union[StatVector, Dict[str, float]]) -> StatVector:
         """
-        Aplica caps e limites do jogo
+        Aplica caps e limites do jogo (in place em StatVector)
         """
-        capped_stats = stats.copy()
+        capped_stats = StatVector.coerce(stats)
+        vector = capped_stats.array
 
         # Cap de Attack Speed
-        if StatType.AS in capped_stats:
-            capped_stats[StatType.AS] = min(capped_stats[StatType.AS], self.MAX_ATTACK_SPEED)
+        as_index = STAT_INDEX[StatType.AS]
+        vector[as_index] = min(vector[as_index], self.MAX_ATTACK_SPEED)
 
         # Cap de Critical Chance
-        if StatType.CRIT_CHANCE in capped_stats:
-            capped_stats[StatType.CRIT_CHANCE] = min(capped_stats[StatType.CRIT_CHANCE], self.MAX_CRITICAL_CHANCE)
+        crit_index = STAT_INDEX[StatType.CRIT_CHANCE]
+        vector[crit_index] = min(vector[crit_index], self.MAX_CRITICAL_CHANCE)
 
         # Garantir valores mínimos
         for stat_type in [StatType.HP, StatType.AD, StatType.AS]:
-            if stat_type in capped_stats:
-                capped_stats[stat_type] = max(capped_stats[stat_type], 1.0)
+            index = STAT_INDEX[stat_type]
+            vector[index] = max(vector[index], 1.0)
 
         return capped_stats
 
-    def calculate_final_stats(self, build: Build) -> FinalStats:
+    def calculate_final_stats(self, build: Build, trusted: bool = False) -> FinalStats:
         """
         Calcula todas as estatísticas finais de uma build
+        trusted=True pula a validação do FinalStats (laços internos)
         """
         # 1. Stats base no nível especificado
-        base_stats = self.calculate_base_stats_at_level(build.champion, build.level)
+        stats = self.calculate_base_stats_at_level(build.champion, build.level)
 
         # 2. Aplicar modificadores de itens
-        stats_with_items = self.apply_item_modifiers(base_stats, build.items)
+        self.apply_item_modifiers(stats, build.items)
 
         # 3. Aplicar modificadores de runas
-        stats_with_runes = self.apply_rune_modifiers(stats_with_items, build.runes)
+        self.apply_rune_modifiers(stats, build.runes)
 
         # 4. Aplicar caps e limites
-        final_stats_dict = self.apply_caps_and_limits(stats_with_runes)
+        self.apply_caps_and_limits(stats)
 
         # 5. Arredondar valores
-        for stat_type, value in final_stats_dict.items():
-            final_stats_dict[stat_type] = round(value, self.precision)
+        values = [round(value, self.precision) for value in stats.array.tolist()]
 
         # 6. Criar objeto FinalStats
-        final_stats = FinalStats(
+        constructor = FinalStats.trusted if trusted else FinalStats
+        final_stats = constructor(
             level=build.level,
-            ad=final_stats_dict.get(StatType.AD, 0),
-            ap=final_stats_dict.get(StatType.AP, 0),
-            as_=final_stats_dict.get(StatType.AS, 0),
-            crit_chance=final_stats_dict.get(StatType.CRIT_CHANCE, 0),
-            crit_damage=final_stats_dict.get(StatType.CRIT_DAMAGE, 200),
-            hp=final_stats_dict.get(StatType.HP, 1),
-            mana=final_stats_dict.get(StatType.MANA, 0),
-            armor=final_stats_dict.get(StatType.ARMOR, 0),
-            mr=final_stats_dict.get(StatType.MR, 0),
-            ms=final_stats_dict.get(StatType.MS, 0),
+            ad=values[STAT_INDEX[StatType.AD]],
+            ap=values[STAT_INDEX[StatType.AP]],
+            as_=values[STAT_INDEX[StatType.AS]],
+            crit_chance=values[STAT_INDEX[StatType.CRIT_CHANCE]],
+            crit_damage=values[STAT_INDEX[StatType.CRIT_DAMAGE]],
+            hp=values[STAT_INDEX[StatType.HP]],
+            mana=values[STAT_INDEX[StatType.MANA]],
+            armor=values[STAT_INDEX[StatType.ARMOR]],
+            mr=values[STAT_INDEX[StatType.MR]],
+            ms=values[STAT_INDEX[StatType.MS]],
         )
 
         # 7. Calcular stats derivados
@@ -168,6 +166,232 @@ class FormulaEngine:
 
         return final_stats
 
+    def calculate_final_stats_batch(self, matrix: BuildMatrix, dedup: bool = False) -> BatchStats:
+        """
+        Calcula as estatísticas finais de N builds de uma vez
+        Mesmo pipeline de calculate_final_stats, com operações sobre a matriz
+        (builds × StatType); os resultados são idênticos bit a bit
+        dedup=True calcula os stats derivados uma vez por vetor de stats finais
+        e alvo distintos e os espalha para as builds equivalentes (batch.groups)
+        """
+        levels = matrix.levels
+        if np.any((levels < 1) | (levels > 18)):
+            raise ValueError(f"Nível deve estar entre 1 e 18, recebido: {levels[(levels < 1) | (levels > 18)][0]}")
+
+        # 1. Stats base no nível de cada build
+        level_multiplier = (levels - 1).astype(float)
+        stats = matrix.base + (matrix.growth * level_multiplier[:, None])
+
+        as_column = STAT_INDEX[StatType.AS]
+        stats[:, as_column] = matrix.base[:, as_column] * (1 + (matrix.growth[:, as_column] * level_multiplier / 100))
+
+        # 2/3. Itens e runas: flat primeiro, depois percentuais, camada a camada
+        # (a ordem das somas/produtos é a mesma do cálculo escalar)
+        for flat_layers, percent_layers in ((matrix.item_flat, matrix.item_percent),
+                                            (matrix.rune_flat, matrix.rune_percent)):
+            for layer in range(flat_layers.shape[1]):
+                stats += flat_layers[:, layer]
+            for layer in range(percent_layers.shape[1]):
+                stats *= percent_layers[:, layer]
+
+        # 4/5. Caps, limites e arredondamento
+        stats = self.finalize_stats_batch(stats)
+
+        # 6. Stats derivados
+        groups = group_rows(stats, matrix.target_hp, matrix.target_armor) if dedup else None
+        derived = self._derived_stats_batch(
+            *((stats, matrix.target_hp, matrix.target_armor) if groups is None else
+              (groups.unique(stats), groups.unique(matrix.target_hp), groups.unique(matrix.target_armor)))
+        )
+        if groups is not None:
+            derived = [groups.expand(values) for values in derived]
+        dps, ttk, effective_hp_physical, effective_hp_magical = derived
+
+        return BatchStats(
+            levels=levels,
+            stats=stats,
+            dps=dps,
+            ttk=ttk,
+            effective_hp_physical=effective_hp_physical,
+            effective_hp_magical=effective_hp_magical,
+            groups=groups,
+        )
+
+    def _derived_stats_batch(self, stats: np.ndarray, target_hp: np.ndarray,
+                             target_armor: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """DPS, TTK e HP efetivo (físico/mágico) de stats finais"""
+        dps, ttk = self.calculate_dps_batch(stats, target_hp, target_armor)
+
+        hp = stats[:, STAT_INDEX[StatType.HP]]
+        effective_hp_physical = self.calculate_effective_hp_batch(hp, stats[:, STAT_INDEX[StatType.ARMOR]])
+        effective_hp_magical = self.calculate_effective_hp_batch(hp, stats[:, STAT_INDEX[StatType.MR]])
+        return dps, ttk, effective_hp_physical, effective_hp_magical
+
+    def finalize_stats_batch(self, stats: np.ndarray) -> np.ndarray:
+        """
+        Aplica caps/limites (in place) e arredonda uma matriz (N × StatType)
+        Equivale a apply_caps_and_limits seguido do arredondamento final
+        """
+        return round_half_even(self.apply_caps_batch(stats), self.precision)
+
+    def apply_caps_batch(self, stats: np.ndarray) -> np.ndarray:
+        """Versão vetorizada (in place) de apply_caps_and_limits, sem arredondar"""
+        as_column = STAT_INDEX[StatType.AS]
+        stats[:, as_column] = np.minimum(stats[:, as_column], self.MAX_ATTACK_SPEED)
+        crit_column = STAT_INDEX[StatType.CRIT_CHANCE]
+        stats[:, crit_column] = np.minimum(stats[:, crit_column], self.MAX_CRITICAL_CHANCE)
+        for stat_type in [StatType.HP, StatType.AD, StatType.AS]:
+            column = STAT_INDEX[stat_type]
+            stats[:, column] = np.maximum(stats[:, column], 1.0)
+
+        return stats
+
+    def calculate_dps_batch(self, stats: np.ndarray, target_hp: np.ndarray,
+                            target_armor: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula DPS e TTK para uma matriz de stats finais (já arredondados)
+        Linhas com alvo NaN resultam em NaN
+
+        Alvos fazem broadcast contra stats[..., 0]: stats (N × 1 × StatType)
+        com alvos (T,) dá resultados N × T sem repetir os stats por alvo
+        """
+        dps = round_half_even(self._raw_dps_batch(stats, target_armor), self.precision)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ttk = np.where(dps > 0, round_half_even(target_hp / dps, self.precision), float('inf'))
+        ttk[np.isnan(dps)] = np.nan
+
+        return dps, ttk
+
+    def _raw_dps_batch(self, stats: np.ndarray, target_armor: np.ndarray) -> np.ndarray:
+        """DPS sem arredondamento (NaN sem alvo); termos da build calculados uma vez por linha de stats"""
+        crit_chance = stats[..., STAT_INDEX[StatType.CRIT_CHANCE]] / 100
+        crit_multiplier = stats[..., STAT_INDEX[StatType.CRIT_DAMAGE]] / 100
+        average_damage = stats[..., STAT_INDEX[StatType.AD]] * (1 + crit_chance * (crit_multiplier - 1))
+
+        damage_reduction = self.calculate_damage_reduction_batch(target_armor)
+        effective_damage = average_damage * (1 - damage_reduction)
+        return effective_damage * stats[..., STAT_INDEX[StatType.AS]]
+
+    def calculate_sensitivity_batch(self, stats: np.ndarray, target_hp: np.ndarray, target_armor: np.ndarray,
+                                    probes: Optional[Sequence[StatType]] = None,
+                                    target_mr: Optional[np.ndarray] = None, damage_kernel=None,
+                                    profile=None) -> Dict[str, np.ndarray]:
+        """
+        Ganho marginal de DPS, TTK e HP efetivo por unidade de cada stat
+        stats: stats finais (N × StatType); retorna arrays (N × len(probes))
+
+        Diferenças finitas progressivas: cada build é avaliada com um stat
+        acrescido de uma unidade (AS: +1% do valor atual; demais: +1 no valor
+        do stat, ex.: +1 AD, +1% de crítico), todas as perturbações em um
+        único lote. Caps são reaplicados, então stats no limite valem zero.
+        As métricas não são arredondadas para não mascarar ganhos pequenos.
+
+        Sem damage_kernel o DPS é o físico de calculate_dps_batch e as probes
+        padrão são SENSITIVITY_STATS (AP, MANA, MS e penetrações não mudam
+        nenhuma métrica). Com um calc.damage.DamageKernel, o DPS é o misto do
+        perfil profile contra target_mr (padrão 0) e as probes padrão são
+        SENSITIVITY_MIXED_STATS.
+        """
+        if probes is None:
+            probes = SENSITIVITY_STATS if damage_kernel is None else SENSITIVITY_MIXED_STATS
+        probes = list(probes)
+        size, probe_count = stats.shape[0], len(probes)
+        columns = np.array([STAT_INDEX[stat] for stat in probes], dtype=np.int64)
+
+        units = np.ones((size, probe_count))
+        relative = np.array([stat in SENSITIVITY_RELATIVE_STATS for stat in probes], dtype=bool)
+        units[:, relative] = stats[:, columns[relative]] / 100
+
+        # Linha 0 de cada build sem perturbação, seguida de uma linha por stat
+        perturbed = np.repeat(stats[:, None, :], probe_count + 1, axis=1)
+        perturbed[:, 1 + np.arange(probe_count), columns] += units
+        perturbed = self.apply_caps_batch(perturbed.reshape(-1, stats.shape[1]))
+
+        rows = probe_count + 1
+        target_hp = np.repeat(np.asarray(target_hp, dtype=float), rows)
+        target_armor = np.repeat(np.asarray(target_armor, dtype=float), rows)
+
+        if damage_kernel is None:
+            dps = self._raw_dps_batch(perturbed, target_armor)
+        else:
+            target_mr = np.repeat(np.asarray(target_mr if target_mr is not None else np.zeros(size), dtype=float),
+                                  rows)
+            damage = damage_kernel.raw_damage_batch(perturbed, target_armor, target_mr, profile)
+            dps = damage['physical_dps'] + damage['magic_dps']
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ttk = np.where(dps > 0, target_hp / dps, np.inf)
+        ttk[np.isnan(dps)] = np.nan
+        hp = perturbed[:, STAT_INDEX[StatType.HP]]
+        metrics = {
+            'dps': dps,
+            'ttk': ttk,
+            'effective_hp_physical': self.calculate_effective_hp_batch(hp, perturbed[:, STAT_INDEX[StatType.ARMOR]]),
+            'effective_hp_magical': self.calculate_effective_hp_batch(hp, perturbed[:, STAT_INDEX[StatType.MR]]),
+        }
+
+        gradients = {}
+        for name, values in metrics.items():
+            values = values.reshape(size, rows)
+            with np.errstate(invalid="ignore"):
+                gradients[name] = values[:, 1:] - values[:, :1]
+        gradients['units'] = units
+        return gradients
+
+    def calculate_stat_sensitivity(self, builds: Sequence[Build], probes: Optional[Sequence[StatType]] = None,
+                                   damage_kernel=None, profile=None) -> List[Dict[str, any]]:
+        """
+        Tabela de sensibilidade: uma linha por (build, stat) com o ganho
+        marginal de cada métrica (ver calculate_sensitivity_batch; com
+        damage_kernel, o DPS misto do perfil contra a MR do alvo)
+        """
+        if probes is None:
+            probes = SENSITIVITY_STATS if damage_kernel is None else SENSITIVITY_MIXED_STATS
+        probes = list(probes)
+        batch = self.calculate_final_stats_batch(BuildMatrix.from_builds(builds))
+        target_hp = np.array([build.target.hp if build.target else np.nan for build in builds])
+        target_armor = np.array([build.target.armor if build.target else np.nan for build in builds])
+        target_mr = np.array([build.target.mr if build.target else np.nan for build in builds])
+
+        # Builds equivalentes (mesmos stats e alvo) compartilham as perturbações
+        groups = group_rows(batch.stats, target_hp, target_armor, target_mr)
+        gradients = self.calculate_sensitivity_batch(
+            groups.unique(batch.stats), groups.unique(target_hp), groups.unique(target_armor), probes,
+            target_mr=groups.unique(target_mr), damage_kernel=damage_kernel, profile=profile
+        )
+        gradients = {name: groups.expand(values) for name, values in gradients.items()}
+
+        table = []
+        for row, build in enumerate(builds):
+            for position, stat in enumerate(probes):
+                entry = {
+                    'build': build.name,
+                    'stat': stat.value,
+                    'unit': "+1%" if stat in SENSITIVITY_RELATIVE_STATS else "+1",
+                }
+                for metric in ('dps', 'ttk', 'effective_hp_physical', 'effective_hp_magical'):
+                    value = gradients[metric][row, position]
+                    entry[metric] = None if not np.isfinite(value) else round(float(value), 4)
+                table.append(entry)
+
+        return table
+
+    def calculate_damage_reduction_batch(self, resistances: np.ndarray) -> np.ndarray:
+        """Versão vetorizada de calculate_damage_reduction"""
+        resistances = np.asarray(resistances, dtype=float)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            negative = -np.abs(resistances) / (100 - np.abs(resistances))
+            positive = np.minimum(resistances / (100 + resistances), self.MAX_DAMAGE_REDUCTION)
+
+        return np.where(resistances < 0, negative, positive)
+
+    def calculate_effective_hp_batch(self, hp: np.ndarray, resistances: np.ndarray) -> np.ndarray:
+        """Versão vetorizada de calculate_effective_hp"""
+        damage_reduction = self.calculate_damage_reduction_batch(resistances)
+        effective_multiplier = 1 / (1 - damage_reduction)
+        return hp * effective_multiplier
+
     def calculate_damage_reduction(self, resistance: float) -> float:
         """
         Calcula a redução de dano baseada na resistência
@@ -0,0 +1,246 @@
+"""
+🔥 SmashBuilder - Valor em Gold dos Stats 🔥
+Valores de gold por stat derivados do catálogo de itens por mínimos quadrados
+"""
+
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple, Union
+import hashlib
+import json
+import weakref
+import numpy as np
+
+try:
+    from .models import Item, StatType, ModifierType, STAT_INDEX, NUM_STATS
+    from .catalog import ItemCatalog, STAT_COLUMNS
+    from .batch import modifiers_key
+except ImportError:
+    # Fallback para execução direta
+    from models import Item, StatType, ModifierType, STAT_INDEX, NUM_STATS
+    from catalog import ItemCatalog, STAT_COLUMNS
+    from batch import modifiers_key
+
+# Versões de catálogo lembradas pelo solver (LRU, como o BuildCache)
+GOLD_VALUES_CACHE_SIZE = 8
+
+# Valores aproximados do LoL, usados quando o catálogo não precifica o stat
+DEFAULT_GOLD_VALUES = {
+    'ad': 35,      # ~35 gold por AD
+    'ap': 21.75,   # ~21.75 gold por AP
+    'as': 25,      # ~25 gold por 1% AS
+    'hp': 2.67,    # ~2.67 gold por HP
+    'armor': 20,   # ~20 gold por Armor
+    'mr': 18,      # ~18 gold por MR
+    'crit_chance': 40,  # ~40 gold por 1% crit
+}
+
+# Coluna da matriz de projeto que precifica cada chave de calculate_gold_efficiency
+EFFICIENCY_COLUMNS = {
+    'ad': (StatType.AD, ModifierType.FLAT),
+    'ap': (StatType.AP, ModifierType.FLAT),
+    'as': (StatType.AS, ModifierType.PERCENT),
+    'hp': (StatType.HP, ModifierType.FLAT),
+    'armor': (StatType.ARMOR, ModifierType.FLAT),
+    'mr': (StatType.MR, ModifierType.FLAT),
+    'crit_chance': (StatType.CRIT_CHANCE, ModifierType.FLAT),
+}
+
+# Colunas da matriz de projeto: as colunas de stats do catálogo colunar
+DESIGN_COLUMNS: Tuple[Tuple[StatType, ModifierType], ...] = STAT_COLUMNS
+
+def catalog_version(items: Sequence[Item]) -> str:
+    """
+    Versão dos dados: hash do conteúdo relevante do catálogo (nome, custo e
+    modificadores), independente da ordem dos itens
+    """
+    content = sorted(
+        (item.name, item.cost, [(m.stat.value, m.value, m.modifier_type.value) for m in item.modifiers])
+        for item in items
+    )
+    return hashlib.sha1(json.dumps(content).encode("utf-8")).hexdigest()
+
+def items_key(items: Sequence[Item]) -> Hashable:
+    """
+    Chave barata do conteúdo de uma lista de itens (sem serializar nem
+    ordenar); acompanha edições no lugar, ao contrário da identidade
+    """
+    return tuple((item.name, item.cost, modifiers_key(item.modifiers)) for item in items)
+
+def design_matrix(items: Union[ItemCatalog, Sequence[Item]]) -> np.ndarray:
+    """
+    Matriz (itens × 2·StatType): quantidade de cada stat flat e, para os
+    percentuais, os pontos percentuais somados ((fator - 1) × 100)
+    """
+    return ItemCatalog.of(items).stat_matrix()
+
+def nonnegative_least_squares(matrix: np.ndarray, target: np.ndarray, max_iterations: Optional[int] = None,
+                              tolerance: float = 1e-10) -> np.ndarray:
+    """
+    min ||matrix @ x - target|| com x >= 0 (método de conjunto ativo de
+    Lawson-Hanson); um stat não pode valer gold negativo
+    """
+    columns = matrix.shape[1]
+    max_iterations = max_iterations or 3 * columns
+    solution = np.zeros(columns)
+    passive = np.zeros(columns, dtype=bool)
+    gradient = matrix.T @ (target - matrix @ solution)
+
+    for _ in range(max_iterations):
+        if passive.all() or np.max(np.where(passive, -np.inf, gradient)) <= tolerance:
+            break
+
+        passive[int(np.argmax(np.where(passive, -np.inf, gradient)))] = True
+        while True:
+            candidate = np.zeros(columns)
+            candidate[passive] = np.linalg.lstsq(matrix[:, passive], target, rcond=None)[0]
+            if np.all(candidate[passive] > tolerance):
+                break
+
+            # Recuar até a fronteira e liberar as variáveis que zeraram
+            blocking = passive & (candidate <= tolerance)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                steps = solution[blocking] / (solution[blocking] - candidate[blocking])
+            steps = np.nan_to_num(steps, nan=0.0, posinf=0.0)
+            solution = solution + np.min(steps) * (candidate - solution)
+            passive &= solution > tolerance
+        solution = candidate
+        gradient = matrix.T @ (target - matrix @ solution)
+
+    return solution
+
+class GoldValues:
+    """
+    Valores de gold por unidade de cada coluna da matriz de projeto
+    Colunas que nenhum item do catálogo possui ficam sem preço (NaN)
+    """
+
+    __slots__ = ("version", "values", "items")
+
+    def __init__(self, version: str, values: np.ndarray, items: int):
+        self.version = version
+        self.values = values
+        self.items = items
+
+    def value(self, stat: StatType, modifier_type: ModifierType = ModifierType.FLAT) -> float:
+        """Gold por unidade de um stat (por ponto percentual se PERCENT)"""
+        offset = NUM_STATS if modifier_type == ModifierType.PERCENT else 0
+        return float(self.values[offset + STAT_INDEX[stat]])
+
+    def efficiency_values(self) -> Dict[str, float]:
+        """Valores nas chaves de calculate_gold_efficiency (padrão para stats sem preço)"""
+        values = {}
+        for key, (stat, modifier_type) in EFFICIENCY_COLUMNS.items():
+            value = self.value(stat, modifier_type)
+            values[key] = value if np.isfinite(value) else DEFAULT_GOLD_VALUES[key]
+        return values
+
+    def to_dict(self) -> Dict[str, float]:
+        """Valores com preço, por coluna ('stat' ou 'stat_percent')"""
+        return {
+            stat.value + ("_percent" if modifier_type == ModifierType.PERCENT else ""): round(float(value), 4)
+            for (stat, modifier_type), value in zip(DESIGN_COLUMNS, self.values)
+            if np.isfinite(value)
+        }
+
+class GoldValueSolver:
+    """
+    Deriva o valor em gold de cada stat a partir dos itens carregados:
+    custo ≈ matriz de projeto @ valores, resolvido por mínimos quadrados
+    não negativos e guardado por versão dos dados
+
+    A versão (hash do conteúdo) só é calculada na primeira vez que um
+    catálogo aparece: ItemCatalog (somente leitura) é reconhecido pela
+    instância e listas pela chave barata items_key; versões e listas
+    ficam em LRUs de até maxsize entradas
+    """
+
+    def __init__(self, maxsize: int = GOLD_VALUES_CACHE_SIZE):
+        if maxsize < 1:
+            raise ValueError(f"maxsize deve ser positivo, recebido: {maxsize}")
+
+        self.maxsize = maxsize
+        self._cache: "OrderedDict[str, GoldValues]" = OrderedDict()
+        self._by_catalog: "weakref.WeakKeyDictionary[ItemCatalog, GoldValues]" = weakref.WeakKeyDictionary()
+        self._by_items: "OrderedDict[Hashable, GoldValues]" = OrderedDict()
+
+    def solve(self, items: Union[ItemCatalog, Sequence[Item]]) -> GoldValues:
+        """Valores de gold do catálogo (recalculados só quando os dados mudam)"""
+        if isinstance(items, ItemCatalog):
+            gold_values = self._by_catalog.get(items)
+            if gold_values is None:
+                gold_values = self._by_catalog[items] = self._solve_version(items)
+            return gold_values
+
+        items = list(items)
+        key = items_key(items)
+        gold_values = self._lookup(self._by_items, key)
+        if gold_values is None:
+            gold_values = self._store(self._by_items, key, self._solve_version(items))
+        else:
+            self._lookup(self._cache, gold_values.version)
+        return gold_values
+
+    def _lookup(self, entries: OrderedDict, key: Hashable) -> Optional[GoldValues]:
+        """Entrada do LRU (marcada como a mais recente)"""
+        gold_values = entries.get(key)
+        if gold_values is not None:
+            entries.move_to_end(key)
+        return gold_values
+
+    def _store(self, entries: OrderedDict, key: Hashable, gold_values: GoldValues) -> GoldValues:
+        """Guarda no LRU, descartando as entradas mais antigas além de maxsize"""
+        entries[key] = gold_values
+        entries.move_to_end(key)
+        while len(entries) > self.maxsize:
+            entries.popitem(last=False)
+        return gold_values
+
+    def _solve_version(self, items: Union[ItemCatalog, List[Item]]) -> GoldValues:
+        """Resolve pela versão dos dados (a mesma para qualquer ordem dos itens)"""
+        version = catalog_version(items)
+        cached = self._lookup(self._cache, version)
+        if cached is not None:
+            return cached
+
+        catalog = ItemCatalog.of(items)
+        matrix = catalog.stat_matrix()
+        costs = catalog.cost.astype(float)
+        used = np.flatnonzero(np.any(matrix != 0, axis=0))
+
+        values = np.full(matrix.shape[1], np.nan)
+        if used.size:
+            values[used] = nonnegative_least_squares(matrix[:, used], costs)
+
+        return self._store(self._cache, version, GoldValues(version, values, len(catalog)))
+
+    def clear_cache(self):
+        """Descarta os valores calculados"""
+        self._cache.clear()
+        self._by_catalog.clear()
+        self._by_items.clear()
+
+    def catalog_efficiency(self, items: Union[ItemCatalog, Sequence[Item]]) -> List[Dict[str, any]]:
+        """
+        Eficiência de gold de todos os itens do catálogo em um único
+        produto matriz-vetor (valor em gold = matriz de projeto @ valores)
+        """
+        catalog = ItemCatalog.of(items)
+        gold_values = self.solve(catalog)
+        total_values = catalog.stat_matrix() @ np.nan_to_num(gold_values.values)
+        costs = catalog.cost.astype(float)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            efficiency = np.where(costs > 0, total_values / costs * 100, 0.0)
+
+        return [
+            {
+                'item_name': item.name,
+                'item_cost': item.cost,
+                'total_gold_value': round(float(value), 2),
+                'efficiency_percent': round(float(percent), 2),
+            }
+            for item, value, percent in zip(catalog, total_values, efficiency)
+        ]
+
+# Instância global do solver
+gold_value_solver = GoldValueSolver()
@@ -3,9 +3,11 @@
 Estruturas de dados usando Pydantic para validação
 """
 
-from typing import Dict, List, Optional, Union
-from pydantic import BaseModel, Field, validator
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Union
+from pydantic import BaseModel, Field, PrivateAttr, validator
 from enum import Enum
+import numpy as np
 
 class StatType(str, Enum):
     """Tipos de atributos suportados"""
@@ -28,6 +30,78 @@ class ModifierType(str, Enum):
     PERCENT = "percent"
     UNIQUE = "unique"
 
+# Ordem fixa dos stats nas representações vetoriais (colunas das matrizes)
+STAT_ORDER = tuple(StatType)
+STAT_INDEX = {stat: index for index, stat in enumerate(STAT_ORDER)}
+NUM_STATS = len(STAT_ORDER)
+
+class StatVector(Mapping):
+    """
+    Vetor de stats em float64 com ordem fixa (STAT_ORDER)
+    Substitui Dict[StatType, float] no pipeline de cálculo; a interface de
+    Mapping (stats[StatType.AD], .get, .items) é mantida por compatibilidade
+    """
+
+    __slots__ = ("array",)
+
+    def __init__(self, array: Optional[np.ndarray] = None):
+        self.array = np.zeros(NUM_STATS) if array is None else np.array(array, dtype=float)
+
+    @classmethod
+    def from_dict(cls, stats: Dict[str, float]) -> "StatVector":
+        """Cria um vetor a partir de um dict (stats ausentes valem 0)"""
+        vector = cls()
+        for stat, value in stats.items():
+            vector.array[STAT_INDEX[stat]] = value
+        return vector
+
+    @classmethod
+    def coerce(cls, stats: Union["StatVector", Dict[str, float]]) -> "StatVector":
+        """Retorna o próprio vetor ou converte um dict (compatibilidade)"""
+        if isinstance(stats, cls):
+            return stats
+        return cls.from_dict(stats)
+
+    def __getitem__(self, stat: StatType) -> float:
+        return float(self.array[STAT_INDEX[stat]])
+
+    def __setitem__(self, stat: StatType, value: float):
+        self.array[STAT_INDEX[stat]] = value
+
+    def __iter__(self) -> Iterator[StatType]:
+        return iter(STAT_ORDER)
+
+    def __len__(self) -> int:
+        return NUM_STATS
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{stat.name}={value:g}" for stat, value in zip(STAT_ORDER, self.array))
+        return f"StatVector({values})"
+
+    def copy(self) -> "StatVector":
+        """Cópia independente do vetor"""
+        return StatVector(self.array)
+
+    def to_dict(self) -> Dict[StatType, float]:
+        """Visão em dict (compatibilidade com o formato antigo)"""
+        return dict(zip(STAT_ORDER, self.array.tolist()))
+
+class TrustedModel(BaseModel):
+    """
+    Base para modelos criados em laços internos a partir de dados já validados
+    trusted() pula validação; validated() reconstrói o modelo completo
+    """
+
+    @classmethod
+    def trusted(cls, **values):
+        """Constrói sem validar campos nem validators (dados confiáveis)"""
+        return cls.model_construct(**values)
+
+    def validated(self):
+        """Retorna uma cópia validada (levanta ValueError se houver dado inválido)"""
+        cls = type(self)
+        return cls(**{name: getattr(self, name) for name in cls.model_fields})
+
 class ChampionStats(BaseModel):
     """Estatísticas base de um campeão"""
     name: str = Field(..., description="Nome do campeão")
@@ -55,6 +129,9 @@ class ChampionStats(BaseModel):
     # Metadados
     champion_class: str = Field("Unknown", description="Classe do campeão")
     patch: str = Field("14.1", description="Patch dos dados")
+
+    # (champion_key, tabela de stats base por nível), preenchida por calc.batch.level_table
+    _level_table = PrivateAttr(default=None)
     
     @validator('name')
     def name_must_not_be_empty(cls, v):
@@ -84,6 +161,9 @@ class Item(BaseModel):
     cost: int = Field(0, ge=0, description="Custo em gold")
     unique: bool = Field(False, description="Se o item é único")
     mythic: bool = Field(False, description="Se o item é mítico")
+
+    # (modifiers_key, modificadores compilados), preenchido por calc.batch.compile_modifiers
+    _compiled = PrivateAttr(default=None)
     
     @validator('name')
     def name_must_not_be_empty(cls, v):
@@ -103,6 +183,9 @@ class RunePreset(BaseModel):
     modifiers: List[RuneModifier] = Field(default_factory=list, description="Modificadores das runas")
     description: str = Field("", description="Descrição do preset")
 
+    # (modifiers_key, modificadores compilados), preenchido por calc.batch.compile_modifiers
+    _compiled = PrivateAttr(default=None)
+
 class Target(BaseModel):
     """Configuração de alvo para cálculo de DPS"""
     name: str = Field(..., description="Nome do alvo")
@@ -116,7 +199,47 @@ class Target(BaseModel):
             raise ValueError('Nome do alvo não pode estar vazio')
         return v.strip()
 
-class FinalStats(BaseModel):
+class IncomeModel(BaseModel):
+    """Renda de gold e evolução de nível ao longo da partida"""
+    gold_per_minute: float = Field(400, gt=0, description="Gold recebido por minuto")
+    starting_gold: float = Field(500, ge=0, description="Gold inicial")
+    duration: float = Field(30, gt=0, description="Duração analisada (minutos)")
+    step: float = Field(0.5, gt=0, description="Intervalo entre checkpoints (minutos)")
+    minutes_per_level: float = Field(1.6, gt=0, description="Minutos por nível")
+
+    def checkpoints(self) -> List[float]:
+        """Minutos avaliados: 0, step, 2*step, ... até duration"""
+        count = int(self.duration / self.step + 1e-9)
+        return [index * self.step for index in range(count + 1)]
+
+    def gold_at(self, minute: float) -> float:
+        """Gold acumulado até o minuto"""
+        return self.starting_gold + self.gold_per_minute * minute
+
+    def level_at(self, minute: float) -> int:
+        """Nível do campeão no minuto (1 a 18)"""
+        return min(18, 1 + int(minute / self.minutes_per_level + 1e-9))
+
+    def purchase_minute(self, cost: float) -> float:
+        """Primeiro minuto em que o gold acumulado cobre o custo"""
+        return max(0.0, (cost - self.starting_gold) / self.gold_per_minute)
+
+class DamageProfile(BaseModel):
+    """
+    Composição do dano de um campeão (kernel misto de calc.damage)
+    Ataques básicos causam dano físico (AD × ad_ratio, com crítico) e, se
+    configurado, dano mágico on-hit; habilidades causam dano mágico a uma
+    taxa fixa de conjurações por segundo
+    """
+    name: str = Field(..., description="Nome do perfil")
+    ad_ratio: float = Field(1.0, ge=0, description="Fração do AD causada por ataque básico")
+    on_hit_magic: float = Field(0, ge=0, description="Dano mágico base por ataque básico")
+    on_hit_ap_ratio: float = Field(0, ge=0, description="Escalonamento de AP do dano mágico por ataque")
+    ability_damage: float = Field(0, ge=0, description="Dano mágico base por habilidade")
+    ability_ap_ratio: float = Field(0, ge=0, description="Escalonamento de AP por habilidade")
+    casts_per_second: float = Field(0, ge=0, description="Habilidades conjuradas por segundo")
+
+class FinalStats(TrustedModel):
     """Estatísticas finais calculadas"""
     level: int = Field(..., ge=1, le=18, description="Nível do campeão")
     
@@ -138,7 +261,7 @@ class FinalStats(BaseModel):
     effective_hp_physical: Optional[float] = Field(None, ge=0, description="HP efetivo contra dano físico")
     effective_hp_magical: Optional[float] = Field(None, ge=0, description="HP efetivo contra dano mágico")
 
-class Build(BaseModel):
+class Build(TrustedModel):
     """Configuração completa de uma build"""
     name: str = Field(..., description="Nome da build")
     champion: ChampionStats = Field(..., description="Dados do campeão")
@@ -183,6 +306,13 @@ PRESET_TARGETS = {
     "dummy": Target(name="Dummy", hp=1000, armor=0, mr=0),
 }
 
+# Perfis de dano comuns
+PRESET_DAMAGE_PROFILES = {
+    "basic_attack": DamageProfile(name="Ataque Básico"),
+    "on_hit": DamageProfile(name="On-Hit", on_hit_magic=15, on_hit_ap_ratio=0.3),
+    "mage": DamageProfile(name="Mago", ability_damage=80, ability_ap_ratio=0.6, casts_per_second=0.5),
+}
+
 # Presets de runas comuns
 PRESET_RUNES = {
     "ad_carry": RunePreset(
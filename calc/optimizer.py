@@ -0,0 +1,402 @@
+"""
+🔥 SmashBuilder - Otimizador de Builds 🔥
+Busca exaustiva de combinações de até seis itens com branch-and-bound
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import heapq
+import numpy as np
+
+try:
+    from .models import (
+        ChampionStats, Item, RunePreset, Target, Build, FinalStats, PRESET_TARGETS, NUM_STATS
+    )
+    from .formulas import FormulaEngine
+    from .batch import compile_modifiers, level_table
+    from .dedup import group_rows
+    from .catalog import ItemCatalog
+except ImportError:
+    # Fallback para execução direta
+    from models import (
+        ChampionStats, Item, RunePreset, Target, Build, FinalStats, PRESET_TARGETS, NUM_STATS
+    )
+    from formulas import FormulaEngine
+    from batch import compile_modifiers, level_table
+    from dedup import group_rows
+    from catalog import ItemCatalog
+
+MAX_BUILD_ITEMS = 6
+OPTIMIZATION_OBJECTIVES = ("dps", "ttk")
+
+# Folga relativa nos limites superiores para absorver diferenças de
+# arredondamento entre o produto acumulado e a aplicação sequencial
+BOUND_SLACK = 1 + 1e-9
+
+def tie_rank(chosen: Tuple[int, ...]) -> Tuple[int, ...]:
+    """
+    Chave de desempate do heap mínimo: maior para índices menores na ordem
+    lexicográfica (um prefixo vem antes das builds que o estendem), a mesma
+    ordem da mescla do ParallelBuildOptimizer
+    """
+    return tuple(-index for index in chosen) + (1,)
+
+def optimization_result(build: Build, formula_engine: FormulaEngine) -> Dict[str, any]:
+    """Valida e calcula uma build escolhida por um otimizador"""
+    build.final_stats = formula_engine.calculate_final_stats(build)
+
+    return {
+        'build': build,
+        'items': [item.name for item in build.items],
+        'dps': build.final_stats.dps,
+        'ttk': build.final_stats.ttk,
+        'cost': formula_engine.calculate_build_cost(build),
+    }
+
+class SearchSpace:
+    """
+    Itens candidatos em forma vetorial para a busca
+    Índices seguem a ordem da lista de itens recebida
+    """
+
+    # Arrays que descrevem o espaço por completo (ver from_arrays)
+    ARRAY_FIELDS = (
+        "base", "flat", "percent", "unique", "mythic", "cost", "rune_flat", "rune_percent",
+        "suffix_flat_all", "suffix_flat_regular", "suffix_percent_all", "suffix_percent_regular",
+    )
+
+    def __init__(self, champion: ChampionStats, level: int, items: Sequence[Item],
+                 runes: Optional[RunePreset], target: Target, formula_engine: FormulaEngine):
+        if not (1 <= level <= 18):
+            raise ValueError(f"Nível deve estar entre 1 e 18, recebido: {level}")
+
+        self.items = list(items)
+        self.formula_engine = formula_engine
+        self.base = np.array(level_table(champion)[level - 1])
+        self.target = target
+
+        # Vetores dos candidatos vêm do catálogo colunar (somente leitura)
+        catalog = ItemCatalog.of(items)
+        size = len(catalog)
+        self.flat = catalog.flat
+        self.percent = catalog.percent
+        self.unique = np.ascontiguousarray(catalog.unique)
+        self.mythic = np.ascontiguousarray(catalog.mythic)
+        self.cost = np.ascontiguousarray(catalog.cost)
+
+        runes_compiled = compile_modifiers(runes) if runes else None
+        self.rune_flat = runes_compiled.flat if runes_compiled else np.zeros((0, NUM_STATS))
+        self.rune_percent = runes_compiled.percent if runes_compiled else np.ones((0, NUM_STATS))
+
+        # Melhor contribuição possível por stat entre os candidatos a partir do
+        # índice i (todos / apenas não míticos); linha final = neutro
+        self.suffix_flat_all = self._suffix_max(self.flat, np.ones(size, dtype=bool), 0.0)
+        self.suffix_flat_regular = self._suffix_max(self.flat, ~self.mythic, 0.0)
+        self.suffix_percent_all = self._suffix_max(self.percent, np.ones(size, dtype=bool), 1.0)
+        self.suffix_percent_regular = self._suffix_max(self.percent, ~self.mythic, 1.0)
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], target: Target,
+                    formula_engine: FormulaEngine) -> "SearchSpace":
+        """
+        Reconstrói o espaço a partir de arrays() sem copiá-los (ex.: memória
+        compartilhada). Sem a lista de itens: resultados ficam em índices
+        """
+        space = cls.__new__(cls)
+        space.items = []
+        space.formula_engine = formula_engine
+        space.target = target
+        for name in cls.ARRAY_FIELDS:
+            setattr(space, name, arrays[name])
+        return space
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Arrays do espaço por nome (ARRAY_FIELDS)"""
+        return {name: getattr(self, name) for name in self.ARRAY_FIELDS}
+
+    def __len__(self) -> int:
+        return self.cost.shape[0]
+
+    @staticmethod
+    def _suffix_max(values: np.ndarray, mask: np.ndarray, neutral: float) -> np.ndarray:
+        """Máximo acumulado de trás para frente (nunca abaixo do neutro)"""
+        suffix = np.full((values.shape[0] + 1, NUM_STATS), neutral)
+        for index in range(values.shape[0] - 1, -1, -1):
+            suffix[index] = suffix[index + 1]
+            if mask[index]:
+                suffix[index] = np.maximum(suffix[index], values[index])
+        return suffix
+
+    def evaluate(self, stats: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Aplica runas, caps e arredondamento a stats com itens (N × StatType)
+        e retorna (dps, ttk) contra o alvo
+        """
+        stats = stats.copy()
+        for row in self.rune_flat:
+            stats += row
+        for row in self.rune_percent:
+            stats *= row
+
+        stats = self.formula_engine.finalize_stats_batch(stats)
+        size = stats.shape[0]
+        return self.formula_engine.calculate_dps_batch(
+            stats, np.full(size, self.target.hp), np.full(size, self.target.armor)
+        )
+
+    def upper_bound(self, flat_sum: np.ndarray, percent_product: np.ndarray, starts: np.ndarray,
+                    has_mythic: np.ndarray, remaining: Union[int, np.ndarray]) -> np.ndarray:
+        """
+        Limite superior admissível de DPS para estados parciais (N × StatType)
+        Cada slot restante recebe o melhor valor possível de cada stat
+        remaining: slots livres (inteiro ou coluna N × 1)
+        """
+        max_flat = np.where(has_mythic[:, None], self.suffix_flat_regular[starts], self.suffix_flat_all[starts])
+        max_percent = np.where(has_mythic[:, None], self.suffix_percent_regular[starts], self.suffix_percent_all[starts])
+
+        stats = (flat_sum + remaining * max_flat) * (percent_product * max_percent ** remaining)
+        dps, _ = self.evaluate(stats * BOUND_SLACK)
+        return dps
+
+class BranchAndBoundSearch:
+    """
+    Busca em profundidade sobre multiconjuntos de itens (índices não
+    decrescentes), mantendo as top_k builds em um heap mínimo; empates em
+    DPS e custo ficam com os índices em ordem lexicográfica (tie_rank), de
+    modo que o resultado não depende da ordem de visita
+
+    floor: célula compartilhada (array de 1 elemento) entre buscas paralelas
+    com o maior top_k-ésimo DPS já publicado; a escrita não usa trava, e uma
+    atualização perdida só enfraquece a poda (o valor é sempre o DPS real de
+    alguma build de algum heap cheio)
+    """
+
+    def __init__(self, space: SearchSpace, max_items: int, top_k: int,
+                 floor: Optional[np.ndarray] = None):
+        self.space = space
+        self.max_items = max_items
+        self.top_k = top_k
+        self.floor = floor
+        self.heap: List[Tuple[float, int, Tuple[int, ...], Tuple[int, ...]]] = []
+        self.nodes = 0
+
+    def run(self, first_items: Optional[Sequence[int]] = None) -> List[Tuple[float, int, Tuple[int, ...], Tuple[int, ...]]]:
+        """
+        Executa a busca e retorna as entradas do heap (dps, -custo, tie_rank, índices)
+        first_items restringe o primeiro item escolhido (partição da busca)
+        """
+        if len(self.space):
+            self._expand(
+                flat_sum=self.space.base,
+                percent_rows=[],
+                percent_product=np.ones(NUM_STATS),
+                chosen=(),
+                start=0,
+                has_mythic=False,
+                first_items=first_items,
+            )
+        return self.heap
+
+    def run_prefix(self, prefix: Sequence[int]) -> List[Tuple[float, int, Tuple[int, ...], Tuple[int, ...]]]:
+        """
+        Avalia a build formada por prefix (índices não decrescentes e válidos)
+        e toda a subárvore abaixo dela; retorna as entradas do heap
+        """
+        space = self.space
+        chosen = tuple(int(index) for index in prefix)
+
+        flat_sum = space.base.copy()
+        for index in chosen:
+            flat_sum = flat_sum + space.flat[index]
+        percent_rows = [space.percent[index] for index in chosen]
+        percent_product = np.ones(NUM_STATS)
+        stats = flat_sum.copy()
+        for row in percent_rows:
+            percent_product = percent_product * row
+            stats *= row
+
+        dps, _ = space.evaluate(stats[None, :])
+        self.nodes += 1
+        self._push(float(dps[0]), int(space.cost[list(chosen)].sum()), chosen)
+
+        remaining = self.max_items - len(chosen)
+        last = chosen[-1]
+        start = last + int(space.unique[last])
+        has_mythic = bool(space.mythic[list(chosen)].any())
+        if remaining == 0 or start >= len(space):
+            return self.heap
+
+        bound = space.upper_bound(flat_sum[None, :], percent_product[None, :], np.array([start]),
+                                  np.array([has_mythic]), remaining)
+        if self._promising(float(bound[0]), int(space.cost[list(chosen)].sum())):
+            self._expand(flat_sum, percent_rows, percent_product, chosen, start, has_mythic)
+        return self.heap
+
+    def _push(self, dps: float, cost: int, chosen: Tuple[int, ...]):
+        """Mantém as top_k melhores builds (maior DPS, menor custo e índices em ordem no empate)"""
+        entry = (dps, -cost, tie_rank(chosen), chosen)
+        if len(self.heap) < self.top_k:
+            heapq.heappush(self.heap, entry)
+        elif entry[:3] > self.heap[0][:3]:
+            heapq.heapreplace(self.heap, entry)
+
+        if self.floor is not None and len(self.heap) == self.top_k and self.heap[0][0] > self.floor[0]:
+            self.floor[0] = self.heap[0][0]
+
+    def _threshold(self) -> Tuple[float, float]:
+        """
+        Corte (dps, -custo) que um ramo precisa superar: a pior entrada do heap
+        cheio; o DPS publicado por outras buscas vem sem custo (-inf), então
+        empates com ele nunca são podados
+        """
+        local = self.heap[0][:2] if len(self.heap) == self.top_k else (-np.inf, -np.inf)
+        if self.floor is None:
+            return local
+        return max(local, (float(self.floor[0]), -np.inf))
+
+    def _promising(self, bound: float, min_cost: int) -> bool:
+        """
+        Um ramo com DPS máximo bound e custo mínimo min_cost ainda pode entrar
+        no heap (mesma ordem do heap: maior DPS, menor custo no empate); um
+        empate exato não é podado, pois pode vencer pelos índices
+        """
+        return (bound, -min_cost) >= self._threshold()
+
+    def _expand(self, flat_sum: np.ndarray, percent_rows: List[np.ndarray], percent_product: np.ndarray,
+                chosen: Tuple[int, ...], start: int, has_mythic: bool,
+                first_items: Optional[Sequence[int]] = None):
+        """Avalia todos os filhos de um nó e desce nos ramos promissores"""
+        space = self.space
+
+        if first_items is not None:
+            candidates = np.array(sorted(first_items), dtype=np.int64)
+        else:
+            candidates = np.arange(start, len(space))
+        if has_mythic:
+            candidates = candidates[~space.mythic[candidates]]
+        if candidates.size == 0:
+            return
+
+        # Avaliar cada filho (build atual + um item), na ordem de aplicação do cálculo escalar
+        child_flat = flat_sum + space.flat[candidates]
+        child_stats = child_flat.copy()
+        for row in percent_rows:
+            child_stats *= row
+        child_stats *= space.percent[candidates]
+
+        dps, _ = space.evaluate(child_stats)
+        self.nodes += candidates.size
+
+        base_cost = int(space.cost[list(chosen)].sum()) if chosen else 0
+        for position, index in enumerate(candidates):
+            self._push(float(dps[position]), base_cost + int(space.cost[index]), chosen + (int(index),))
+
+        remaining = self.max_items - len(chosen) - 1
+        if remaining == 0:
+            return
+
+        # Limites superiores dos filhos; ramos que não superam o corte são podados
+        child_product = percent_product * space.percent[candidates]
+        child_starts = candidates + space.unique[candidates]
+        child_mythic = has_mythic | space.mythic[candidates]
+        bounds = space.upper_bound(child_flat, child_product, child_starts, child_mythic, remaining)
+
+        # Custo mínimo de qualquer build da subárvore: o próprio filho
+        child_costs = base_cost + space.cost[candidates]
+        for position in np.argsort(-bounds, kind="stable"):
+            if bounds[position] < self._threshold()[0]:
+                break
+            if not self._promising(float(bounds[position]), int(child_costs[position])):
+                continue
+
+            index = int(candidates[position])
+            self._expand(
+                flat_sum=child_flat[position],
+                percent_rows=percent_rows + [space.percent[index]],
+                percent_product=child_product[position],
+                chosen=chosen + (index,),
+                start=int(child_starts[position]),
+                has_mythic=bool(child_mythic[position]),
+            )
+
+class BuildOptimizer:
+    """Otimizador exaustivo de builds com poda por limites superiores"""
+
+    def __init__(self, formula_engine: Optional[FormulaEngine] = None):
+        self.formula_engine = formula_engine or FormulaEngine()
+
+    def optimize(self, champion: ChampionStats, level: int, items: Sequence[Item],
+                 runes: Optional[RunePreset] = None, target: Optional[Target] = None,
+                 objective: str = "dps", max_items: int = MAX_BUILD_ITEMS, top_k: int = 1,
+                 dedup: bool = False) -> Dict[str, any]:
+        """
+        Busca as melhores combinações de até max_items itens
+        objective: "dps" (maximizar) ou "ttk" (minimizar)
+        dedup: junta resultados com stats finais idênticos (ver _build_results)
+
+        Itens não únicos podem se repetir; itens únicos aparecem uma vez e
+        no máximo um item mítico é permitido por build. O TTK é decrescente
+        no DPS, então as duas metas compartilham a mesma busca.
+        """
+        self._validate_options(objective, max_items, top_k)
+
+        target = target or PRESET_TARGETS["dummy"]
+        space = SearchSpace(champion, level, items, runes, target, self.formula_engine)
+
+        search = BranchAndBoundSearch(space, max_items, top_k)
+        entries = search.run()
+
+        return self._build_results(champion, level, runes, target, space, entries, objective, search.nodes, dedup)
+
+    def _validate_options(self, objective: str, max_items: int, top_k: int):
+        """Valida os parâmetros comuns da otimização"""
+        if objective not in OPTIMIZATION_OBJECTIVES:
+            raise ValueError(f"Objetivo inválido: {objective} (use {', '.join(OPTIMIZATION_OBJECTIVES)})")
+        if not (1 <= max_items <= MAX_BUILD_ITEMS):
+            raise ValueError(f"max_items deve estar entre 1 e {MAX_BUILD_ITEMS}, recebido: {max_items}")
+        if top_k < 1:
+            raise ValueError(f"top_k deve ser positivo, recebido: {top_k}")
+
+    def _build_results(self, champion: ChampionStats, level: int, runes: Optional[RunePreset],
+                       target: Target, space: SearchSpace, entries: Sequence, objective: str,
+                       nodes: int, dedup: bool = False) -> Dict[str, any]:
+        """
+        Converte as entradas do heap em builds validadas e ordenadas
+        dedup: resultados com o mesmo vetor de stats finais viram um só (o
+        primeiro na ordem); os demais ficam em 'equivalent_builds'
+        """
+        results = []
+        for dps, _, _, chosen in sorted(entries, key=lambda entry: (-entry[0], -entry[1], entry[3])):
+            build = Build(
+                name=f"Optimized {champion.name}",
+                champion=champion,
+                level=level,
+                items=[space.items[index] for index in chosen],
+                runes=runes,
+                target=target
+            )
+            results.append(optimization_result(build, self.formula_engine))
+
+        duplicates = 0
+        if dedup and results:
+            fields = list(FinalStats.model_fields)
+            vectors = np.array([[getattr(result['build'].final_stats, field) or 0.0 for field in fields]
+                                for result in results], dtype=float)
+            groups = group_rows(vectors)
+            merged = []
+            for members in groups.members():
+                representative = dict(results[members[0]])
+                representative['equivalent_builds'] = [results[index]['items'] for index in members[1:]]
+                merged.append(representative)
+            duplicates = groups.duplicates
+            results = merged
+
+        return {
+            'objective': objective,
+            'results': results,
+            'nodes_evaluated': nodes,
+            'candidate_items': len(space),
+            **({'duplicates_removed': duplicates} if dedup else {}),
+        }
+
+# Instância global do otimizador
+build_optimizer = BuildOptimizer()
@@ -0,0 +1,233 @@
+"""
+🔥 SmashBuilder - Otimização Paralela 🔥
+Busca branch-and-bound distribuída entre processos com memória compartilhada
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+import math
+import os
+import numpy as np
+
+try:
+    from .models import ChampionStats, Item, RunePreset, Target, PRESET_TARGETS
+    from .formulas import FormulaEngine
+    from .optimizer import BuildOptimizer, BranchAndBoundSearch, SearchSpace, MAX_BUILD_ITEMS, tie_rank
+except ImportError:
+    # Fallback para execução direta
+    from models import ChampionStats, Item, RunePreset, Target, PRESET_TARGETS
+    from formulas import FormulaEngine
+    from optimizer import BuildOptimizer, BranchAndBoundSearch, SearchSpace, MAX_BUILD_ITEMS, tie_rank
+
+# Tamanho máximo do prefixo de itens que define cada tarefa (pares de itens)
+PARTITION_DEPTH = 2
+
+# Tarefas por worker: prefixos com mais que 1/(workers · TASKS_PER_WORKER)
+# das builds estimadas são divididos; também define os lotes enviados
+TASKS_PER_WORKER = 4
+
+class SharedArrays:
+    """
+    Arrays publicados em um único bloco de memória compartilhada
+    Quem publica chama close() e unlink(); os workers anexam pelo layout
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, layout: Dict[str, Tuple[int, Tuple[int, ...], str]]):
+        self.shm = shm
+        self.layout = layout  # nome -> (offset, shape, dtype)
+        self.arrays = {
+            name: np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+            for name, (offset, shape, dtype) in layout.items()
+        }
+
+    @classmethod
+    def publish(cls, arrays: Dict[str, np.ndarray]) -> "SharedArrays":
+        """Copia os arrays para um novo bloco compartilhado"""
+        layout = {}
+        size = 0
+        for name, array in arrays.items():
+            size = -(-size // 8) * 8  # Alinhamento de 8 bytes
+            layout[name] = (size, tuple(array.shape), np.asarray(array).dtype.str)
+            size += np.asarray(array).nbytes
+
+        shared = cls(shared_memory.SharedMemory(create=True, size=max(size, 1)), layout)
+        for name, array in arrays.items():
+            shared.arrays[name][...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, name: str, layout: Dict[str, Tuple[int, Tuple[int, ...], str]]) -> "SharedArrays":
+        """Anexa a um bloco publicado por outro processo"""
+        return cls(shared_memory.SharedMemory(name=name), layout)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self):
+        """Libera as views e fecha o bloco neste processo"""
+        self.arrays = {}
+        self.shm.close()
+
+    def unlink(self):
+        """Remove o bloco do sistema (apenas quem publicou)"""
+        self.shm.unlink()
+
+# Estado de cada processo worker (preenchido por _init_worker)
+_worker_state: Dict[str, object] = {}
+
+def _init_worker(name: str, layout: Dict, target: Target, formula_engine: FormulaEngine,
+                 max_items: int, top_k: int):
+    """Anexa a memória compartilhada e monta o espaço de busca sem cópias"""
+    shared = SharedArrays.attach(name, layout)
+    for field in SearchSpace.ARRAY_FIELDS:
+        shared.arrays[field].flags.writeable = False
+
+    _worker_state.update(
+        shared=shared,
+        space=SearchSpace.from_arrays(shared.arrays, target, formula_engine),
+        floor=shared.arrays["floor"],
+        max_items=max_items,
+        top_k=top_k,
+    )
+
+def _search_partition(prefix: Tuple[int, ...]) -> Tuple[List[Tuple[float, int, Tuple[int, ...]]], int]:
+    """Busca a subárvore de um prefixo; retorna (dps, -custo, índices) do top_k local e os nós avaliados"""
+    search = BranchAndBoundSearch(
+        _worker_state["space"], _worker_state["max_items"], _worker_state["top_k"],
+        floor=_worker_state["floor"]
+    )
+    entries = search.run_prefix(prefix)
+    return [(dps, negative_cost, chosen) for dps, negative_cost, _, chosen in entries], search.nodes
+
+def partition_prefixes(space: SearchSpace, depth: int) -> List[Tuple[int, ...]]:
+    """
+    Prefixos válidos (multiconjuntos em ordem de índice) de exatamente depth
+    itens; as subárvores desses prefixos cobrem todas as builds maiores
+    """
+    prefixes = []
+
+    def extend(prefix: Tuple[int, ...], start: int, has_mythic: bool):
+        if len(prefix) == depth:
+            prefixes.append(prefix)
+            return
+        for index in range(start, len(space)):
+            if has_mythic and space.mythic[index]:
+                continue
+            extend(prefix + (index,), index + int(space.unique[index]), has_mythic or bool(space.mythic[index]))
+
+    extend((), 0, False)
+    return prefixes
+
+def subtree_size(space: SearchSpace, prefix: Tuple[int, ...], max_items: int) -> int:
+    """
+    Estimativa das builds na subárvore de um prefixo: multiconjuntos de até
+    max_items - len(prefix) itens entre os índices que ainda podem seguir o
+    último (ignora o limite de um mítico)
+    """
+    last = prefix[-1]
+    choices = len(space) - last - int(space.unique[last])
+    slots = max_items - len(prefix)
+    return math.comb(choices + slots, slots)
+
+def balanced_prefixes(space: SearchSpace, max_items: int, workers: int) -> Tuple[List[Tuple[int, ...]], List[int]]:
+    """
+    Prefixos das tarefas, da maior subárvore estimada para a menor
+
+    O prefixo (i,) cobre as builds cujos itens são todos >= i, então as
+    subárvores dos primeiros índices são ordens de grandeza maiores que as
+    últimas. Prefixos acima de 1/(workers · TASKS_PER_WORKER) das builds
+    estimadas viram pares (PARTITION_DEPTH); retorna também os itens
+    divididos, cuja build de um item só fica para o processo principal
+    """
+    sizes = {prefix: subtree_size(space, prefix, max_items) for prefix in partition_prefixes(space, 1)}
+    limit = sum(sizes.values()) / (workers * TASKS_PER_WORKER)
+
+    prefixes, split = [], []
+    for prefix, size in list(sizes.items()):
+        index = prefix[0]
+        start = index + int(space.unique[index])
+        children = [prefix + (child,) for child in range(start, len(space))
+                    if not (space.mythic[index] and space.mythic[child])]
+        if max_items < PARTITION_DEPTH or size <= limit or not children:
+            prefixes.append(prefix)
+            continue
+        split.append(index)
+        for child in children:
+            sizes[child] = subtree_size(space, child, max_items)
+        prefixes.extend(children)
+
+    prefixes.sort(key=lambda prefix: -sizes[prefix])
+    return prefixes, split
+
+class ParallelBuildOptimizer(BuildOptimizer):
+    """
+    BuildOptimizer que distribui a busca entre processos
+
+    Cada prefixo de balanced_prefixes() vira uma tarefa, enviadas aos
+    workers em lotes, das maiores para as menores; as builds de um item dos
+    prefixos divididos em pares são avaliadas no processo principal. Os
+    arrays do espaço de busca são publicados uma vez em memória
+    compartilhada e os workers compartilham uma única célula com o melhor
+    limiar de poda.
+    """
+
+    def __init__(self, formula_engine: Optional[FormulaEngine] = None, workers: Optional[int] = None):
+        super().__init__(formula_engine)
+        self.workers = workers or os.cpu_count() or 1
+
+    def optimize(self, champion: ChampionStats, level: int, items: Sequence[Item],
+                 runes: Optional[RunePreset] = None, target: Optional[Target] = None,
+                 objective: str = "dps", max_items: int = MAX_BUILD_ITEMS, top_k: int = 1,
+                 dedup: bool = False) -> Dict[str, any]:
+        """Mesmo contrato de BuildOptimizer.optimize, com os resultados dos workers mesclados"""
+        self._validate_options(objective, max_items, top_k)
+
+        target = target or PRESET_TARGETS["dummy"]
+        space = SearchSpace(champion, level, items, runes, target, self.formula_engine)
+        if self.workers <= 1 or len(space) == 0:
+            return super().optimize(champion, level, items, runes, target, objective, max_items, top_k, dedup)
+
+        prefixes, split = balanced_prefixes(space, max_items, self.workers)
+        floor = np.full(1, -np.inf)
+        merged = []
+        nodes = 0
+        if split:
+            # Builds de um item dos prefixos divididos no processo principal;
+            # o resultado já serve de limiar inicial
+            seed = BranchAndBoundSearch(space, 1, top_k)
+            merged = [(dps, negative_cost, chosen) for dps, negative_cost, _, chosen in seed.run(first_items=split)]
+            nodes = seed.nodes
+            if len(seed.heap) == top_k:
+                floor[0] = seed.heap[0][0]
+
+        workers = min(self.workers, len(prefixes))
+        chunksize = max(1, len(prefixes) // (workers * TASKS_PER_WORKER))
+
+        shared = SharedArrays.publish({**space.arrays(), "floor": floor})
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(shared.name, shared.layout, target, self.formula_engine, max_items, top_k),
+            ) as executor:
+                for entries, partial_nodes in executor.map(_search_partition, prefixes, chunksize=chunksize):
+                    merged.extend(entries)
+                    nodes += partial_nodes
+        finally:
+            shared.close()
+            shared.unlink()
+
+        # Mesclar os top_k locais na ordem do heap serial: maior DPS, menor custo, índices em ordem
+        merged.sort(key=lambda entry: (-entry[0], -entry[1], entry[2]))
+        entries = [(dps, negative_cost, tie_rank(chosen), chosen) for dps, negative_cost, chosen in merged[:top_k]]
+
+        result = self._build_results(champion, level, runes, target, space, entries, objective, nodes, dedup)
+        result['workers'] = workers
+        result['partitions'] = len(prefixes)
+        result['partition_depth'] = max(len(prefix) for prefix in prefixes)
+        return result
+
+# Instância global do otimizador paralelo
+parallel_optimizer = ParallelBuildOptimizer()
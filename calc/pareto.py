@@ -0,0 +1,217 @@
+"""
+🔥 SmashBuilder - Fronteira de Pareto 🔥
+Seleção de builds não dominadas em DPS × custo × HP efetivo
+"""
+
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+try:
+    from .models import Build
+    from .formulas import FormulaEngine
+    from .batch import BuildMatrix
+    from .dedup import group_rows
+except ImportError:
+    # Fallback para execução direta
+    from models import Build
+    from formulas import FormulaEngine
+    from batch import BuildMatrix
+    from dedup import group_rows
+
+# Métricas disponíveis e se devem ser maximizadas
+PARETO_OBJECTIVES = {
+    "dps": True,
+    "ttk": False,
+    "cost": False,
+    "effective_hp_physical": True,
+    "effective_hp_magical": True,
+}
+
+DEFAULT_PARETO_OBJECTIVES = ("dps", "cost", "effective_hp_physical", "effective_hp_magical")
+
+def _as_costs(values: np.ndarray, maximize: Sequence[bool]) -> np.ndarray:
+    """Converte métricas em custos a minimizar (NaN vira o pior valor)"""
+    costs = np.array(values, dtype=float, copy=True)
+    if costs.ndim != 2 or costs.shape[1] != len(maximize):
+        raise ValueError(f"Esperado array (N × {len(maximize)}), recebido: {costs.shape}")
+
+    costs[:, np.asarray(maximize, dtype=bool)] *= -1
+    costs[np.isnan(costs)] = np.inf
+    return costs
+
+def pareto_front_mask(values: np.ndarray, maximize: Sequence[bool]) -> np.ndarray:
+    """
+    Marca as linhas não dominadas de uma matriz de métricas (N × objetivos)
+
+    Cada linha sobrevivente visitada elimina de uma vez (vetorizado) tudo o
+    que ela domina; ao final restam só as não dominadas. A ordem de visita
+    afeta apenas a eficiência: ordenando pela soma dos custos normalizados,
+    as primeiras linhas são as "centrais", que dominam a maior parte da
+    nuvem e encolhem a busca cedo. Linhas idênticas não se dominam.
+    """
+    costs = _as_costs(values, maximize)
+    size = costs.shape[0]
+    mask = np.zeros(size, dtype=bool)
+    if size == 0:
+        return mask
+
+    if costs.shape[1] <= 2:
+        order = np.lexsort(costs.T[::-1])
+    else:
+        # Colunas sem nenhum valor finito ficam com mínimo 0 e amplitude 1
+        finite = np.isfinite(costs)
+        has_finite = finite.any(axis=0)
+        low = np.where(has_finite, np.where(finite, costs, np.inf).min(axis=0), 0.0)
+        high = np.where(has_finite, np.where(finite, costs, -np.inf).max(axis=0), 0.0)
+        span = np.where((high > low) & np.isfinite(high - low), high - low, 1.0)
+        normalized = np.where(finite, (costs - low) / span, 2.0)
+        order = np.argsort(normalized.sum(axis=1), kind="stable")
+    remaining = costs[order]
+    positions = order
+
+    if costs.shape[1] == 1:
+        mask[positions[remaining[:, 0] == remaining[0, 0]]] = True
+        return mask
+
+    if costs.shape[1] == 2:
+        # Varredura: não dominada se o segundo custo melhora o mínimo anterior
+        # (ou empata com ele no mesmo primeiro custo)
+        second = remaining[:, 1]
+        previous_best = np.concatenate([[np.inf], np.minimum.accumulate(second)[:-1]])
+        same_as_previous = np.concatenate([[False], np.all(remaining[1:] == remaining[:-1], axis=1)])
+        front = second < previous_best
+        for index in np.flatnonzero(same_as_previous):
+            front[index] = front[index - 1]
+        mask[positions[front]] = True
+        return mask
+
+    index = 0
+    while index < remaining.shape[0]:
+        point = remaining[index]
+        keep = np.any(remaining < point, axis=1) | np.all(remaining == point, axis=1)
+        remaining = remaining[keep]
+        positions = positions[keep]
+        index = int(np.count_nonzero(keep[:index])) + 1
+
+    mask[positions] = True
+    return mask
+
+def non_dominated_ranks(values: np.ndarray, maximize: Sequence[bool],
+                        max_rank: Optional[int] = None) -> np.ndarray:
+    """
+    Ordenação não dominada: 0 para a fronteira, 1 para a seguinte, etc.
+    Com max_rank, linhas além desse nível recebem -1
+    """
+    values = np.asarray(values, dtype=float)
+    ranks = np.full(values.shape[0], -1, dtype=np.int64)
+    pending = np.arange(values.shape[0])
+
+    rank = 0
+    while pending.size and (max_rank is None or rank <= max_rank):
+        front = pareto_front_mask(values[pending], maximize)
+        ranks[pending[front]] = rank
+        pending = pending[~front]
+        rank += 1
+
+    return ranks
+
+def dominance_counts(values: np.ndarray, maximize: Sequence[bool], chunk_size: int = 256) -> np.ndarray:
+    """
+    Quantas linhas dominam cada linha (comparação par a par em blocos)
+    Adequado para conjuntos de até alguns milhares de linhas com fronteira grande
+
+    As linhas são ordenadas pelo primeiro objetivo: só as anteriores (ou
+    empatadas nele) podem dominar, então cada bloco compara com um prefixo.
+    """
+    costs = _as_costs(values, maximize)
+    order = np.argsort(costs[:, 0], kind="stable")
+    costs = costs[order]
+    first = costs[:, 0]
+    counts = np.zeros(costs.shape[0], dtype=np.int64)
+
+    for start in range(0, costs.shape[0], chunk_size):
+        block = costs[start:start + chunk_size]
+        end = int(np.searchsorted(first, block[-1, 0], side="right"))
+        candidates = costs[None, :end, :]
+        block = block[:, None, :]
+        dominated = np.all(candidates <= block, axis=2) & np.any(candidates < block, axis=2)
+        counts[order[start:start + chunk_size]] = np.count_nonzero(dominated, axis=1)
+
+    return counts
+
+class ParetoAnalyzer:
+    """Fronteira de Pareto sobre builds candidatas"""
+
+    def __init__(self, formula_engine: Optional[FormulaEngine] = None):
+        self.formula_engine = formula_engine or FormulaEngine()
+
+    def evaluate_builds(self, builds: Sequence[Build], dedup: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Calcula as métricas de todas as builds em lote
+        dedup=True acrescenta 'groups': builds equivalentes (mesmos stats
+        finais, alvo e custo), com as métricas calculadas uma vez por grupo
+        """
+        matrix = BuildMatrix.from_builds(builds)
+        batch = self.formula_engine.calculate_final_stats_batch(matrix, dedup=dedup)
+        cost = np.array([sum(item.cost for item in build.items) for build in builds], dtype=float)
+
+        metrics = {
+            "dps": batch.dps,
+            "ttk": batch.ttk,
+            "cost": cost,
+            "effective_hp_physical": batch.effective_hp_physical,
+            "effective_hp_magical": batch.effective_hp_magical,
+        }
+        if dedup:
+            metrics["groups"] = group_rows(batch.stats, matrix.target_hp, matrix.target_armor, cost)
+        return metrics
+
+    def frontier(self, builds: Sequence[Build], objectives: Sequence[str] = DEFAULT_PARETO_OBJECTIVES,
+                 dedup: bool = False) -> List[Dict[str, any]]:
+        """
+        Retorna as builds não dominadas com suas métricas, ordenadas por DPS
+        objectives: subconjunto de PARETO_OBJECTIVES
+        dedup: uma linha por grupo de builds equivalentes (a primeira build do
+        grupo), com os nomes das demais em 'equivalent_builds'
+        """
+        for objective in objectives:
+            if objective not in PARETO_OBJECTIVES:
+                raise ValueError(f"Objetivo inválido: {objective} (use {', '.join(PARETO_OBJECTIVES)})")
+
+        if not builds:
+            return []
+
+        metrics = self.evaluate_builds(builds, dedup=dedup)
+        values = np.column_stack([metrics[objective] for objective in objectives])
+        maximize = [PARETO_OBJECTIVES[objective] for objective in objectives]
+
+        if dedup:
+            groups = metrics["groups"]
+            members = groups.members()
+            selected = groups.first[pareto_front_mask(groups.unique(values), maximize)]
+        else:
+            selected = np.flatnonzero(pareto_front_mask(values, maximize))
+
+        frontier = []
+        for index in selected:
+            build = builds[index]
+            frontier.append({
+                'build': build,
+                'name': build.name,
+                'items': [item.name for item in build.items],
+                'dps': None if np.isnan(metrics['dps'][index]) else float(metrics['dps'][index]),
+                'ttk': None if np.isnan(metrics['ttk'][index]) else float(metrics['ttk'][index]),
+                'cost': int(metrics['cost'][index]),
+                'effective_hp_physical': round(float(metrics['effective_hp_physical'][index]), 2),
+                'effective_hp_magical': round(float(metrics['effective_hp_magical'][index]), 2),
+            })
+            if dedup:
+                frontier[-1]['equivalent_builds'] = [
+                    builds[other].name for other in members[groups.inverse[index]][1:]
+                ]
+
+        frontier.sort(key=lambda row: (-(row['dps'] or 0), row['cost']))
+        return frontier
+
+# Instância global do analisador
+pareto_analyzer = ParetoAnalyzer()
@@ -0,0 +1,163 @@
+"""
+🔥 SmashBuilder - Curvas de Poder 🔥
+Curvas de poder de vários campeões e conjuntos de itens em todos os níveis
+"""
+
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+try:
+    from .models import ChampionStats, Item, RunePreset, Target, StatType, PRESET_TARGETS, STAT_INDEX, NUM_STATS
+    from .formulas import FormulaEngine
+    from .batch import compile_modifiers, level_table, round_half_even, _concat_compiled, _stack_layers, MAX_LEVEL
+except ImportError:
+    # Fallback para execução direta
+    from models import ChampionStats, Item, RunePreset, Target, StatType, PRESET_TARGETS, STAT_INDEX, NUM_STATS
+    from formulas import FormulaEngine
+    from batch import compile_modifiers, level_table, round_half_even, _concat_compiled, _stack_layers, MAX_LEVEL
+
+# Métricas de stats (nomes curtos de FinalStats) e derivadas
+POWER_CURVE_STATS = {
+    'ad': StatType.AD,
+    'ap': StatType.AP,
+    'as': StatType.AS,
+    'crit_chance': StatType.CRIT_CHANCE,
+    'crit_damage': StatType.CRIT_DAMAGE,
+    'hp': StatType.HP,
+    'mana': StatType.MANA,
+    'armor': StatType.ARMOR,
+    'mr': StatType.MR,
+    'ms': StatType.MS,
+}
+POWER_CURVE_METRICS = tuple(POWER_CURVE_STATS) + (
+    'dps', 'ttk', 'effective_damage', 'effective_hp_physical', 'effective_hp_magical'
+)
+
+ALL_LEVELS = tuple(range(1, MAX_LEVEL + 1))
+
+class PowerCurves:
+    """
+    Resultado de PowerCurveEngine.compute
+    values: array (campeões × conjuntos de itens × níveis × métricas)
+    """
+
+    __slots__ = ("champions", "item_sets", "levels", "metrics", "values")
+
+    def __init__(self, champions: List[str], item_sets: List[List[str]], levels: List[int],
+                 metrics: Sequence[str], values: np.ndarray):
+        self.champions = champions
+        self.item_sets = item_sets
+        self.levels = levels
+        self.metrics = tuple(metrics)
+        self.values = values
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def metric(self, name: str) -> np.ndarray:
+        """Uma métrica para todas as curvas (campeões × conjuntos × níveis)"""
+        if name not in self.metrics:
+            raise ValueError(f"Métrica inválida: {name} (use {', '.join(self.metrics)})")
+        return self.values[..., self.metrics.index(name)]
+
+    def level_table(self, champion: int = 0, item_set: int = 0) -> Dict[int, Dict[str, float]]:
+        """Curva de um campeão e conjunto de itens no formato nível -> {métrica: valor}"""
+        curve = self.values[champion, item_set]
+        return {
+            level: {metric: float(value) for metric, value in zip(self.metrics, row)}
+            for level, row in zip(self.levels, curve)
+        }
+
+    def rows(self) -> List[Dict[str, any]]:
+        """Formato longo: uma linha por campeão, conjunto de itens e nível"""
+        rows = []
+        for champion_index, champion in enumerate(self.champions):
+            for set_index, items in enumerate(self.item_sets):
+                for level, values in self.level_table(champion_index, set_index).items():
+                    rows.append({'champion': champion, 'items': items, 'level': level, **values})
+        return rows
+
+class PowerCurveEngine:
+    """
+    Curvas de poder em uma única computação sobre arrays
+
+    As tabelas por nível dos campeões (K × níveis × StatType) recebem as
+    camadas de itens de cada conjunto (M × camadas × StatType) por
+    broadcast, na mesma ordem de operações de calculate_final_stats; caps,
+    arredondamento e métricas derivadas são aplicados ao lote inteiro.
+    """
+
+    def __init__(self, formula_engine: Optional[FormulaEngine] = None):
+        self.formula_engine = formula_engine or FormulaEngine()
+
+    def compute(self, champions: Sequence[ChampionStats], item_sets: Sequence[Sequence[Item]],
+                levels: Optional[Sequence[int]] = None, runes: Optional[RunePreset] = None,
+                target: Optional[Target] = None) -> PowerCurves:
+        """
+        Curvas de K campeões × M conjuntos de itens × níveis (padrão: 1-18)
+        Alvo padrão: dummy (como calculate_power_curve)
+        """
+        levels = sorted(set(levels)) if levels is not None else list(ALL_LEVELS)
+        if not levels or levels[0] < 1 or levels[-1] > MAX_LEVEL:
+            raise ValueError(f"Níveis devem estar entre 1 e {MAX_LEVEL}, recebido: {levels}")
+        if any(sum(1 for item in items if item.mythic) > 1 for items in item_sets):
+            raise ValueError('Apenas um item mítico é permitido por build')
+
+        engine = self.formula_engine
+        target = target or PRESET_TARGETS["dummy"]
+        champion_count, set_count, level_count = len(champions), len(item_sets), len(levels)
+
+        # Stats base: (K × 1 × L × StatType)
+        tables = np.array([level_table(champion) for champion in champions]).reshape(champion_count, MAX_LEVEL, NUM_STATS)
+        stats = np.repeat(tables[:, None, np.array(levels) - 1], set_count, axis=1)
+
+        # Itens: camadas flat e percentuais de cada conjunto, somadas por broadcast
+        layers = [_concat_compiled([compile_modifiers(item) for item in items]) for items in item_sets]
+        flat = _stack_layers([flat for flat, _ in layers], 0.0)
+        percent = _stack_layers([percent for _, percent in layers], 1.0)
+        for layer in range(flat.shape[1]):
+            stats += flat[None, :, None, layer]
+        for layer in range(percent.shape[1]):
+            stats *= percent[None, :, None, layer]
+
+        if runes:
+            compiled = compile_modifiers(runes)
+            for row in compiled.flat:
+                stats += row
+            for row in compiled.percent:
+                stats *= row
+
+        size = champion_count * set_count * level_count
+        stats = engine.finalize_stats_batch(stats.reshape(size, NUM_STATS))
+        dps, ttk = engine.calculate_dps_batch(stats, np.full(size, target.hp), np.full(size, target.armor))
+
+        # Dano efetivo por ataque (como calculate_basic_attack_dps)
+        crit_chance = stats[:, STAT_INDEX[StatType.CRIT_CHANCE]] / 100
+        crit_multiplier = stats[:, STAT_INDEX[StatType.CRIT_DAMAGE]] / 100
+        average_damage = stats[:, STAT_INDEX[StatType.AD]] * (1 + crit_chance * (crit_multiplier - 1))
+        effective_damage = average_damage * (1 - engine.calculate_damage_reduction_batch(np.full(size, target.armor)))
+
+        hp = stats[:, STAT_INDEX[StatType.HP]]
+        derived = {
+            'dps': dps,
+            'ttk': ttk,
+            'effective_damage': round_half_even(effective_damage, engine.precision),
+            'effective_hp_physical': engine.calculate_effective_hp_batch(hp, stats[:, STAT_INDEX[StatType.ARMOR]]),
+            'effective_hp_magical': engine.calculate_effective_hp_batch(hp, stats[:, STAT_INDEX[StatType.MR]]),
+        }
+
+        columns = [stats[:, STAT_INDEX[stat]] for stat in POWER_CURVE_STATS.values()]
+        columns += [derived[metric] for metric in POWER_CURVE_METRICS[len(POWER_CURVE_STATS):]]
+        values = np.stack(columns, axis=1).reshape(champion_count, set_count, level_count, len(POWER_CURVE_METRICS))
+
+        return PowerCurves(
+            champions=[champion.name for champion in champions],
+            item_sets=[[item.name for item in items] for items in item_sets],
+            levels=levels,
+            metrics=POWER_CURVE_METRICS,
+            values=values,
+        )
+
+# Instância global do motor de curvas
+power_curve_engine = PowerCurveEngine()
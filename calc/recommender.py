@@ -0,0 +1,213 @@
+"""
+🔥 SmashBuilder - Recomendação de Upgrades 🔥
+Pontuação vetorizada de itens (e pares/trios de itens) a adicionar a uma build
+"""
+
+from itertools import combinations_with_replacement
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import heapq
+import numpy as np
+
+try:
+    from .models import Build, Item, StatType, PRESET_TARGETS, STAT_INDEX
+    from .formulas import FormulaEngine
+    from .batch import compile_modifiers, level_table, _stack_layers
+    from .optimizer import MAX_BUILD_ITEMS
+    from .gold_values import DEFAULT_GOLD_VALUES, EFFICIENCY_COLUMNS, gold_value_solver
+    from .catalog import ItemCatalog
+except ImportError:
+    # Fallback para execução direta
+    from models import Build, Item, StatType, PRESET_TARGETS, STAT_INDEX
+    from formulas import FormulaEngine
+    from batch import compile_modifiers, level_table, _stack_layers
+    from optimizer import MAX_BUILD_ITEMS
+    from gold_values import DEFAULT_GOLD_VALUES, EFFICIENCY_COLUMNS, gold_value_solver
+    from catalog import ItemCatalog
+
+RECOMMENDATION_METRICS = ("dps_per_gold", "dps_improvement", "gold_efficiency")
+MAX_COMBO_SIZE = 3
+
+# Combinações avaliadas por vez (limita a memória de pares/trios em catálogos grandes)
+RECOMMENDATION_CHUNK = 4096
+
+# Coluna de stats finais de cada chave de valor em gold
+GAIN_COLUMNS = {key: STAT_INDEX[stat] for key, (stat, _) in EFFICIENCY_COLUMNS.items()}
+
+# AS é precificado por ponto de modificador percentual, como no catálogo:
+# o ganho vem dos fatores da combinação, não do AS final (que tem piso e teto)
+AS_COLUMN = STAT_INDEX[StatType.AS]
+
+def candidate_combinations(size: int, combo_size: int) -> np.ndarray:
+    """Multiconjuntos de combo_size índices entre size candidatos (C × combo_size)"""
+    combos = np.fromiter(
+        (index for combo in combinations_with_replacement(range(size), combo_size) for index in combo),
+        dtype=np.int64
+    )
+    return combos.reshape(-1, combo_size)
+
+class UpgradeRecommender:
+    """
+    Recomenda itens a adicionar a uma build
+
+    Os stats da build base (nível + itens atuais) são calculados uma vez;
+    cada combinação de candidatos é aplicada como delta sobre eles em
+    blocos vetorizados, na mesma ordem de operações de
+    calculate_final_stats (resultados idênticos ao cálculo escalar).
+    """
+
+    def __init__(self, formula_engine: Optional[FormulaEngine] = None):
+        self.formula_engine = formula_engine or FormulaEngine()
+
+    def recommend(self, base_build: Build, candidates: Union[ItemCatalog, Sequence[Item]], combo_size: int = 1,
+                  top_k: int = 5, metric: str = "dps_per_gold",
+                  catalog: Optional[Sequence[Item]] = None) -> Dict[str, any]:
+        """
+        Melhores combinações de combo_size itens para adicionar à build
+        Respeita slots livres, itens únicos e o limite de um mítico
+        catalog: itens de onde derivar os valores de gold (padrão: aproximados)
+        """
+        if metric not in RECOMMENDATION_METRICS:
+            raise ValueError(f"Métrica inválida: {metric} (use {', '.join(RECOMMENDATION_METRICS)})")
+        if not (1 <= combo_size <= MAX_COMBO_SIZE):
+            raise ValueError(f"combo_size deve estar entre 1 e {MAX_COMBO_SIZE}, recebido: {combo_size}")
+        if top_k < 1:
+            raise ValueError(f"top_k deve ser positivo, recebido: {top_k}")
+
+        # Custos e restrições dos candidatos vêm do catálogo colunar
+        columns = ItemCatalog.of(candidates)
+        candidates = columns.items
+        target = base_build.target or PRESET_TARGETS["dummy"]
+        engine = self.formula_engine
+
+        # Build base: stats com os itens atuais, antes dos percentuais
+        base_compiled = [compile_modifiers(item) for item in base_build.items]
+        pre_flat = np.array(level_table(base_build.champion)[base_build.level - 1])
+        for compiled in base_compiled:
+            for row in compiled.flat:
+                pre_flat += row
+        base_percent_rows = [row for compiled in base_compiled for row in compiled.percent]
+        runes = compile_modifiers(base_build.runes) if base_build.runes else None
+
+        base_stats = self._finish(pre_flat[None, :].copy(), base_percent_rows, [], runes)
+        base_dps, _ = engine.calculate_dps_batch(base_stats, np.array([target.hp]), np.array([target.armor]))
+        base_dps = float(base_dps[0])
+
+        gold_values = gold_value_solver.solve(catalog).efficiency_values() if catalog else DEFAULT_GOLD_VALUES
+        gain_columns = np.array([GAIN_COLUMNS[key] for key in gold_values])
+        as_position = list(gold_values).index('as')
+        gain_values = np.array(list(gold_values.values()), dtype=float)
+
+        # Candidatos em camadas (candidatos × camadas × StatType) e restrições
+        compiled = [compile_modifiers(item) for item in candidates]
+        flat_layers = _stack_layers([c.flat for c in compiled], 0.0)
+        percent_layers = _stack_layers([c.percent for c in compiled], 1.0)
+        cost, mythic, unique = columns.cost, columns.mythic, columns.unique
+        owned_names = {item.name for item in base_build.items}
+        owned_unique = np.array([item.unique and item.name in owned_names for item in candidates], dtype=bool)
+        base_has_mythic = any(item.mythic for item in base_build.items)
+
+        free_slots = MAX_BUILD_ITEMS - len(base_build.items)
+        combos = candidate_combinations(len(candidates), combo_size) if combo_size <= free_slots and candidates \
+            else np.zeros((0, combo_size), dtype=np.int64)
+
+        heap: List[Tuple[float, int, int]] = []
+        evaluated = 0
+        results: Dict[int, Tuple[np.ndarray, float, float, float, int]] = {}
+
+        for start in range(0, combos.shape[0], RECOMMENDATION_CHUNK):
+            chunk = combos[start:start + RECOMMENDATION_CHUNK]
+
+            # Restrições: únicos repetidos/já possuídos e no máximo um mítico
+            valid = ~owned_unique[chunk].any(axis=1)
+            for position in range(1, combo_size):
+                repeated = (chunk[:, position] == chunk[:, position - 1]) & unique[chunk[:, position]]
+                valid &= ~repeated
+            valid &= mythic[chunk].sum(axis=1) + base_has_mythic <= 1
+            keys = start + np.flatnonzero(valid)
+            chunk = chunk[valid]
+            if not chunk.shape[0]:
+                continue
+
+            # Delta: flats da combinação somados após os da build base, depois percentuais
+            stats = np.repeat(pre_flat[None, :], chunk.shape[0], axis=0)
+            for position in range(combo_size):
+                for layer in range(flat_layers.shape[1]):
+                    stats += flat_layers[chunk[:, position], layer]
+            combo_percent = [percent_layers[chunk[:, position], layer]
+                             for position in range(combo_size) for layer in range(percent_layers.shape[1])]
+            stats = self._finish(stats, base_percent_rows, combo_percent, runes)
+
+            size = stats.shape[0]
+            dps, _ = engine.calculate_dps_batch(stats, np.full(size, target.hp), np.full(size, target.armor))
+            improvement = dps - base_dps
+            combo_cost = cost[chunk].sum(axis=1)
+
+            gains = stats[:, gain_columns] - base_stats[0, gain_columns]
+            as_factor = np.ones(chunk.shape[0])
+            for row in combo_percent:
+                as_factor = as_factor * row[:, AS_COLUMN]
+            gains[:, as_position] = (as_factor - 1) * 100
+            gold_value = np.where(gains > 0, gains, 0.0) @ gain_values
+            with np.errstate(divide="ignore", invalid="ignore"):
+                dps_per_gold = np.where(combo_cost > 0, improvement / combo_cost, 0.0)
+                efficiency = np.where(combo_cost > 0, gold_value / combo_cost * 100, 0.0)
+
+            scores = {"dps_per_gold": dps_per_gold, "dps_improvement": improvement,
+                      "gold_efficiency": efficiency}[metric]
+            evaluated += size
+
+            # Só os top_k do bloco podem entrar no heap limitado; empates
+            # ficam com a menor chave, a mesma ordem do heap
+            selected = np.lexsort((keys, -scores))[:top_k]
+
+            for row in selected:
+                key = int(keys[row])
+                entry = (float(scores[row]), -key, key)
+                if len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+                else:
+                    continue
+                results[key] = (chunk[row], float(improvement[row]), float(gold_value[row]),
+                                float(efficiency[row]), int(combo_cost[row]))
+
+        recommendations = []
+        for score, _, key in sorted(heap, reverse=True):
+            chosen, improvement, gold_value, efficiency, combo_cost = results[key]
+            names = [candidates[index].name for index in chosen]
+            recommendations.append({
+                'item_name': " + ".join(names),
+                'items': names,
+                'dps_improvement': round(improvement, 2),
+                'dps_improvement_percent': round(improvement / base_dps * 100, 2) if base_dps > 0 else 0,
+                'gold_efficiency': round(efficiency, 2),
+                'cost': combo_cost,
+                'dps_per_gold': round(improvement / combo_cost, 4) if combo_cost > 0 else 0,
+            })
+
+        return {
+            'base_dps': base_dps,
+            'recommendations': recommendations,
+            'total_cost': sum(item.cost for item in base_build.items),
+            'combo_size': combo_size,
+            'free_slots': free_slots,
+            'combinations_evaluated': evaluated,
+        }
+
+    def _finish(self, stats: np.ndarray, base_percent_rows: List[np.ndarray],
+                combo_percent_rows: List[np.ndarray], runes) -> np.ndarray:
+        """Percentuais (build base, depois combinação), runas, caps e arredondamento"""
+        for row in base_percent_rows:
+            stats *= row
+        for row in combo_percent_rows:
+            stats *= row
+        if runes is not None:
+            for row in runes.flat:
+                stats += row
+            for row in runes.percent:
+                stats *= row
+        return self.formula_engine.finalize_stats_batch(stats)
+
+# Instância global do recomendador
+upgrade_recommender = UpgradeRecommender()
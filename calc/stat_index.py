@@ -0,0 +1,205 @@
+"""
+🔥 SmashBuilder - Índice de Stats 🔥
+Índice invertido de (StatType, ModifierType) para ids de itens ordenados por valor
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+try:
+    from .models import Item, StatType, ModifierType
+    from .catalog import ItemCatalog, STAT_COLUMNS
+except ImportError:
+    # Fallback para execução direta
+    from models import Item, StatType, ModifierType
+    from catalog import ItemCatalog, STAT_COLUMNS
+
+StatKey = Tuple[StatType, ModifierType]
+
+def stat_key(key: Union[StatType, StatKey]) -> StatKey:
+    """
+    Valida uma chave (StatType, ModifierType); um StatType sozinho é ambíguo
+    para valores (AS, por exemplo, só aparece como percentual) e é rejeitado
+    """
+    if isinstance(key, StatType):
+        raise ValueError(f"Informe o tipo de modificador de {key.value}: "
+                         f"({key}, ModifierType.FLAT) ou ({key}, ModifierType.PERCENT)")
+    return key
+
+class StatIndex:
+    """
+    Para cada (StatType, ModifierType), os itens que têm o stat, ordenados
+    pelo valor (mesma unidade das colunas de ItemCatalog); custos também
+    ficam ordenados. Ids são os do catálogo de origem.
+
+    Cada condição de query() vira um intervalo encontrado por busca binária;
+    apenas o menor intervalo é percorrido e os demais critérios são
+    conferidos só para os ids dele. Itens de add() ficam pendentes e são
+    mesclados às listas de uma vez na próxima consulta.
+    """
+
+    def __init__(self, catalog: ItemCatalog):
+        self._columns: Dict[StatKey, np.ndarray] = {
+            key: np.array(catalog.column(*key)) for key in STAT_COLUMNS
+        }
+        self._cost = np.array(catalog.cost, dtype=np.int64)
+        self._postings: Dict[StatKey, Tuple[np.ndarray, np.ndarray]] = {}
+        self._modifying = self._modifying_ids(catalog.items, 0)
+        self._pending: List[Item] = []
+        self._rebuild()
+
+    @staticmethod
+    def _modifying_ids(items: Sequence[Item], first: int) -> Dict[StatType, np.ndarray]:
+        """
+        Por StatType, os ids (crescentes) dos itens com algum modificador do
+        stat, de qualquer tipo ou valor (inclui UNIQUE e valores zero, que
+        não entram nas colunas)
+        """
+        ids: Dict[StatType, List[int]] = {stat: [] for stat in StatType}
+        for item_id, item in enumerate(items, start=first):
+            for stat in {modifier.stat for modifier in item.modifiers}:
+                ids[stat].append(item_id)
+        return {stat: np.array(values, dtype=np.int64) for stat, values in ids.items()}
+
+    def __len__(self) -> int:
+        return self._cost.shape[0] + len(self._pending)
+
+    def _rebuild(self):
+        """Recria as listas ordenadas a partir das colunas densas"""
+        for key, values in self._columns.items():
+            ids = np.flatnonzero(values != 0)
+            order = np.argsort(values[ids], kind="stable")
+            self._postings[key] = (values[ids][order], ids[order])
+        order = np.argsort(self._cost, kind="stable")
+        self._cost_posting = (self._cost[order], order)
+
+    def add(self, item_id: int, item: Item):
+        """
+        Inclui um item com o próximo id do catálogo; a inserção nas listas
+        ordenadas fica para a próxima consulta (ver _merge_pending)
+        """
+        if item_id != len(self):
+            raise ValueError(f"Id fora de sequência: {item_id} (esperado {len(self)})")
+        self._pending.append(item)
+
+    def _merge_pending(self):
+        """
+        Mescla os itens pendentes: uma ordenação dos novos e uma inserção por
+        lista, O(n + m log m) para m itens em vez de m cópias das listas
+        """
+        if not self._pending:
+            return
+
+        catalog = ItemCatalog(self._pending)
+        first = self._cost.shape[0]
+        new_ids = np.arange(first, first + len(catalog), dtype=np.int64)
+        for key in STAT_COLUMNS:
+            values = np.asarray(catalog.column(*key))
+            self._columns[key] = np.concatenate([self._columns[key], values])
+            present = np.flatnonzero(values != 0)
+            order = present[np.argsort(values[present], kind="stable")]
+            self._postings[key] = self._merge(self._postings[key], values[order], new_ids[order])
+
+        # Ids novos são maiores que os existentes: basta concatenar
+        for stat, ids in self._modifying_ids(self._pending, first).items():
+            self._modifying[stat] = np.concatenate([self._modifying[stat], ids])
+
+        costs = np.array(catalog.cost, dtype=np.int64)
+        self._cost = np.concatenate([self._cost, costs])
+        order = np.argsort(costs, kind="stable")
+        self._cost_posting = self._merge(self._cost_posting, costs[order], new_ids[order])
+        self._pending = []
+
+    @staticmethod
+    def _merge(posting: Tuple[np.ndarray, np.ndarray], values: np.ndarray,
+               ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Insere (values, ids) já ordenados após os iguais existentes, como inserções sucessivas"""
+        current_values, current_ids = posting
+        positions = np.searchsorted(current_values, values, side="right")
+        return np.insert(current_values, positions, values), np.insert(current_ids, positions, ids)
+
+    @staticmethod
+    def _range(values: np.ndarray, minimum: Optional[float], maximum: Optional[float]) -> Tuple[int, int]:
+        start = np.searchsorted(values, minimum, side="left") if minimum is not None else 0
+        stop = np.searchsorted(values, maximum, side="right") if maximum is not None else values.shape[0]
+        return int(start), int(max(start, stop))
+
+    def ids_with(self, key: Union[StatType, StatKey], minimum: Optional[float] = None,
+                 maximum: Optional[float] = None) -> np.ndarray:
+        """
+        Ids (por valor crescente) dos itens que têm o stat, com valor em
+        [minimum, maximum]; a chave precisa do tipo de modificador (ver stat_key)
+        """
+        self._merge_pending()
+        values, ids = self._postings[stat_key(key)]
+        start, stop = self._range(values, minimum, maximum)
+        return ids[start:stop]
+
+    def ids_modifying(self, stat: StatType) -> np.ndarray:
+        """Ids (ordem do catálogo) dos itens com algum modificador do stat, de qualquer tipo ou valor"""
+        self._merge_pending()
+        return self._modifying[stat]
+
+    def ids_by_cost(self, minimum: Optional[int] = None, maximum: Optional[int] = None) -> np.ndarray:
+        """Ids (por custo crescente) com custo em [minimum, maximum]"""
+        self._merge_pending()
+        costs, ids = self._cost_posting
+        start, stop = self._range(costs, minimum, maximum)
+        return ids[start:stop]
+
+    def query(self, minimum: Optional[Dict[Union[StatType, StatKey], float]] = None,
+              has: Sequence[Union[StatType, StatKey]] = (), max_cost: Optional[int] = None,
+              min_cost: Optional[int] = None) -> np.ndarray:
+        """
+        Ids (ordem do catálogo) que atendem a todas as condições
+        minimum: valor mínimo por (StatType, ModifierType) (entre os itens que
+        têm o stat); um StatType sozinho é rejeitado (ver stat_key)
+        has: stats presentes com qualquer valor; um StatType sozinho aceita
+        qualquer modificador do stat (ver ids_modifying)
+        Ex.: query({(StatType.AD, ModifierType.FLAT): 30}, has=[StatType.AS], max_cost=3000)
+        """
+        self._merge_pending()
+        # Condição: (intervalo na lista ordenada, filtro sobre ids candidatos)
+        conditions = []
+        for key, value in (minimum or {}).items():
+            key = stat_key(key)
+            values, ids = self._postings[key]
+            column = self._columns[key]
+            conditions.append((ids, self._range(values, value, None),
+                               lambda candidates, column=column, value=value:
+                               (column[candidates] != 0) & (column[candidates] >= value)))
+        for key in has:
+            if isinstance(key, StatType):
+                ids = self._modifying[key]
+                conditions.append((ids, (0, ids.shape[0]),
+                                   lambda candidates, ids=ids: np.isin(candidates, ids, assume_unique=True)))
+                continue
+            key = stat_key(key)
+            values, ids = self._postings[key]
+            column = self._columns[key]
+            conditions.append((ids, (0, ids.shape[0]), lambda candidates, column=column: column[candidates] != 0))
+        if max_cost is not None or min_cost is not None:
+            def cost_check(candidates: np.ndarray) -> np.ndarray:
+                costs = self._cost[candidates]
+                mask = np.ones(candidates.shape[0], dtype=bool)
+                if max_cost is not None:
+                    mask &= costs <= max_cost
+                if min_cost is not None:
+                    mask &= costs >= min_cost
+                return mask
+
+            costs, ids = self._cost_posting
+            conditions.append((ids, self._range(costs, min_cost, max_cost), cost_check))
+
+        if not conditions:
+            return np.arange(len(self))
+
+        # Percorrer só o menor intervalo
+        smallest = min(range(len(conditions)), key=lambda index: conditions[index][1][1] - conditions[index][1][0])
+        ids, (start, stop), _ = conditions[smallest]
+        candidates = ids[start:stop]
+        for index, (_, _, check) in enumerate(conditions):
+            if index != smallest and candidates.shape[0]:
+                candidates = candidates[check(candidates)]
+
+        return np.sort(candidates)
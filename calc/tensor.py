@@ -0,0 +1,128 @@
+"""
+🔥 SmashBuilder - Avaliação em Tensor 🔥
+Builds × alvos × níveis em uma única avaliação com broadcast
+"""
+
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+try:
+    from .models import Build, Target, NUM_STATS
+    from .formulas import FormulaEngine
+    from .batch import BuildMatrix, MAX_LEVEL
+except ImportError:
+    # Fallback para execução direta
+    from models import Build, Target, NUM_STATS
+    from formulas import FormulaEngine
+    from batch import BuildMatrix, MAX_LEVEL
+
+TENSOR_METRICS = ("dps", "ttk", "effective_hp_physical", "effective_hp_magical")
+
+class EvaluationTensor:
+    """
+    Resultado de TensorEvaluator.evaluate
+    stats: (builds × níveis × StatType); dps/ttk: (builds × alvos × níveis)
+    HP efetivo não depende do alvo: (builds × níveis), com metric() devolvendo
+    a visão densa (builds × alvos × níveis)
+    """
+
+    __slots__ = ("builds", "targets", "levels", "stats", "dps", "ttk",
+                 "effective_hp_physical", "effective_hp_magical")
+
+    def __init__(self, builds: List[str], targets: List[str], levels: List[int], stats: np.ndarray,
+                 dps: np.ndarray, ttk: np.ndarray, effective_hp_physical: np.ndarray,
+                 effective_hp_magical: np.ndarray):
+        self.builds = builds
+        self.targets = targets
+        self.levels = levels
+        self.stats = stats
+        self.dps = dps
+        self.ttk = ttk
+        self.effective_hp_physical = effective_hp_physical
+        self.effective_hp_magical = effective_hp_magical
+
+    @property
+    def shape(self):
+        return (len(self.builds), len(self.targets), len(self.levels))
+
+    def metric(self, name: str) -> np.ndarray:
+        """Métrica de TENSOR_METRICS como tensor (builds × alvos × níveis)"""
+        if name not in TENSOR_METRICS:
+            raise ValueError(f"Métrica inválida: {name} (use {', '.join(TENSOR_METRICS)})")
+        values = getattr(self, name)
+        if values.ndim == 2:
+            values = np.broadcast_to(values[:, None, :], self.shape)
+        return values
+
+    def tensor(self) -> np.ndarray:
+        """Todas as métricas empilhadas (builds × alvos × níveis × TENSOR_METRICS)"""
+        return np.stack([self.metric(name) for name in TENSOR_METRICS], axis=-1)
+
+    def rows(self) -> List[Dict[str, any]]:
+        """Formato longo: uma linha por build, alvo e nível"""
+        rows = []
+        for b, build in enumerate(self.builds):
+            for t, target in enumerate(self.targets):
+                for l, level in enumerate(self.levels):
+                    row = {'build': build, 'target': target, 'level': level}
+                    for name in TENSOR_METRICS:
+                        row[name] = float(self.metric(name)[b, t, l])
+                    rows.append(row)
+        return rows
+
+class TensorEvaluator:
+    """
+    Avalia builds contra vários alvos em vários níveis
+
+    Os stats de cada build são calculados uma vez por nível (pipeline em
+    lote, ignorando o nível e o alvo da própria build); a parte que depende
+    do alvo (redução por armor, DPS e TTK) usa calculate_dps_batch em
+    broadcast, (build, nível) × alvo, sem copiar os stats por alvo.
+    """
+
+    def __init__(self, formula_engine: Optional[FormulaEngine] = None):
+        self.formula_engine = formula_engine or FormulaEngine()
+
+    def evaluate(self, builds: Sequence[Build], targets: Sequence[Target],
+                 levels: Optional[Sequence[int]] = None) -> EvaluationTensor:
+        """Tensor de métricas (builds × alvos × níveis); níveis padrão: 1-18"""
+        levels = list(levels) if levels is not None else list(range(1, MAX_LEVEL + 1))
+        if any(not (1 <= level <= MAX_LEVEL) for level in levels):
+            raise ValueError(f"Níveis devem estar entre 1 e {MAX_LEVEL}, recebido: {levels}")
+        if not targets:
+            raise ValueError("Informe ao menos um alvo")
+
+        engine = self.formula_engine
+        build_count, level_count = len(builds), len(levels)
+
+        # Stats por (build, nível), sem alvo
+        matrix = BuildMatrix.from_builds(builds).with_levels(levels)
+        matrix.target_hp = np.full(len(matrix), np.nan)
+        matrix.target_armor = np.full(len(matrix), np.nan)
+        batch = engine.calculate_final_stats_batch(matrix)
+        stats = batch.stats
+
+        # Parte dependente do alvo: o mesmo calculate_dps_batch do pipeline em
+        # lote, com as linhas (build, nível) em broadcast contra os alvos
+        target_count = len(targets)
+        target_hp = np.array([target.hp for target in targets], dtype=float)
+        target_armor = np.array([target.armor for target in targets], dtype=float)
+        dps, ttk = engine.calculate_dps_batch(stats[:, None, :], target_hp[None, :], target_armor[None, :])
+
+        def to_tensor(values: np.ndarray) -> np.ndarray:
+            # (build·nível) × alvo -> build × alvo × nível
+            return values.reshape(build_count, level_count, target_count).transpose(0, 2, 1)
+
+        return EvaluationTensor(
+            builds=[build.name for build in builds],
+            targets=[target.name for target in targets],
+            levels=levels,
+            stats=stats.reshape(build_count, level_count, NUM_STATS),
+            dps=to_tensor(dps),
+            ttk=to_tensor(ttk),
+            effective_hp_physical=batch.effective_hp_physical.reshape(build_count, level_count),
+            effective_hp_magical=batch.effective_hp_magical.reshape(build_count, level_count),
+        )
+
+# Instância global do avaliador
+tensor_evaluator = TensorEvaluator()
@@ -15,16 +15,22 @@ from rich.panel import Panel
 
 try:
     from calc.models import Build, Target, PRESET_TARGETS
-    from calc.formulas import formula_engine
+    from calc.cache import CachedFormulaEngine
+    from calc.power_curve import power_curve_engine
+    from calc.dps import dps_calculator
     from data_io.loader import data_loader
     from data_io.exporter import data_exporter
+    from data_io.result_store import default_result_store
 except ImportError:
     # Fallback para execução direta
     sys.path.append(str(Path(__file__).parent.parent))
     from calc.models import Build, Target, PRESET_TARGETS
-    from calc.formulas import formula_engine
+    from calc.cache import CachedFormulaEngine
+    from calc.power_curve import power_curve_engine
+    from calc.dps import dps_calculator
     from data_io.loader import data_loader
     from data_io.exporter import data_exporter
+    from data_io.result_store import default_result_store
 
 app = typer.Typer(
     name="smashbuilder",
@@ -32,6 +38,19 @@ app = typer.Typer(
 )
 console = Console()
 
+# Engine com cache de stats, versionado pelos dados do loader: editar os
+# arquivos de dados (ou add_item) invalida as entradas antigas. Resultados
+# ficam também no armazenamento persistente (desativado com --no-store)
+formula_engine = CachedFormulaEngine(data_version=data_loader.data_version,
+                                     store=default_result_store(data_loader))
+
+@app.callback()
+def main(no_store: bool = typer.Option(False, "--no-store",
+                                       help="Não ler nem gravar resultados no cache em disco")):
+    """🔥 SmashBuilder - Calculadora de Builds para League of Legends 🔥"""
+    if no_store:
+        formula_engine.store = None
+
 @app.command()
 def quick():
     """Calculadora rápida interativa com seleção por número"""
@@ -298,6 +317,59 @@ def build(
         console.print(f"[red]Erro: {e}[/red]")
         raise typer.Exit(1)
 
+@app.command()
+def template(
+    name: str = typer.Option(..., "--name", "-n", help="Template de presets.json (ex.: burst_mage)"),
+    champ: str = typer.Option(..., "--champ", "-c", help="Nome do campeão"),
+    level: int = typer.Option(18, "--level", "-l", help="Nível do campeão (1-18)"),
+    target: Optional[str] = typer.Option(None, "--target", "-t", help="Alvo (padrão: o do template)")
+):
+    """Calcula um template de build com o perfil de dano dele (físico + mágico)"""
+
+    try:
+        champion = data_loader.get_champion(champ)
+        if not champion:
+            console.print(f"[red]Campeão '{champ}' não encontrado![/red]")
+            raise typer.Exit(1)
+
+        if not (1 <= level <= 18):
+            console.print("[red]Nível deve estar entre 1 e 18![/red]")
+            raise typer.Exit(1)
+
+        build_obj = data_loader.get_build_template(name, champion, level)
+        if build_obj is None:
+            console.print(f"[red]Template '{name}' não encontrado![/red]")
+            raise typer.Exit(1)
+        profile = data_loader.get_template_damage_profile(name)
+
+        if target:
+            target_obj = data_loader.get_target(target)
+            if not target_obj:
+                console.print(f"[yellow]Alvo '{target}' não encontrado, usando o do template[/yellow]")
+            else:
+                build_obj.target = target_obj
+        if build_obj.target is None:
+            build_obj.target = data_loader.get_target("fragile")
+
+        build_obj.final_stats = formula_engine.calculate_final_stats(build_obj)
+        display_build_results(build_obj)
+
+        damage = dps_calculator.calculate_mixed_damage(build_obj, profile)
+        damage_table = Table(title=f"🔮 Dano Misto ({damage['profile']})")
+        damage_table.add_column("Alvo", style="cyan")
+        damage_table.add_column("DPS Físico", style="red")
+        damage_table.add_column("DPS Mágico", style="magenta")
+        damage_table.add_column("DPS Total", style="green")
+        damage_table.add_column("TTK", style="yellow")
+        for target_name, values in damage['targets'].items():
+            damage_table.add_row(target_name, f"{values['physical_dps']:.1f}", f"{values['magic_dps']:.1f}",
+                                 f"{values['dps']:.1f}", f"{values['ttk']:.1f}s")
+        console.print(damage_table)
+
+    except Exception as e:
+        console.print(f"[red]Erro: {e}[/red]")
+        raise typer.Exit(1)
+
 @app.command()
 def compare(
     build_a: str = typer.Option(..., "--buildA", "-a", help="Arquivo JSON da primeira build"),
@@ -370,7 +442,8 @@ def compare(
 def table(
     champ: str = typer.Option(..., "--champ", "-c", help="Nome do campeão"),
     levels: str = typer.Option("1,6,11,16,18", "--levels", "-l", help="Níveis separados por vírgula"),
-    items: str = typer.Option("", "--items", "-i", help="Itens separados por vírgula")
+    items: str = typer.Option("", "--items", "-i", help="Itens separados por vírgula"),
+    export: bool = typer.Option(False, "--export", "-e", help="Exportar tabela para CSV")
 ):
     """Exibe tabela de stats por nível"""
     console.print("🔥 [bold cyan]Tabela por Níveis[/bold cyan] 🔥")
@@ -408,28 +481,27 @@ def table(
         table.add_column("Armor", style="blue")
         table.add_column("MR", style="magenta")
 
-        for level in sorted(level_list):
-            # Calcular stats para este nível
-            build_obj = Build(
-                name=f"{champion.name} Level {level}",
-                champion=champion,
-                level=level,
-                items=selected_items
-            )
-
-            final_stats = formula_engine.calculate_final_stats(build_obj)
+        # Todos os níveis em uma única computação
+        curves = power_curve_engine.compute([champion], [selected_items], level_list)
 
+        for level, stats in curves.level_table().items():
             table.add_row(
                 str(level),
-                f"{final_stats.ad:.1f}",
-                f"{final_stats.as_:.2f}",
-                f"{final_stats.hp:.0f}",
-                f"{final_stats.armor:.1f}",
-                f"{final_stats.mr:.1f}"
+                f"{stats['ad']:.1f}",
+                f"{stats['as']:.2f}",
+                f"{stats['hp']:.0f}",
+                f"{stats['armor']:.1f}",
+                f"{stats['mr']:.1f}"
             )
 
         console.print(table)
 
+        if export:
+            filepath = data_exporter.export_level_table_to_csv(
+                champion.name, [item.name for item in selected_items], curves.levels, curves
+            )
+            console.print(f"[green]Tabela exportada para: {filepath}[/green]")
+
     except Exception as e:
         console.print(f"[red]Erro: {e}[/red]")
         raise typer.Exit(1)
@@ -722,37 +794,10 @@ def add_item():
 
         # Confirmar adição
         if typer.confirm("\nDeseja adicionar este item?"):
-            # Carregar dados existentes
-            items_file = Path("data/items.json")
-            with open(items_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # Adicionar novo item
-            item_dict = {
-                "name": item.name,
-                "modifiers": [
-                    {
-                        "stat": mod.stat.value,
-                        "value": mod.value,
-                        "modifier_type": mod.modifier_type.value
-                    }
-                    for mod in item.modifiers
-                ],
-                "cost": item.cost,
-                "unique": item.unique,
-                "mythic": item.mythic
-            }
-
-            data["items"].append(item_dict)
-
-            # Salvar arquivo
-            with open(items_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # Salvar em items.json e atualizar catálogo e índice de stats
+            data_loader.add_item(item)
 
             console.print(f"[green]✅ Item '{item.name}' adicionado com sucesso![/green]")
-
-            # Recarregar dados
-            data_loader.load_items(force_reload=True)
         else:
             console.print("[yellow]❌ Operação cancelada[/yellow]")
 
@@ -1082,5 +1127,19 @@ def display_build_results(build: Build):
 
         console.print(combat_table)
 
+    # Eficiência de gold com os valores derivados do catálogo carregado
+    if build.items:
+        efficiency_table = Table(title="💰 Eficiência de Gold")
+        efficiency_table.add_column("Item", style="yellow")
+        efficiency_table.add_column("Custo", style="cyan")
+        efficiency_table.add_column("Valor em Gold", style="green")
+        efficiency_table.add_column("Eficiência", style="magenta")
+
+        for row in dps_calculator.calculate_build_gold_efficiency(build, items=data_loader.get_item_catalog()):
+            efficiency_table.add_row(row['item_name'], f"{row['item_cost']}g",
+                                     f"{row['total_gold_value']:.0f}g", f"{row['efficiency_percent']:.1f}%")
+
+        console.print(efficiency_table)
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,18 @@
+"""
+🔥 SmashBuilder - Configuração dos Testes 🔥
+Fixtures compartilhadas pelos testes
+"""
+
+import pytest
+
+from data_io import snapshot, result_store
+
+@pytest.fixture(autouse=True)
+def isolated_snapshots(monkeypatch):
+    """Snapshots só onde o teste pedir: ignora SNAPSHOT_ENV do ambiente"""
+    monkeypatch.delenv(snapshot.SNAPSHOT_ENV, raising=False)
+
+@pytest.fixture(autouse=True)
+def isolated_result_store(monkeypatch):
+    """Sem armazenamento persistente padrão: testes passam o próprio ResultStore"""
+    monkeypatch.setenv(result_store.RESULT_STORE_ENV, result_store.DISABLED)
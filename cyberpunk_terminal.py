@@ -43,6 +43,7 @@ class CyberpunkTerminal:
         self.console = Console()
         self.colors = CyberpunkColors()
         self.running = True
+        self.formula_engine = None
         self.clear_screen()
 
     def clear_screen(self):
@@ -165,9 +166,12 @@ class CyberpunkTerminal:
         """Mostra seletor de itens com números"""
         try:
             from data_io.loader import data_loader
+            from calc.models import StatType, ModifierType
             items = data_loader.load_items()
 
             selected_items = []
+            # Filtro por stat (consulta ao índice de stats); None = todos os itens
+            item_filter = None
 
             while len(selected_items) < max_items:
                 self.clear_screen()
@@ -183,7 +187,7 @@ class CyberpunkTerminal:
                 print(f"{self.colors.PRIMARY}║{'SELECIONAR ITEM':^75}║{self.colors.RESET}")
                 print(f"{self.colors.PRIMARY}╠{'═' * 75}╣{self.colors.RESET}")
 
-                item_list = list(items.values())
+                item_list = data_loader.query_items(**item_filter) if item_filter else list(items.values())
                 # Mostrar apenas os primeiros 15 itens para não poluir a tela
                 display_items = sorted(item_list, key=lambda x: x.cost, reverse=True)[:15]
 
@@ -192,6 +196,8 @@ class CyberpunkTerminal:
                     unique_indicator = "⭐" if item.unique else "  "
                     print(f"{self.colors.PRIMARY}║{self.colors.RESET} {self.colors.SUCCESS}[{i:2}]{self.colors.RESET} {mythic_indicator}{unique_indicator} {item.name:<35} {self.colors.WARNING}{item.cost:>4}g{self.colors.RESET} {self.colors.PRIMARY}║{self.colors.RESET}")
 
+                filter_label = "FILTRAR POR STAT" if not item_filter else "REMOVER FILTRO"
+                print(f"{self.colors.PRIMARY}║{self.colors.RESET} {self.colors.SUCCESS}[97]{self.colors.RESET} {self.colors.ACCENT}► {filter_label:<65}{self.colors.RESET} {self.colors.PRIMARY}║{self.colors.RESET}")
                 print(f"{self.colors.PRIMARY}║{self.colors.RESET} {self.colors.SUCCESS}[98]{self.colors.RESET} {self.colors.ACCENT}► {'FINALIZAR SELEÇÃO':<65}{self.colors.RESET} {self.colors.PRIMARY}║{self.colors.RESET}")
                 print(f"{self.colors.PRIMARY}║{self.colors.RESET} {self.colors.SUCCESS}[99]{self.colors.RESET} {self.colors.ERROR}► {'LIMPAR SELEÇÃO':<65}{self.colors.RESET} {self.colors.PRIMARY}║{self.colors.RESET}")
                 print(f"{self.colors.PRIMARY}║{self.colors.RESET} {self.colors.SUCCESS}[0 ]{self.colors.RESET} {self.colors.ERROR}► {'VOLTAR':<65}{self.colors.RESET} {self.colors.PRIMARY}║{self.colors.RESET}")
@@ -203,6 +209,25 @@ class CyberpunkTerminal:
                     choice_num = int(choice)
                     if choice_num == 0:
                         return []
+                    elif choice_num == 97:
+                        if item_filter:
+                            item_filter = None
+                            continue
+                        try:
+                            stat = StatType(self.get_cyberpunk_input("Stat (ex: attack_damage, critical_chance)").strip())
+                            minimum = self.get_cyberpunk_input("Valor mínimo (Enter = qualquer)").strip()
+                            if minimum:
+                                # Valores dependem do tipo (AS, por exemplo, só existe como percentual)
+                                modifier_type = ModifierType(self.get_cyberpunk_input("Tipo do valor (flat, percent)").strip())
+                            max_cost = self.get_cyberpunk_input("Custo máximo (Enter = sem limite)").strip()
+                            item_filter = {
+                                'minimum': {(stat, modifier_type): float(minimum)} if minimum else None,
+                                'has': [] if minimum else [stat],
+                                'max_cost': int(max_cost) if max_cost else None,
+                            }
+                        except ValueError:
+                            self.print_error("Filtro inválido!")
+                            time.sleep(1)
                     elif choice_num == 98:
                         return selected_items
                     elif choice_num == 99:
@@ -287,7 +312,15 @@ class CyberpunkTerminal:
 
         try:
             from calc.models import Build
-            from calc.formulas import formula_engine
+            from calc.cache import CachedFormulaEngine
+            from data_io.loader import data_loader
+            from data_io.result_store import default_result_store
+
+            # Engine com cache de stats, versionado pelos dados do loader e
+            # persistido entre execuções (ver RESULT_STORE_ENV)
+            if self.formula_engine is None:
+                self.formula_engine = CachedFormulaEngine(data_version=data_loader.data_version,
+                                                          store=default_result_store(data_loader))
 
             # Seleção de campeão
             self.cyberpunk_loading("Carregando dados de campeões")
@@ -332,7 +365,7 @@ class CyberpunkTerminal:
             self.cyberpunk_loading("Calculando atributos finais")
             self.cyberpunk_loading("Computando DPS estimado")
 
-            final_stats = formula_engine.calculate_final_stats(build)
+            final_stats = self.formula_engine.calculate_final_stats(build)
             build.final_stats = final_stats
 
             self.print_success("Build calculada com sucesso!")
@@ -386,6 +419,22 @@ class CyberpunkTerminal:
 
             self.console.print(combat_table)
 
+        # Eficiência de gold com os valores derivados do catálogo carregado
+        if build.items:
+            from data_io.loader import data_loader
+            from calc.dps import dps_calculator
+
+            efficiency_table = Table(title="💰 Eficiência de Gold", style="magenta")
+            efficiency_table.add_column("Item", style="yellow")
+            efficiency_table.add_column("Valor em Gold", style="green")
+            efficiency_table.add_column("Eficiência", style="magenta")
+
+            for row in dps_calculator.calculate_build_gold_efficiency(build, items=data_loader.get_item_catalog()):
+                efficiency_table.add_row(row['item_name'], f"{row['total_gold_value']:.0f}g",
+                                         f"{row['efficiency_percent']:.1f}%")
+
+            self.console.print(efficiency_table)
+
         # Custo total
         total_cost = sum(item.cost for item in build.items)
         print(f"\n{self.colors.WARNING}💰 Custo Total: {total_cost}g{self.colors.RESET}")
@@ -727,36 +776,11 @@ class CyberpunkTerminal:
             confirm = self.get_cyberpunk_input("Adicionar este item? (s/n)")
 
             if confirm.lower() in ['s', 'sim', 'y', 'yes']:
-                # Salvar
-                items_file = Path("data/items.json")
-                with open(items_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-                item_dict = {
-                    "name": item.name,
-                    "modifiers": [
-                        {
-                            "stat": mod.stat.value,
-                            "value": mod.value,
-                            "modifier_type": mod.modifier_type.value
-                        }
-                        for mod in item.modifiers
-                    ],
-                    "cost": item.cost,
-                    "unique": item.unique,
-                    "mythic": item.mythic
-                }
-
-                data["items"].append(item_dict)
-
-                with open(items_file, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
+                # Salvar em items.json e atualizar catálogo e índice de stats
+                from data_io.loader import data_loader
+                data_loader.add_item(item)
 
                 self.print_success(f"Item '{item.name}' adicionado com sucesso!")
-
-                # Recarregar
-                from data_io.loader import data_loader
-                data_loader.load_items(force_reload=True)
             else:
                 self.print_warning("Operação cancelada!")
 
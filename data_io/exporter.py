@@ -12,11 +12,13 @@ from datetime import datetime
 
 try:
     from calc.models import Build, FinalStats, BuildComparison
+    from calc.power_curve import PowerCurves
 except ImportError:
     # Fallback para execução direta
     import sys
     sys.path.append(str(Path(__file__).parent.parent))
     from calc.models import Build, FinalStats, BuildComparison
+    from calc.power_curve import PowerCurves
 
 class DataExporter:
     """Exportador principal de dados"""
@@ -237,8 +239,15 @@ class DataExporter:
 
         return filepath
 
-    def export_level_table_to_csv(self, champion_name: str, items: List[str], levels: List[int], stats_by_level: Dict[int, Dict], filename: str = None) -> Path:
-        """Exporta tabela por níveis para CSV"""
+    def export_level_table_to_csv(self, champion_name: str, items: List[str], levels: List[int],
+                                  stats_by_level: Union[Dict[int, Dict], PowerCurves], filename: str = None) -> Path:
+        """
+        Exporta tabela por níveis para CSV
+        stats_by_level: nível -> stats, ou PowerCurves (primeiro campeão e conjunto de itens)
+        """
+        if isinstance(stats_by_level, PowerCurves):
+            stats_by_level = stats_by_level.level_table()
+
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"level_table_{champion_name.replace(' ', '_')}_{timestamp}.csv"
@@ -271,6 +280,59 @@ class DataExporter:
 
         return filepath
 
+    def export_power_curves_to_csv(self, curves: PowerCurves, filename: str = None) -> Path:
+        """Exporta curvas de poder (PowerCurveEngine) para CSV, uma linha por campeão, itens e nível"""
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"power_curves_{timestamp}.csv"
+
+        filepath = self.output_dir / filename
+
+        headers = ["Campeão", "Itens", "Nível"] + list(curves.metrics)
+
+        rows = [headers]
+
+        for entry in curves.rows():
+            rows.append(
+                [entry["champion"], " + ".join(entry["items"]), entry["level"]] +
+                [round(entry[metric], 2) for metric in curves.metrics]
+            )
+
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerows(rows)
+
+        return filepath
+
+    def export_pareto_frontier_to_csv(self, frontier: List[Dict[str, Any]], filename: str = None) -> Path:
+        """Exporta a fronteira de Pareto (ParetoAnalyzer.frontier) para CSV"""
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"pareto_frontier_{timestamp}.csv"
+
+        filepath = self.output_dir / filename
+
+        headers = ["Build", "Itens", "DPS", "TTK", "Custo", "HP Efetivo (Físico)", "HP Efetivo (Mágico)"]
+
+        rows = [headers]
+
+        for entry in frontier:
+            rows.append([
+                entry.get("name", ""),
+                " + ".join(entry.get("items", [])),
+                entry.get("dps"),
+                entry.get("ttk"),
+                entry.get("cost", 0),
+                round(entry.get("effective_hp_physical", 0), 2),
+                round(entry.get("effective_hp_magical", 0), 2)
+            ])
+
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerows(rows)
+
+        return filepath
+
     def export_to_yaml(self, data: Dict, filename: str) -> Path:
         """Exporta dados para YAML"""
         filepath = self.output_dir / filename
@@ -4,37 +4,105 @@ Sistema para carregar dados de campeões, itens e presets
 """
 
 import json
+import hashlib
+import os
 import yaml
+import numpy as np
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 try:
     from calc.models import (
-        ChampionStats, Item, ItemModifier, RunePreset, RuneModifier,
-        Target, StatType, ModifierType
+        Build, ChampionStats, DamageProfile, Item, ItemModifier, RunePreset, RuneModifier,
+        Target, StatType, ModifierType, NUM_STATS
     )
+    from calc.batch import compile_modifiers, level_table, MAX_LEVEL
+    from calc.catalog import ItemCatalog
+    from calc.stat_index import StatIndex
+    from calc.damage import DamageKernel
+    from data_io.snapshot import CatalogSnapshot, SNAPSHOT_ENV, content_hash
 except ImportError:
     # Fallback para execução direta
     import sys
     sys.path.append(str(Path(__file__).parent.parent))
     from calc.models import (
-        ChampionStats, Item, ItemModifier, RunePreset, RuneModifier,
-        Target, StatType, ModifierType
+        Build, ChampionStats, DamageProfile, Item, ItemModifier, RunePreset, RuneModifier,
+        Target, StatType, ModifierType, NUM_STATS
     )
+    from calc.batch import compile_modifiers, level_table, MAX_LEVEL
+    from calc.catalog import ItemCatalog
+    from calc.stat_index import StatIndex
+    from calc.damage import DamageKernel
+    from data_io.snapshot import CatalogSnapshot, SNAPSHOT_ENV, content_hash
+
+# Arquivos que definem a versão dos dados (ver DataLoader.data_version)
+DATA_FILES = ("champions.json", "items.json", "presets.json")
 
 class DataLoader:
     """Carregador principal de dados"""
 
-    def __init__(self, data_dir: Union[str, Path] = None):
+    def __init__(self, data_dir: Union[str, Path] = None, snapshot_dir: Union[str, Path] = None,
+                 use_snapshot: Optional[bool] = None):
         if data_dir is None:
             # Diretório padrão relativo ao arquivo atual
             self.data_dir = Path(__file__).parent.parent / "data"
         else:
             self.data_dir = Path(data_dir)
 
+        # Snapshot compilado dos arquivos de dados (ver data_io.snapshot), só
+        # quando pedido; resolvido no primeiro acesso (ver snapshot)
+        self._snapshot_dir = snapshot_dir
+        self._use_snapshot = use_snapshot
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._snapshot_resolved = False
+        # Erros de validação da última carga, por arquivo
+        self.load_errors: Dict[str, List[str]] = {}
+
         self._champions_cache = None
         self._items_cache = None
+        self._catalog_cache = None
+        self._stat_index_cache = None
         self._presets_cache = None
+        self._level_tables_cache = None
+        self._data_version_cache = None
+
+    @property
+    def snapshot(self) -> Optional[CatalogSnapshot]:
+        """
+        Snapshot usado nas cargas, só quando pedido: use_snapshot=True (raiz
+        DEFAULT_SNAPSHOT_ROOT), snapshot_dir ou a variável de ambiente
+        SNAPSHOT_ENV; use_snapshot=False desativa mesmo com a variável
+        Lido no primeiro acesso, então a instância global respeita a variável
+        definida depois do import
+        """
+        if not self._snapshot_resolved:
+            root = self._snapshot_dir or os.environ.get(SNAPSHOT_ENV) or None
+            use_snapshot = root is not None if self._use_snapshot is None else self._use_snapshot
+            if use_snapshot:
+                self._snapshot = CatalogSnapshot(self.data_dir, root)
+            self._snapshot_resolved = True
+        return self._snapshot
+
+    def data_version(self) -> str:
+        """
+        Hash do conteúdo de DATA_FILES; muda sempre que um dos arquivos muda
+        O hash só é recalculado quando o tamanho ou a data de modificação mudam
+        """
+        paths = [self.data_dir / filename for filename in DATA_FILES]
+        signature = tuple(
+            (path.stat().st_mtime_ns, path.stat().st_size) if path.exists() else None
+            for path in paths
+        )
+
+        if self._data_version_cache is None or self._data_version_cache[0] != signature:
+            digest = hashlib.sha1()
+            for path in paths:
+                content = path.read_bytes() if path.exists() else b""
+                digest.update(f"{path.name}:{len(content)}:".encode("utf-8"))
+                digest.update(content)
+            self._data_version_cache = (signature, digest.hexdigest())
+
+        return self._data_version_cache[1]
 
     def load_json(self, filename: str) -> Dict:
         """Carrega arquivo JSON"""
@@ -62,80 +130,221 @@ class DataLoader:
         except yaml.YAMLError as e:
             raise ValueError(f"Erro ao decodificar YAML em {filename}: {e}")
 
+    def _load_section(self, filename: str, parse) -> Dict:
+        """
+        Carrega um arquivo de dados já compilado: do snapshot, se o conteúdo do
+        arquivo não mudou, ou parse(json) seguido da gravação do snapshot
+        parse retorna (conteúdo, erros de validação)
+        """
+        file_path = self.data_dir / filename
+        source_hash = None
+
+        if self.snapshot is not None and file_path.exists():
+            source_hash = content_hash(file_path.read_bytes())
+            cached = self.snapshot.load(filename, source_hash)
+            if cached is not None:
+                content, errors = cached
+                self.load_errors[filename] = errors
+                self._report_errors(filename, errors)
+                return content
+
+        content, errors = parse(self.load_json(filename))
+        self.load_errors[filename] = errors
+        self._report_errors(filename, errors)
+
+        if source_hash is not None:
+            self.snapshot.save(filename, source_hash, (content, errors))
+
+        return content
+
+    @staticmethod
+    def _report_errors(filename: str, errors: List[str]):
+        """Mostra os erros de validação de um arquivo de uma só vez"""
+        if errors:
+            print(f"⚠️ {len(errors)} erro(s) ao carregar {filename}:\n" + "\n".join(f"  - {error}" for error in errors))
+
     def load_champions(self, force_reload: bool = False) -> Dict[str, ChampionStats]:
         """Carrega dados de campeões"""
         if self._champions_cache is None or force_reload:
-            data = self.load_json("champions.json")
-            champions = {}
+            content = self._load_section("champions.json", self._parse_champions)
 
-            for champion_data in data.get("champions", []):
-                try:
-                    champion = ChampionStats(**champion_data)
-                    champions[champion.name.lower()] = champion
-                except Exception as e:
-                    print(f"Erro ao carregar campeão {champion_data.get('name', 'Unknown')}: {e}")
+            # Tabelas de níveis vêm prontas; continuam somente leitura
+            names, tables = content["level_tables"]
+            tables.flags.writeable = False
+            sources = [level_table(champion) for champion in content["champions"].values()]
+            for table in sources:
+                table.flags.writeable = False
 
-            self._champions_cache = champions
+            self._champions_cache = content["champions"]
+            self._level_tables_cache = (names, tables, sources)
 
         return self._champions_cache
 
+    @staticmethod
+    def _parse_champions(data: Dict) -> Tuple[Dict, List[str]]:
+        """Valida os campeões e pré-calcula as tabelas de stats base dos níveis 1-18"""
+        champions = {}
+        errors = []
+
+        for champion_data in data.get("champions", []):
+            try:
+                champion = ChampionStats(**champion_data)
+                level_table(champion)
+                champions[champion.name.lower()] = champion
+            except Exception as e:
+                errors.append(f"Erro ao carregar campeão {champion_data.get('name', 'Unknown')}: {e}")
+
+        names = list(champions.keys())
+        if names:
+            tables = np.stack([level_table(champions[name]) for name in names])
+        else:
+            tables = np.zeros((0, MAX_LEVEL, NUM_STATS))
+
+        return {"champions": champions, "level_tables": (names, tables)}, errors
+
     def load_items(self, force_reload: bool = False) -> Dict[str, Item]:
         """Carrega dados de itens"""
         if self._items_cache is None or force_reload:
-            data = self.load_json("items.json")
-            items = {}
+            self._items_cache = self._load_section("items.json", self._parse_items)
+            self._catalog_cache = None
+            self._stat_index_cache = None
 
-            for item_data in data.get("items", []):
-                try:
-                    # Converter modificadores
-                    modifiers = []
-                    for mod_data in item_data.get("modifiers", []):
-                        modifier = ItemModifier(
-                            stat=StatType(mod_data["stat"]),
-                            value=mod_data["value"],
-                            modifier_type=ModifierType(mod_data["modifier_type"])
-                        )
-                        modifiers.append(modifier)
+        return self._items_cache
 
-                    # Criar item
-                    item = Item(
-                        name=item_data["name"],
-                        modifiers=modifiers,
-                        cost=item_data.get("cost", 0),
-                        unique=item_data.get("unique", False),
-                        mythic=item_data.get("mythic", False)
+    def get_item_catalog(self) -> ItemCatalog:
+        """
+        Visão colunar dos itens carregados (calc.catalog), montada uma vez por
+        carga e compartilhada; ids seguem a ordem de load_items()
+        """
+        items = self.load_items()
+        if self._catalog_cache is None:
+            self._catalog_cache = ItemCatalog(items.values())
+        return self._catalog_cache
+
+    @staticmethod
+    def _parse_items(data: Dict) -> Tuple[Dict[str, Item], List[str]]:
+        """Valida os itens e compila seus modificadores"""
+        items = {}
+        errors = []
+
+        for item_data in data.get("items", []):
+            try:
+                # Converter modificadores
+                modifiers = []
+                for mod_data in item_data.get("modifiers", []):
+                    modifier = ItemModifier(
+                        stat=StatType(mod_data["stat"]),
+                        value=mod_data["value"],
+                        modifier_type=ModifierType(mod_data["modifier_type"])
                     )
+                    modifiers.append(modifier)
+
+                # Criar item
+                item = Item(
+                    name=item_data["name"],
+                    modifiers=modifiers,
+                    cost=item_data.get("cost", 0),
+                    unique=item_data.get("unique", False),
+                    mythic=item_data.get("mythic", False)
+                )
+
+                # Compilar modificadores em vetores uma única vez
+                compile_modifiers(item)
+
+                items[item.name.lower()] = item
+
+            except Exception as e:
+                errors.append(f"Erro ao carregar item {item_data.get('name', 'Unknown')}: {e}")
+
+        return items, errors
+
+    def get_stat_index(self) -> StatIndex:
+        """
+        Índice invertido de stats dos itens carregados (calc.stat_index), com
+        os mesmos ids de get_item_catalog(); recriado a cada carga e
+        atualizado por add_item
+        """
+        if self._stat_index_cache is None:
+            self._stat_index_cache = StatIndex(self.get_item_catalog())
+        return self._stat_index_cache
+
+    def add_item(self, item: Item, save: bool = True):
+        """
+        Adiciona (ou substitui, pelo nome) um item ao catálogo carregado e,
+        se save, ao items.json; catálogo colunar e índice de stats acompanham
+        """
+        items = self.load_items()
+        key = item.name.lower()
+        compile_modifiers(item)
 
-                    items[item.name.lower()] = item
-
-                except Exception as e:
-                    print(f"Erro ao carregar item {item_data.get('name', 'Unknown')}: {e}")
-
-            self._items_cache = items
-
-        return self._items_cache
+        if save:
+            file_path = self.data_dir / "items.json"
+            data = self.load_json("items.json")
+            item_dict = {
+                "name": item.name,
+                "modifiers": [
+                    {
+                        "stat": mod.stat.value,
+                        "value": mod.value,
+                        "modifier_type": mod.modifier_type.value
+                    }
+                    for mod in item.modifiers
+                ],
+                "cost": item.cost,
+                "unique": item.unique,
+                "mythic": item.mythic
+            }
+            entries = data.setdefault("items", [])
+            positions = [index for index, entry in enumerate(entries) if entry.get("name", "").lower() == key]
+            if positions:
+                entries[positions[0]] = item_dict
+            else:
+                entries.append(item_dict)
+
+            content = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+            file_path.write_bytes(content)
+            if self.snapshot is not None:
+                self.snapshot.save("items.json", content_hash(content),
+                                   ({**items, key: item}, self.load_errors.get("items.json", [])))
+
+        replaced = key in items
+        items[key] = item
+        self._catalog_cache = None
+
+        # Item novo entra no fim do catálogo: inserção no índice; substituição recria
+        if self._stat_index_cache is not None and not replaced:
+            self._stat_index_cache.add(len(items) - 1, item)
+        else:
+            self._stat_index_cache = None
 
     def load_presets(self, force_reload: bool = False) -> Dict:
         """Carrega presets de alvos, runas e buffs"""
         if self._presets_cache is None or force_reload:
-            data = self.load_json("presets.json")
+            self._presets_cache = self._load_section("presets.json", self._parse_presets)
 
-            # Carregar alvos
-            targets = {}
-            for target_key, target_data in data.get("targets", {}).items():
-                try:
-                    target = Target(**target_data)
-                    targets[target_key] = target
-                except Exception as e:
-                    print(f"Erro ao carregar alvo {target_key}: {e}")
+        return self._presets_cache
 
-            # Carregar runas
-            runes = {}
-            for rune_key, rune_data in data.get("runes", {}).items():
+    @staticmethod
+    def _parse_presets(data: Dict) -> Tuple[Dict, List[str]]:
+        """Valida alvos, runas e buffs"""
+        errors = []
+
+        # Carregar alvos
+        targets = {}
+        for target_key, target_data in data.get("targets", {}).items():
+            try:
+                target = Target(**target_data)
+                targets[target_key] = target
+            except Exception as e:
+                errors.append(f"Erro ao carregar alvo {target_key}: {e}")
+
+        def parse_modifier_presets(section: str, label: str) -> Dict[str, RunePreset]:
+            presets = {}
+            for preset_key, preset_data in data.get(section, {}).items():
                 try:
                     # Converter modificadores
                     modifiers = []
-                    for mod_data in rune_data.get("modifiers", []):
+                    for mod_data in preset_data.get("modifiers", []):
                         modifier = RuneModifier(
                             stat=StatType(mod_data["stat"]),
                             value=mod_data["value"],
@@ -143,49 +352,44 @@ class DataLoader:
                         )
                         modifiers.append(modifier)
 
-                    rune_preset = RunePreset(
-                        name=rune_data["name"],
-                        description=rune_data.get("description", ""),
+                    preset = RunePreset(
+                        name=preset_data["name"],
+                        description=preset_data.get("description", ""),
                         modifiers=modifiers
                     )
+                    compile_modifiers(preset)
 
-                    runes[rune_key] = rune_preset
+                    presets[preset_key] = preset
 
                 except Exception as e:
-                    print(f"Erro ao carregar runa {rune_key}: {e}")
-
-            # Carregar buffs (similar às runas)
-            buffs = {}
-            for buff_key, buff_data in data.get("buffs", {}).items():
-                try:
-                    modifiers = []
-                    for mod_data in buff_data.get("modifiers", []):
-                        modifier = RuneModifier(
-                            stat=StatType(mod_data["stat"]),
-                            value=mod_data["value"],
-                            modifier_type=ModifierType(mod_data["modifier_type"])
-                        )
-                        modifiers.append(modifier)
-
-                    buff_preset = RunePreset(
-                        name=buff_data["name"],
-                        description=buff_data.get("description", ""),
-                        modifiers=modifiers
-                    )
-
-                    buffs[buff_key] = buff_preset
+                    errors.append(f"Erro ao carregar {label} {preset_key}: {e}")
+            return presets
+
+        presets = {
+            "targets": targets,
+            "runes": parse_modifier_presets("runes", "runa"),
+            # Buffs usam o mesmo formato das runas
+            "buffs": parse_modifier_presets("buffs", "buff"),
+            "build_templates": data.get("build_templates", {})
+        }
+        return presets, errors
+
+    def get_level_tables(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Tabelas de stats base de todos os campeões (campeões × níveis × StatType)
+        Retorna as chaves dos campeões na ordem da primeira dimensão
+        Campeões editados depois da carga têm suas tabelas recalculadas
+        """
+        champions = self.load_champions()
+        names, tables, sources = self._level_tables_cache
 
-                except Exception as e:
-                    print(f"Erro ao carregar buff {buff_key}: {e}")
+        current = [level_table(champions[name]) for name in names]
+        if any(table is not source for table, source in zip(current, sources)):
+            tables = np.stack(current) if current else tables
+            tables.flags.writeable = False
+            self._level_tables_cache = (names, tables, current)
 
-            self._presets_cache = {
-                "targets": targets,
-                "runes": runes,
-                "buffs": buffs,
-                "build_templates": data.get("build_templates", {})
-            }
-
-        return self._presets_cache
+        return names, tables
 
     def get_champion(self, name: str) -> Optional[ChampionStats]:
         """Busca um campeão por nome"""
@@ -207,6 +411,40 @@ class DataLoader:
         presets = self.load_presets()
         return presets["runes"].get(name.lower())
 
+    def get_build_template(self, name: str, champion: ChampionStats, level: int = 18) -> Optional[Build]:
+        """
+        Monta a build de um template de presets.json para um campeão
+        Itens ausentes do catálogo são ignorados (com aviso); o perfil de dano
+        do template vem de get_template_damage_profile
+        """
+        template = self.load_presets()["build_templates"].get(name.lower())
+        if template is None:
+            return None
+
+        items = []
+        for item_name in template.get("items", []):
+            item = self.get_item(item_name)
+            if item is None:
+                print(f"Aviso: item {item_name} do template {name} não encontrado")
+                continue
+            items.append(item)
+
+        return Build(
+            name=template.get("name", name),
+            champion=champion,
+            level=level,
+            items=items,
+            runes=self.get_rune_preset(template["runes"]) if template.get("runes") else None,
+            target=self.get_target(template["target"]) if template.get("target") else None,
+        )
+
+    def get_template_damage_profile(self, name: str) -> Optional[DamageProfile]:
+        """Perfil de dano (calc.damage) de um template; basic_attack se o template não define"""
+        template = self.load_presets()["build_templates"].get(name.lower())
+        if template is None:
+            return None
+        return DamageKernel.resolve_profile(template.get("damage_profile"))
+
     def search_champions(self, query: str) -> List[ChampionStats]:
         """Busca campeões por nome parcial"""
         champions = self.load_champions()
@@ -232,17 +470,20 @@ class DataLoader:
         return results
 
     def get_items_by_stat(self, stat: StatType) -> List[Item]:
-        """Busca itens que modificam um stat específico"""
-        items = self.load_items()
-        results = []
-
-        for item in items.values():
-            for modifier in item.modifiers:
-                if modifier.stat == stat:
-                    results.append(item)
-                    break
-
-        return results
+        """
+        Busca itens que modificam um stat específico (via índice de stats);
+        qualquer modificador conta, inclusive UNIQUE ou de valor zero
+        """
+        return self.get_item_catalog().select(self.get_stat_index().ids_modifying(stat))
+
+    def query_items(self, minimum: Optional[Dict] = None, has: Sequence = (), max_cost: Optional[int] = None,
+                    min_cost: Optional[int] = None) -> List[Item]:
+        """
+        Itens que atendem a todas as condições (ver StatIndex.query)
+        Ex.: query_items({(StatType.AD, ModifierType.FLAT): 30}, has=[StatType.AS], max_cost=3000)
+        """
+        ids = self.get_stat_index().query(minimum, has, max_cost, min_cost)
+        return self.get_item_catalog().select(ids)
 
     def validate_data_integrity(self) -> Dict[str, List[str]]:
         """Valida a integridade dos dados carregados"""
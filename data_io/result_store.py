@@ -0,0 +1,176 @@
+"""
+🔥 SmashBuilder - Armazenamento de Resultados 🔥
+Cache persistente (SQLite) de stats finais entre execuções
+"""
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+try:
+    from calc.models import FinalStats
+    from data_io.loader import DataLoader, data_loader
+except ImportError:
+    # Fallback para execução direta
+    import sys
+    sys.path.append(str(Path(__file__).parent.parent))
+    from calc.models import FinalStats
+    from data_io.loader import DataLoader, data_loader
+
+DEFAULT_STORE_PATH = Path.home() / ".cache" / "smashbuilder" / "results.sqlite"
+
+# Caminho do armazenamento usado pela CLI e pelo terminal; "off" desativa
+RESULT_STORE_ENV = "SMASHBUILDER_RESULT_STORE"
+DISABLED = "off"
+
+# Formato das tabelas; um arquivo com outra versão (ou sem versão, como o
+# formato 1 com a tabela results) é migrado descartando as entradas antigas
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS stats (
+    source TEXT NOT NULL,
+    data_version TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (source, data_version, key)
+);
+"""
+
+class ResultStore:
+    """
+    Stats finais persistidos por hash canônico da build (calc.cache)
+
+    Cada entrada guarda o diretório de dados (source) e a versão dos dados
+    (hash de champions.json, items.json e presets.json) com que foi
+    calculada; só entradas da versão atual são encontradas. Quando os dados
+    mudam, as entradas antigas do mesmo diretório são descartadas, então
+    vários diretórios de dados podem dividir o mesmo arquivo. Compatível com
+    o parâmetro store do CachedFormulaEngine (get/put).
+    """
+
+    def __init__(self, path: Union[str, Path] = None, loader: Optional[DataLoader] = None):
+        self.path = Path(path) if path is not None else DEFAULT_STORE_PATH
+        self.loader = loader or data_loader
+        self.source = str(self.loader.data_dir.resolve())
+        self._connection: Optional[sqlite3.Connection] = None
+        self._version: Optional[str] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Conexão aberta na primeira consulta"""
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(str(self.path))
+            self._connection.executescript(SCHEMA)
+            self._migrate(self._connection)
+        return self._connection
+
+    @staticmethod
+    def _migrate(connection: sqlite3.Connection):
+        """Descarta entradas de outro formato (só quando schema_version difere)"""
+        row = connection.execute("SELECT value FROM meta WHERE name = 'schema_version'").fetchone()
+        if row is not None and row[0] == str(SCHEMA_VERSION):
+            return
+        with connection:
+            connection.execute("DROP TABLE IF EXISTS results")
+            connection.execute("DELETE FROM stats")
+            connection.execute("DELETE FROM meta")
+            connection.execute("INSERT INTO meta (name, value) VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+
+    @property
+    def data_version(self) -> str:
+        """Versão dos dados das entradas válidas"""
+        return self._ensure_version()
+
+    def _ensure_version(self) -> str:
+        """Descarta as entradas deste diretório de dados com outra versão"""
+        version = self.loader.data_version()
+        if version != self._version:
+            with self.connection:
+                self.connection.execute("DELETE FROM stats WHERE source = ? AND data_version != ?",
+                                        (self.source, version))
+            self._version = version
+        return version
+
+    def get(self, key: str) -> Optional[FinalStats]:
+        """Stats finais de uma build (None se ausente ou invalidado)"""
+        version = self._ensure_version()
+        row = self.connection.execute(
+            "SELECT payload FROM stats WHERE source = ? AND data_version = ? AND key = ?",
+            (self.source, version, key),
+        ).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, FinalStats]:
+        """Entradas presentes entre as chaves pedidas"""
+        version = self._ensure_version()
+        keys = list(keys)
+        found = {}
+        # Limite de parâmetros por consulta do SQLite
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for key, payload in self.connection.execute(
+                f"SELECT key, payload FROM stats WHERE source = ? AND data_version = ? AND key IN ({placeholders})",
+                [self.source, version, *chunk],
+            ):
+                found[key] = self._decode(payload)
+        return found
+
+    def put(self, key: str, stats: FinalStats, validated: bool = True):
+        """Grava stats finais (apenas resultados validados são persistidos)"""
+        if validated:
+            self.put_many([(key, stats)])
+
+    def put_many(self, entries: Iterable[Tuple[str, FinalStats]]):
+        """Grava várias entradas em uma única transação"""
+        version = self._ensure_version()
+        rows = [(self.source, version, key, self._encode(stats)) for key, stats in entries]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO stats (source, data_version, key, payload) VALUES (?, ?, ?, ?)", rows
+            )
+
+    def __len__(self) -> int:
+        version = self._ensure_version()
+        return self.connection.execute("SELECT COUNT(*) FROM stats WHERE source = ? AND data_version = ?",
+                                       (self.source, version)).fetchone()[0]
+
+    def clear(self):
+        """Remove as entradas deste diretório de dados"""
+        with self.connection:
+            self.connection.execute("DELETE FROM stats WHERE source = ?", (self.source,))
+
+    def close(self):
+        """Fecha a conexão (reaberta na próxima consulta)"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+            self._version = None
+
+    @staticmethod
+    def _encode(stats: FinalStats) -> str:
+        # json aceita inf (TTK de builds sem dano)
+        return json.dumps(stats.model_dump())
+
+    @staticmethod
+    def _decode(payload: str) -> FinalStats:
+        # Entradas foram validadas antes de gravadas
+        return FinalStats.trusted(**json.loads(payload))
+
+def default_result_store(loader: Optional[DataLoader] = None) -> Optional[ResultStore]:
+    """
+    Armazenamento da CLI e do terminal: DEFAULT_STORE_PATH, o caminho em
+    RESULT_STORE_ENV ou None se a variável for "off"
+    """
+    path = os.environ.get(RESULT_STORE_ENV) or None
+    if path is not None and path.strip().lower() == DISABLED:
+        return None
+    return ResultStore(path, loader=loader)
+
+# Instância global do armazenamento (arquivo criado na primeira consulta)
+result_store = ResultStore()
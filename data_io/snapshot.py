@@ -0,0 +1,131 @@
+"""
+🔥 SmashBuilder - Snapshot do Catálogo 🔥
+Modelos validados e arrays pré-calculados dos arquivos de dados, prontos para carregar
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+# Incrementar quando o conteúdo das seções mudar de formato
+SNAPSHOT_FORMAT = 1
+
+# Snapshots são opcionais: carregar um pickle executa código, e o manifest
+# que guarda os hashes fica no mesmo diretório gravável. Com
+# DataLoader(use_snapshot=True) ficam no cache do usuário, um subdiretório
+# por diretório de dados; snapshot_dir ou esta variável de ambiente ativam e
+# escolhem outra raiz
+DEFAULT_SNAPSHOT_ROOT = Path.home() / ".cache" / "smashbuilder" / "snapshots"
+SNAPSHOT_ENV = "SMASHBUILDER_SNAPSHOT_DIR"
+
+# Módulos cujas classes ou funções de parse definem o conteúdo do pickle;
+# mudanças neles invalidam os snapshots
+SCHEMA_MODULES = ("calc/models.py", "calc/batch.py", "data_io/loader.py")
+
+@lru_cache(maxsize=1)
+def schema_version() -> str:
+    """Hash do formato do snapshot e do código dos modelos serializados"""
+    root = Path(__file__).parent.parent
+    digest = hashlib.sha1(f"format:{SNAPSHOT_FORMAT}".encode("utf-8"))
+    for module in SCHEMA_MODULES:
+        path = root / module
+        digest.update(path.read_bytes() if path.exists() else b"")
+    return digest.hexdigest()
+
+def content_hash(content: bytes) -> str:
+    """Hash do conteúdo de um arquivo de dados"""
+    return hashlib.sha1(content).hexdigest()
+
+class CatalogSnapshot:
+    """
+    Seções compiladas do catálogo (uma por arquivo de dados) em pickle
+
+    manifest.json guarda, por seção, o hash do arquivo de origem e o do
+    pickle; uma seção só é carregada quando o hash do arquivo atual e a
+    versão do esquema coincidem, e só é desserializada se os bytes lidos têm
+    o hash registrado (proteção contra arquivos corrompidos, não contra quem
+    pode gravar no diretório). Falhas de leitura/escrita apenas desativam o atalho
+    (os dados são carregados dos JSON normalmente).
+    Cada diretório de dados tem seu subdiretório em root (por padrão
+    DEFAULT_SNAPSHOT_ROOT), nomeado pelo hash do caminho absoluto.
+    """
+
+    def __init__(self, data_dir: Union[str, Path], root: Union[str, Path] = None):
+        self.key = hashlib.blake2b(str(Path(data_dir).resolve()).encode("utf-8"), digest_size=8).hexdigest()
+        self.data_dir = Path(data_dir)
+        self.root = Path(root) if root is not None else DEFAULT_SNAPSHOT_ROOT
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def directory(self) -> Path:
+        return self.root / self.key
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / "manifest.json"
+
+    def manifest(self) -> Dict[str, Any]:
+        """Conteúdo do manifest (vazio se ausente, ilegível ou de outro esquema)"""
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {"schema": schema_version(), "sections": {}}
+
+        if manifest.get("schema") != schema_version():
+            return {"schema": schema_version(), "sections": {}}
+        return manifest
+
+    def section_path(self, section: str) -> Path:
+        return self.directory / f"{Path(section).stem}.pkl"
+
+    def load(self, section: str, source_hash: str) -> Optional[Any]:
+        """
+        Conteúdo da seção, se compilado a partir de um arquivo com esse hash;
+        o pickle só é desserializado se os bytes têm o hash do manifest
+        """
+        entry = self.manifest()["sections"].get(section)
+        if entry is None or entry.get("source_hash") != source_hash:
+            self.misses += 1
+            return None
+
+        try:
+            content = self.section_path(section).read_bytes()
+            if content_hash(content) != entry.get("payload_hash"):
+                raise ValueError(f"Snapshot alterado: {section}")
+            payload = pickle.loads(content)
+        except Exception:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return payload
+
+    def save(self, section: str, source_hash: str, payload: Any):
+        """Grava a seção e a registra no manifest (escritas atômicas)"""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            content = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+            self._write_atomic(self.section_path(section), content)
+
+            manifest = self.manifest()
+            manifest["sections"][section] = {"source_hash": source_hash, "payload_hash": content_hash(content)}
+            self._write_atomic(self.manifest_path, json.dumps(manifest, indent=2).encode("utf-8"))
+        except (OSError, pickle.PicklingError):
+            pass
+
+    def clear(self):
+        """Remove todas as seções e o manifest"""
+        if self.directory.exists():
+            for path in self.directory.iterdir():
+                path.unlink()
+
+    @staticmethod
+    def _write_atomic(path: Path, content: bytes):
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary.write_bytes(content)
+        os.replace(temporary, path)
@@ -0,0 +1,259 @@
+"""
+🔥 SmashBuilder - Testes de Cálculo em Lote 🔥
+Testes de compatibilidade entre o caminho vetorizado e o escalar
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from calc.models import Build, StatType, PRESET_TARGETS, PRESET_RUNES
+from calc.formulas import FormulaEngine
+from calc.batch import BuildMatrix, round_half_even
+from data_io.loader import DataLoader
+
+FINAL_STAT_FIELDS = [
+    "level", "ad", "ap", "as_", "crit_chance", "crit_damage", "hp", "mana",
+    "armor", "mr", "ms", "dps", "ttk", "effective_hp_physical", "effective_hp_magical",
+]
+
+def random_builds(count: int, seed: int = 7):
+    """Gera builds aleatórias válidas a partir do catálogo"""
+    loader = DataLoader()
+    champions = list(loader.load_champions().values())
+    items = list(loader.load_items().values())
+    runes = [None] + list(PRESET_RUNES.values()) + list(loader.load_presets()["runes"].values())
+    targets = [None] + list(PRESET_TARGETS.values())
+
+    rng = random.Random(seed)
+    builds = []
+    for index in range(count):
+        chosen = []
+        for item in rng.sample(items, rng.randint(0, 6)):
+            if item.mythic and any(other.mythic for other in chosen):
+                continue
+            chosen.append(item)
+
+        builds.append(Build(
+            name=f"Random {index}",
+            champion=rng.choice(champions),
+            level=rng.randint(1, 18),
+            items=chosen,
+            runes=rng.choice(runes),
+            target=rng.choice(targets),
+        ))
+
+    return builds
+
+class TestBatchEngine:
+    """Testes para calculate_final_stats_batch"""
+
+    def setup_method(self):
+        """Setup para cada teste"""
+        self.engine = FormulaEngine()
+
+    def test_batch_matches_scalar_bit_for_bit(self):
+        """Cada linha do lote deve ser idêntica ao cálculo escalar"""
+        builds = random_builds(400)
+        batch = self.engine.calculate_final_stats_batch(BuildMatrix.from_builds(builds))
+
+        assert len(batch) == len(builds)
+        for index, build in enumerate(builds):
+            expected = self.engine.calculate_final_stats(build)
+            actual = batch.to_final_stats(index)
+            for field in FINAL_STAT_FIELDS:
+                assert getattr(actual, field) == getattr(expected, field), (build.name, field)
+
+    def test_batch_columns(self):
+        """Colunas do lote expõem os stats por StatType"""
+        builds = random_builds(10, seed=3)
+        batch = self.engine.calculate_final_stats_batch(BuildMatrix.from_builds(builds))
+
+        ad = batch.column(StatType.AD)
+        assert ad.shape == (10,)
+        assert np.all(ad >= 1.0)
+
+    def test_batch_invalid_level(self):
+        """Níveis fora de 1..18 devem ser rejeitados"""
+        matrix = BuildMatrix.from_builds(random_builds(3))
+        matrix.levels[1] = 19
+
+        with pytest.raises(ValueError):
+            self.engine.calculate_final_stats_batch(matrix)
+
+    def test_round_half_even_matches_python_round(self):
+        """O arredondamento vetorizado reproduz round() do Python"""
+        rng = np.random.default_rng(11)
+        values = np.concatenate([
+            rng.uniform(0, 5000, 20000),
+            np.arange(0, 20, 0.005),  # valores próximos de empates
+            [0.125, 2.675, 1.005, 0.0],
+        ])
+
+        rounded = round_half_even(values, 2)
+        expected = np.array([round(float(value), 2) for value in values])
+
+        assert np.array_equal(rounded, expected)
+
+    def test_round_half_even_large_values(self):
+        """Empates e vizinhos em magnitudes grandes também seguem round() do Python"""
+        rng = np.random.default_rng(5)
+        ties = np.concatenate([(np.floor(rng.uniform(10.0 ** power, 10.0 ** (power + 1), 2000)) + 0.5) / 100
+                               for power in range(3, 17, 2)])
+        values = np.concatenate([
+            ties, np.nextafter(ties, np.inf), np.nextafter(ties, -np.inf), -ties,
+            rng.uniform(1e9, 1e15, 5000), [2.0 ** 52, 1e300, -1e307],
+        ])
+
+        rounded = round_half_even(values, 2)
+        expected = np.array([round(float(value), 2) for value in values])
+
+        assert np.array_equal(rounded, expected)
+
+class TestCompiledModifiers:
+    """Testes para a compilação de modificadores em vetores"""
+
+    def test_loader_compiles_items_and_runes(self):
+        """Itens e runas carregados já vêm compilados"""
+        loader = DataLoader()
+        for item in loader.load_items().values():
+            assert item._compiled is not None
+        for runes in loader.load_presets()["runes"].values():
+            assert runes._compiled is not None
+
+    def test_compiled_vectors(self):
+        """Vetores flat e percentuais seguem STAT_INDEX"""
+        from calc.batch import compile_modifiers
+        from calc.models import Item, ItemModifier, ModifierType, STAT_INDEX
+
+        item = Item(
+            name="Compiled Item",
+            modifiers=[
+                ItemModifier(stat=StatType.AD, value=40, modifier_type=ModifierType.FLAT),
+                ItemModifier(stat=StatType.AS, value=25, modifier_type=ModifierType.PERCENT),
+            ],
+        )
+        compiled = compile_modifiers(item)
+
+        assert compiled.flat.shape == (1, len(STAT_INDEX))
+        assert compiled.flat[0, STAT_INDEX[StatType.AD]] == 40
+        assert compiled.percent[0, STAT_INDEX[StatType.AS]] == 1.25
+        assert compile_modifiers(item) is compiled
+
+    def test_recompiled_when_modifiers_change(self):
+        """Editar um modificador ou copiar com outros modificadores recompila"""
+        from calc.batch import compile_modifiers
+        from calc.models import Item, ItemModifier, ModifierType, RuneModifier, RunePreset, STAT_INDEX
+
+        item = Item(name="Edited Item", cost=1000, modifiers=[
+            ItemModifier(stat=StatType.AD, value=40, modifier_type=ModifierType.FLAT),
+        ])
+        assert compile_modifiers(item).flat_vector[STAT_INDEX[StatType.AD]] == 40
+
+        item.modifiers[0].value = 55
+        assert compile_modifiers(item).flat_vector[STAT_INDEX[StatType.AD]] == 55
+
+        copy = item.model_copy(update={'modifiers': [
+            ItemModifier(stat=StatType.AS, value=30, modifier_type=ModifierType.PERCENT),
+        ]})
+        assert compile_modifiers(copy).flat_vector[STAT_INDEX[StatType.AD]] == 0
+        assert compile_modifiers(copy).percent_vector[STAT_INDEX[StatType.AS]] == 1.3
+        assert compile_modifiers(item).flat_vector[STAT_INDEX[StatType.AD]] == 55
+
+        runes = RunePreset(name="Edited Runes", modifiers=[
+            RuneModifier(stat=StatType.AP, value=10, modifier_type=ModifierType.FLAT),
+        ])
+        compile_modifiers(runes)
+        runes.modifiers.append(RuneModifier(stat=StatType.AP, value=5, modifier_type=ModifierType.FLAT))
+        assert compile_modifiers(runes).flat_vector[STAT_INDEX[StatType.AP]] == 15
+
+        # O resultado final usa os valores atuais
+        engine = FormulaEngine()
+        champion = DataLoader().get_champion("jinx")
+        build = Build(name="Edited", champion=champion, level=1, items=[item])
+        before = engine.calculate_final_stats(build).ad
+        item.modifiers[0].value = 65
+        assert engine.calculate_final_stats(build).ad == round(before + 10, 2)
+        matrix_stats = engine.calculate_final_stats_batch(BuildMatrix.from_builds([build])).stats
+        assert matrix_stats[0, STAT_INDEX[StatType.AD]] == engine.calculate_final_stats(build).ad
+
+    def test_apply_matches_modifier_loop(self):
+        """Aplicar vetores compilados é idêntico ao laço por modificador"""
+        from calc.models import ModifierType
+
+        engine = FormulaEngine()
+        for build in random_builds(200, seed=5):
+            base = engine.calculate_base_stats_at_level(build.champion, build.level)
+
+            expected = dict(base)
+            for modifier_type in (ModifierType.FLAT, ModifierType.PERCENT):
+                for item in build.items:
+                    for modifier in item.modifiers:
+                        if modifier.modifier_type != modifier_type:
+                            continue
+                        current = expected.get(modifier.stat, 0.0)
+                        if modifier_type == ModifierType.FLAT:
+                            expected[modifier.stat] = current + modifier.value
+                        else:
+                            expected[modifier.stat] = current * (1 + modifier.value / 100)
+
+            result = engine.apply_item_modifiers(base, build.items)
+            for stat, value in expected.items():
+                assert result[stat] == value
+
+class TestLevelTable:
+    """Testes para a tabela de stats base por nível"""
+
+    def test_level_table_matches_formula(self):
+        """A tabela reproduz exatamente base + growth * (level - 1)"""
+        from calc.batch import level_table
+        from calc.models import STAT_INDEX
+
+        for champion in DataLoader().load_champions().values():
+            table = level_table(champion)
+            assert table.shape[0] == 18
+            for level in range(1, 19):
+                multiplier = level - 1
+                row = table[level - 1]
+                assert row[STAT_INDEX[StatType.AD]] == champion.base_ad + (champion.growth_ad * multiplier)
+                assert row[STAT_INDEX[StatType.HP]] == champion.base_hp + (champion.growth_hp * multiplier)
+                assert row[STAT_INDEX[StatType.AS]] == champion.base_as * (1 + (champion.growth_as * multiplier / 100))
+
+    def test_level_table_follows_champion_changes(self):
+        """Cópias com outros stats e edições do campeão recalculam a tabela"""
+        from calc.batch import level_table
+        from calc.models import STAT_INDEX
+
+        loader = DataLoader(use_snapshot=False)
+        champion = loader.get_champion("jinx")
+        original = level_table(champion)[0, STAT_INDEX[StatType.AD]]
+
+        copy = champion.model_copy(update={'base_ad': 1000})
+        assert level_table(copy)[0, STAT_INDEX[StatType.AD]] == 1000
+        assert level_table(champion)[0, STAT_INDEX[StatType.AD]] == original
+
+        champion.growth_hp = 0
+        assert np.all(level_table(champion)[:, STAT_INDEX[StatType.HP]] == champion.base_hp)
+        names, tables = loader.get_level_tables()
+        assert np.all(tables[names.index("jinx"), :, STAT_INDEX[StatType.HP]] == champion.base_hp)
+
+        engine = FormulaEngine()
+        build = Build(name="Copy", champion=copy, level=1)
+        assert engine.calculate_final_stats(build).ad == 1000
+        assert engine.calculate_final_stats_batch(BuildMatrix.from_builds([build])).stats[0, STAT_INDEX[StatType.AD]] == 1000
+
+    def test_level_tables_rebuilt_on_reload(self):
+        """force_reload recria as tabelas dos campeões"""
+        loader = DataLoader()
+        names, tables = loader.get_level_tables()
+
+        assert tables.shape[:2] == (len(names), 18)
+        assert loader.get_level_tables()[1] is tables
+
+        loader.load_champions(force_reload=True)
+        reloaded_names, reloaded = loader.get_level_tables()
+
+        assert reloaded is not tables
+        assert reloaded_names == names
+        assert np.array_equal(reloaded, tables)
@@ -0,0 +1,125 @@
+"""
+🔥 SmashBuilder - Testes do Otimizador por Orçamento 🔥
+Testes da programação dinâmica por gold contra enumeração exaustiva
+"""
+
+from itertools import combinations_with_replacement
+
+import pytest
+
+from calc.models import Build, PRESET_TARGETS
+from calc.formulas import FormulaEngine
+from calc.budget import BudgetSolver
+from data_io.loader import DataLoader
+
+def brute_force_best_by_budget(champion, level, items, runes, target, max_items, budgets):
+    """Melhor DPS por orçamento enumerando todos os multiconjuntos válidos"""
+    top = brute_force_top_by_budget(champion, level, items, runes, target, max_items, budgets, 1)
+    return {budget: values[0] for budget, values in top.items()}
+
+def brute_force_top_by_budget(champion, level, items, runes, target, max_items, budgets, top_k):
+    """Os top_k DPS por orçamento (builds distintas) enumerando todos os multiconjuntos válidos"""
+    engine = FormulaEngine()
+    values = {budget: [] for budget in budgets}
+
+    for size in range(0, max_items + 1):
+        for combo in combinations_with_replacement(range(len(items)), size):
+            chosen = [items[index] for index in combo]
+            if sum(1 for item in chosen if item.mythic) > 1:
+                continue
+            if any(item.unique and combo.count(index) > 1 for index, item in zip(combo, chosen)):
+                continue
+
+            cost = sum(item.cost for item in chosen)
+            if cost > max(budgets):
+                continue
+
+            build = Build.trusted(name="Brute", champion=champion, level=level,
+                                  items=chosen, runes=runes, target=target)
+            dps = engine.calculate_final_stats(build, trusted=True).dps
+            for budget in budgets:
+                if cost <= budget:
+                    values[budget].append(dps)
+
+    return {budget: sorted(found, reverse=True)[:top_k] for budget, found in values.items()}
+
+class TestBudgetSolver:
+    """Testes para o BudgetSolver"""
+
+    def setup_method(self):
+        """Setup para cada teste"""
+        self.loader = DataLoader()
+        self.solver = BudgetSolver()
+        self.items = list(self.loader.load_items().values())
+        self.runes = self.loader.get_rune_preset("ad_carry")
+
+    @pytest.mark.parametrize("champion_name,level", [("jinx", 18), ("garen", 6)])
+    def test_matches_brute_force(self, champion_name, level):
+        """A poda não descarta a melhor build de nenhum orçamento"""
+        champion = self.loader.get_champion(champion_name)
+        items = self.items[:9]
+        target = PRESET_TARGETS["bruiser"]
+        budgets = list(range(0, 10001, 500))
+
+        result = self.solver.solve(champion, level, items, budgets, runes=self.runes, target=target, max_items=3)
+        expected = brute_force_best_by_budget(champion, level, items, self.runes, target, 3, budgets)
+
+        for budget in budgets:
+            assert result['budgets'][budget][0]['dps'] == expected[budget], budget
+
+    def test_top_k_matches_brute_force(self):
+        """Builds diferentes com os mesmos stats de DPS contam separadamente no top_k"""
+        champion = self.loader.get_champion("jinx")
+        items = self.items[:9]
+        target = PRESET_TARGETS["bruiser"]
+        budgets = list(range(0, 10001, 500))
+
+        result = self.solver.solve(champion, 18, items, budgets, runes=self.runes, target=target,
+                                   max_items=3, top_k=3)
+        expected = brute_force_top_by_budget(champion, 18, items, self.runes, target, 3, budgets, 3)
+
+        for budget in budgets:
+            assert [entry['dps'] for entry in result['budgets'][budget]] == expected[budget], budget
+        assert any(len(set(values)) < len(values) for values in expected.values())
+
+    def test_budget_curve_constraints(self):
+        """Cada build respeita orçamento, slots, únicos e mítico"""
+        champion = self.loader.get_champion("vayne")
+        result = self.solver.budget_curve(champion, 18, self.items, target=PRESET_TARGETS["tank"], top_k=5)
+
+        assert sorted(result['budgets']) == list(range(1000, 20001, 250))
+        previous_best = 0.0
+        for budget, entries in result['budgets'].items():
+            assert 1 <= len(entries) <= 5
+            dps_values = [entry['dps'] for entry in entries]
+            assert dps_values == sorted(dps_values, reverse=True)
+            assert dps_values[0] >= previous_best
+            previous_best = dps_values[0]
+
+            for entry in entries:
+                items = entry['build'].items
+                assert entry['cost'] <= budget
+                assert len(items) <= 6
+                assert sum(1 for item in items if item.mythic) <= 1
+                unique_names = [item.name for item in items if item.unique]
+                assert len(unique_names) == len(set(unique_names))
+
+    def test_coarse_gold_step_never_exceeds_budget(self):
+        """Com discretização grossa os custos arredondam para cima"""
+        champion = self.loader.get_champion("jinx")
+        result = self.solver.solve(champion, 18, self.items, [3000, 7000], gold_step=1000)
+
+        assert result['gold_step'] == 1000
+        for budget, entries in result['budgets'].items():
+            assert entries[0]['cost'] <= budget
+
+    def test_invalid_options(self):
+        """Parâmetros inválidos são rejeitados"""
+        champion = self.loader.get_champion("jinx")
+
+        with pytest.raises(ValueError):
+            self.solver.solve(champion, 18, self.items, [])
+        with pytest.raises(ValueError):
+            self.solver.solve(champion, 18, self.items, [5000], max_items=7)
+        with pytest.raises(ValueError):
+            self.solver.solve(champion, 18, self.items, [5000], top_k=0)
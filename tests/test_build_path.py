@@ -0,0 +1,91 @@
+"""
+🔥 SmashBuilder - Testes da Ordem de Compra 🔥
+Testes do planejador de ordem de compra contra permutações exaustivas
+"""
+
+from itertools import permutations
+
+import pytest
+
+from calc.models import Build, IncomeModel, PRESET_TARGETS
+from calc.formulas import FormulaEngine
+from calc.build_path import BuildPathPlanner
+from data_io.loader import DataLoader
+
+def order_area(champion, order, income, target):
+    """Área sob a curva de DPS de uma ordem, checkpoint a checkpoint"""
+    engine = FormulaEngine()
+    area = 0.0
+    for minute in income.checkpoints():
+        gold = income.gold_at(minute)
+        owned, spent = [], 0
+        for item in order:
+            if spent + item.cost > gold:
+                break
+            spent += item.cost
+            owned.append(item)
+
+        build = Build(name="Order", champion=champion, level=income.level_at(minute), items=owned, target=target)
+        area += engine.calculate_final_stats(build).dps * income.step
+    return area
+
+class TestBuildPathPlanner:
+    """Testes para o BuildPathPlanner"""
+
+    def setup_method(self):
+        """Setup para cada teste"""
+        self.loader = DataLoader()
+        self.planner = BuildPathPlanner()
+        self.items = self.loader.load_items()
+        self.income = IncomeModel(gold_per_minute=450, duration=25, step=1)
+        self.target = PRESET_TARGETS["bruiser"]
+
+    def test_plan_order_matches_permutations(self):
+        """A programação dinâmica encontra a melhor permutação"""
+        champion = self.loader.get_champion("jinx")
+        build = [self.items[name] for name in ("kraken slayer", "phantom dancer", "b.f. sword", "dagger")]
+
+        result = self.planner.plan_order(champion, build, self.income, target=self.target)
+        best = max(order_area(champion, order, self.income, self.target) for order in permutations(build))
+
+        assert result['area'] == pytest.approx(best)
+        assert sorted(result['order']) == sorted(item.name for item in build)
+        assert result['inventories_evaluated'] == 2 ** len(build)
+
+    def test_repeated_items_share_inventories(self):
+        """Cópias do mesmo item não geram inventários duplicados"""
+        champion = self.loader.get_champion("vayne")
+        build = [self.items["dagger"]] * 3 + [self.items["b.f. sword"]]
+
+        result = self.planner.plan_order(champion, build, self.income, target=self.target)
+
+        assert result['inventories_evaluated'] == 4 * 2  # 0..3 adagas × com/sem B.F.
+        minutes = [purchase['minute'] for purchase in result['purchases']]
+        assert minutes == sorted(minutes)
+
+    def test_plan_respects_constraints(self):
+        """O beam search respeita slots, únicos e mítico e cabe no gold"""
+        champion = self.loader.get_champion("jinx")
+        candidates = list(self.items.values())
+
+        result = self.planner.plan(champion, candidates, self.income, beam_width=16, target=self.target)
+        chosen = [next(item for item in candidates if item.name == name) for name in result['order']]
+
+        assert 1 <= len(chosen) <= 6
+        assert sum(1 for item in chosen if item.mythic) <= 1
+        unique_names = [item.name for item in chosen if item.unique]
+        assert len(unique_names) == len(set(unique_names))
+        assert sum(item.cost for item in chosen) <= self.income.gold_at(self.income.duration)
+        assert result['area'] == pytest.approx(order_area(champion, chosen, self.income, self.target))
+
+    def test_invalid_options(self):
+        """Parâmetros inválidos são rejeitados"""
+        champion = self.loader.get_champion("jinx")
+        candidates = list(self.items.values())
+
+        with pytest.raises(ValueError):
+            self.planner.plan(champion, candidates, metric="gold")
+        with pytest.raises(ValueError):
+            self.planner.plan(champion, candidates, beam_width=0)
+        with pytest.raises(ValueError):
+            self.planner.plan_order(champion, candidates[:7])
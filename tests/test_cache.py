@@ -0,0 +1,144 @@
+"""
+🔥 SmashBuilder - Testes do Cache de Builds 🔥
+Testes da memoização LRU por hash canônico
+"""
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from calc.models import Build, PRESET_TARGETS, PRESET_RUNES
+from calc.formulas import FormulaEngine
+from calc.cache import BuildCache, CachedFormulaEngine, canonical_build_hash
+from data_io.loader import DataLoader
+
+class TestBuildCache:
+    """Testes para o BuildCache e o CachedFormulaEngine"""
+
+    def setup_method(self):
+        """Setup para cada teste"""
+        self.loader = DataLoader()
+        self.items = self.loader.load_items()
+        self.champion = self.loader.get_champion("jinx")
+
+    def make_build(self, names, level=11, **options):
+        """Build com os itens nomeados"""
+        return Build(name="Cache", champion=self.champion, level=level,
+                     items=[self.items[name] for name in names], target=PRESET_TARGETS["adc"], **options)
+
+    def test_hash_is_canonical(self):
+        """Permutações dos itens têm o mesmo hash; nível, runas, alvo e dados mudam o hash"""
+        build = self.make_build(["kraken slayer", "dagger", "b.f. sword"])
+        permuted = self.make_build(["b.f. sword", "kraken slayer", "dagger"])
+
+        key = canonical_build_hash(build, "v1")
+        assert canonical_build_hash(permuted, "v1") == key
+        assert canonical_build_hash(build, "v2") != key
+        assert canonical_build_hash(self.make_build(["kraken slayer", "dagger", "b.f. sword"], level=12), "v1") != key
+        with_runes = self.make_build(["kraken slayer", "dagger", "b.f. sword"], runes=PRESET_RUNES["ad_carry"])
+        assert canonical_build_hash(with_runes, "v1") != key
+        tank = build.model_copy(update={'target': PRESET_TARGETS["tank"]})
+        assert canonical_build_hash(tank, "v1") != key
+
+    def test_engine_hits_and_matches_uncached(self):
+        """Resultados idênticos ao engine sem cache, com acerto para permutações"""
+        engine = CachedFormulaEngine(maxsize=8)
+        build = self.make_build(["kraken slayer", "dagger"])
+
+        first = engine.calculate_final_stats(build)
+        second = engine.calculate_final_stats(self.make_build(["dagger", "kraken slayer"]))
+
+        assert first == FormulaEngine().calculate_final_stats(build)
+        assert second == first and second is not first
+        assert engine.cache_stats()['hits'] == 1
+        assert engine.cache_stats()['misses'] == 1
+
+    def test_trusted_entries_are_revalidated(self):
+        """Uma entrada calculada com trusted=True não serve a uma chamada validada"""
+        engine = CachedFormulaEngine()
+        build = self.make_build(["b.f. sword"])
+
+        engine.calculate_final_stats(build, trusted=True)
+        engine.calculate_final_stats(build)
+        engine.calculate_final_stats(build, trusted=True)
+
+        assert engine.cache_stats()['misses'] == 2
+        assert engine.cache_stats()['hits'] == 1
+
+    def test_lru_eviction(self):
+        """A entrada menos recente é removida primeiro"""
+        cache = BuildCache(maxsize=2)
+        stats = FormulaEngine().calculate_final_stats(self.make_build([]))
+
+        cache.put("a", stats)
+        cache.put("b", stats)
+        assert cache.get("a") is stats
+        cache.put("c", stats)
+
+        assert "b" not in cache and "a" in cache and "c" in cache
+        assert cache.stats() == {'size': 2, 'maxsize': 2, 'hits': 1, 'misses': 0,
+                                 'evictions': 1, 'hit_rate': 1.0}
+        cache.resize(1)
+        assert len(cache) == 1 and cache.evictions == 2
+        with pytest.raises(ValueError):
+            BuildCache(maxsize=0)
+
+    def test_data_version_follows_files(self, tmp_path):
+        """A versão dos dados muda quando um arquivo de dados muda"""
+        shutil.copytree(self.loader.data_dir, tmp_path / "data")
+        loader = DataLoader(tmp_path / "data")
+        version = loader.data_version()
+
+        assert loader.data_version() == version
+        items_file = tmp_path / "data" / "items.json"
+        items_file.write_text(items_file.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+        assert loader.data_version() != version
+
+    def test_hash_follows_content(self, tmp_path):
+        """Itens e campeões com o mesmo nome e outro conteúdo têm outra chave"""
+        build = self.make_build(["dagger", "b.f. sword"])
+        key = canonical_build_hash(build)
+
+        stronger = self.items["b.f. sword"].model_copy(deep=True)
+        stronger.modifiers[0].value += 5
+        assert canonical_build_hash(build.model_copy(update={'items': [self.items["dagger"], stronger]})) != key
+        buffed = self.champion.model_copy(update={'base_ad': self.champion.base_ad + 1})
+        assert canonical_build_hash(build.model_copy(update={'champion': buffed})) != key
+
+        # Substituição pelo loader sem gravar o arquivo (mesma versão dos dados)
+        shutil.copytree(self.loader.data_dir, tmp_path / "data")
+        loader = DataLoader(tmp_path / "data", snapshot_dir=tmp_path / "snapshots")
+        engine = CachedFormulaEngine(data_version=loader.data_version)
+        before = engine.calculate_final_stats(self.make_build(["b.f. sword"]))
+        loader.add_item(stronger, save=False)
+        after = engine.calculate_final_stats(
+            self.make_build([]).model_copy(update={'items': [loader.get_item("b.f. sword")]})
+        )
+        assert after != before
+        assert after == FormulaEngine().calculate_final_stats(
+            self.make_build([]).model_copy(update={'items': [stronger]})
+        )
+
+    def test_callable_data_version(self, tmp_path):
+        """Com uma função, a versão é consultada a cada cálculo"""
+        shutil.copytree(self.loader.data_dir, tmp_path / "data")
+        loader = DataLoader(tmp_path / "data", snapshot_dir=tmp_path / "snapshots")
+        engine = CachedFormulaEngine(data_version=loader.data_version)
+        build = self.make_build(["dagger"])
+
+        engine.calculate_final_stats(build)
+        engine.calculate_final_stats(build)
+        items_file = tmp_path / "data" / "items.json"
+        items_file.write_text(items_file.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+        engine.calculate_final_stats(build)
+
+        assert engine.data_version == loader.data_version()
+        assert engine.cache_stats()['hits'] == 1 and engine.cache_stats()['misses'] == 2
+
+    def test_calc_does_not_load_data(self):
+        """Importar o cache não importa data_io nem monta o DataLoader global"""
+        code = "import sys, calc.cache; assert 'data_io.loader' not in sys.modules"
+        subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent.parent, check=True)
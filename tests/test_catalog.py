@@ -0,0 +1,88 @@
+"""
+🔥 SmashBuilder - Testes do Catálogo Colunar 🔥
+Testes da visão colunar dos itens e do seu uso nas análises
+"""
+
+import numpy as np
+import pytest
+
+from calc.models import Build, StatType, ModifierType, PRESET_TARGETS
+from calc.catalog import ItemCatalog, STAT_COLUMNS, column_name
+from calc.gold_values import GoldValueSolver, design_matrix
+from calc.optimizer import BuildOptimizer
+from calc.recommender import UpgradeRecommender
+from data_io.loader import DataLoader
+
+class TestItemCatalog:
+    """Testes para o ItemCatalog"""
+
+    def setup_method(self):
+        """Setup para cada teste"""
+        self.loader = DataLoader()
+        self.items = list(self.loader.load_items().values())
+        self.catalog = self.loader.get_item_catalog()
+
+    def test_columns_match_items(self):
+        """Cada linha da tabela reproduz o item correspondente"""
+        table = self.catalog.table
+        assert len(self.catalog) == len(self.items)
+        assert table.dtype.names[:5] == ('id', 'name', 'cost', 'unique', 'mythic')
+        assert len(table.dtype.names) == 5 + len(STAT_COLUMNS)
+
+        for index, item in enumerate(self.items):
+            row = table[index]
+            assert row['id'] == index and row['name'] == item.name and row['cost'] == item.cost
+            assert row['unique'] == item.unique and row['mythic'] == item.mythic
+            assert self.catalog.id_of(item.name.upper()) == index
+
+            expected = {}
+            for modifier in item.modifiers:
+                key = column_name(modifier.stat, modifier.modifier_type)
+                expected[key] = expected.get(key, 0) + modifier.value
+            for stat, modifier_type in STAT_COLUMNS:
+                name = column_name(stat, modifier_type)
+                assert row[name] == pytest.approx(expected.get(name, 0))
+
+    def test_shared_per_load_and_read_only(self):
+        """O catálogo é montado uma vez por carga e não pode ser alterado"""
+        assert self.loader.get_item_catalog() is self.catalog
+        with pytest.raises(ValueError):
+            self.catalog.table['cost'][0] = 1
+        with pytest.raises(ValueError):
+            self.catalog.flat[0, 0] = 1
+
+        self.loader.load_items(force_reload=True)
+        assert self.loader.get_item_catalog() is not self.catalog
+
+    def test_vectorized_queries(self):
+        """Filtros e pontuações são expressões sobre colunas"""
+        mask = (self.catalog.column(StatType.AD) >= 30) & (self.catalog.cost <= 3000)
+        expected = [item for item in self.items
+                    if item.cost <= 3000 and any(m.stat == StatType.AD and m.modifier_type == ModifierType.FLAT
+                                                 and m.value >= 30 for m in item.modifiers)]
+        assert self.catalog.select(mask) == expected
+        assert self.catalog.select([0, 2]) == [self.items[0], self.items[2]]
+
+        weights = {(StatType.AD, ModifierType.FLAT): 35, (StatType.AS, ModifierType.PERCENT): 25}
+        scores = self.catalog.score(weights)
+        assert scores.shape == (len(self.items),)
+        assert scores[self.catalog.id_of("Phantom Dancer")] == pytest.approx(20 * 35 + 25 * 25)
+
+    def test_analysis_paths_accept_catalog(self):
+        """Gold values, otimizador e recomendador dão o mesmo resultado com o catálogo"""
+        assert np.array_equal(design_matrix(self.catalog), design_matrix(self.items))
+        solver = GoldValueSolver()
+        assert solver.catalog_efficiency(self.catalog) == solver.catalog_efficiency(self.items)
+
+        champion = self.loader.get_champion("jinx")
+        optimizer = BuildOptimizer()
+        candidates = self.items[:8]
+        from_list = optimizer.optimize(champion, 11, candidates, max_items=2, top_k=3)
+        from_catalog = optimizer.optimize(champion, 11, ItemCatalog(candidates), max_items=2, top_k=3)
+        assert [r['items'] for r in from_list['results']] == [r['items'] for r in from_catalog['results']]
+
+        build = Build(name="Base", champion=champion, level=11, items=[self.items[0]],
+                      target=PRESET_TARGETS["adc"])
+        recommender = UpgradeRecommender()
+        assert recommender.recommend(build, self.catalog, combo_size=2)['recommendations'] == \
+            recommender.recommend(build, self.items, combo_size=2)['recommendations']
@@ -0,0 +1,99 @@
+"""
+🔥 SmashBuilder - Testes do Simulador de Combate 🔥
+Testes da simulação por eventos contra os valores analíticos
+"""
+
+import math
+
+import pytest
+
+from calc.models import FinalStats, Target, PRESET_TARGETS
+from calc.formulas import FormulaEngine
+from calc.combat import CombatSimulator
+
+def make_stats(ad: float = 200, as_: float = 1.0, crit_chance: float = 0, crit_damage: float = 200) -> FinalStats:
+    """Stats finais de um atacante genérico"""
+    return FinalStats(level=18, ad=ad, ap=0, as_=as_, crit_chance=crit_chance, crit_damage=crit_damage,
+                      hp=2000, mana=0, armor=50, mr=30, ms=330)
+
+class TestCombatSimulator:
+    """Testes para o CombatSimulator"""
+
+    def setup_method(self):
+        """Setup para cada teste"""
+        self.engine = FormulaEngine()
+        self.simulator = CombatSimulator(self.engine, windup=0.25)
+
+    def test_single_attacker_timing_and_overkill(self):
+        """TTK inclui a animação do primeiro golpe e o último golpe registra o excesso"""
+        stats = make_stats(ad=200, as_=1.25)
+        target = PRESET_TARGETS["bruiser"]
+
+        result = self.simulator.simulate(stats, target)
+
+        damage = 200 * (1 - self.engine.calculate_damage_reduction(target.armor))
+        attacks = math.ceil(target.hp / damage)
+        period = 1 / 1.25
+        assert result['hits'] == attacks
+        assert result['time_to_kill'] == pytest.approx((attacks - 1) * period + 0.25 * period, abs=1e-4)
+        assert result['overkill'] == pytest.approx(attacks * damage - target.hp, abs=0.01)
+
+    def test_attack_speed_cap(self):
+        """Attack speed acima do máximo não acelera os ataques"""
+        target = PRESET_TARGETS["tank"]
+        capped = self.simulator.simulate(make_stats(as_=self.engine.MAX_ATTACK_SPEED), target)
+        over = self.simulator.simulate(make_stats(as_=3.0), target)
+
+        assert over['time_to_kill'] == capped['time_to_kill']
+
+    def test_multiple_attackers_and_timeout(self):
+        """Mais atacantes matam antes; sem tempo suficiente o alvo sobrevive"""
+        target = PRESET_TARGETS["tank"]
+        solo = self.simulator.simulate(make_stats(), target)
+        duo = self.simulator.simulate([make_stats(), make_stats(as_=0.8)], target, record_hits=True)
+
+        assert duo['time_to_kill'] < solo['time_to_kill']
+        assert {hit['attacker'] for hit in duo['hits_log']} == {0, 1}
+
+        short = CombatSimulator(self.engine, max_time=1.0).simulate(make_stats(), target)
+        assert not short['killed']
+        assert short['time_to_kill'] == float('inf')
+
+    def test_random_crits_are_seeded(self):
+        """Críticos sorteados são reproduzíveis pela seed"""
+        stats = make_stats(crit_chance=50)
+        target = Target(name="Test", hp=3000, armor=40)
+
+        first = self.simulator.simulate_many(stats, target, duels=300, seed=5)
+        second = self.simulator.simulate_many(stats, target, duels=300, seed=5)
+        expected = self.simulator.simulate(stats, target)
+
+        assert first == second
+        assert first['kill_rate'] == 1.0
+        assert first['ttk_percentiles'][5] <= first['ttk_percentiles'][95]
+        assert first['mean_ttk'] == pytest.approx(expected['time_to_kill'], abs=1.0)
+
+    def test_random_crits_use_numpy_generator(self):
+        """Sorteios vêm de np.random.Generator: seed, rng e simulate_many concordam"""
+        import numpy as np
+
+        stats = [make_stats(crit_chance=40), make_stats(crit_chance=70, as_=1.6)]
+        target = Target(name="Test", hp=4000, armor=40)
+
+        single = self.simulator.simulate(stats, target, crit_mode="random", seed=11)
+        assert single == self.simulator.simulate(stats, target, crit_mode="random", rng=np.random.default_rng(11))
+        assert 0 < single['crits'] < single['hits']
+
+        many = self.simulator.simulate_many(stats, target, duels=1, seed=11)
+        assert many['mean_ttk'] == single['time_to_kill']
+        assert many['mean_overkill'] == single['overkill']
+
+    def test_presets_and_invalid_options(self):
+        """Duelos contra todos os presets; parâmetros inválidos são rejeitados"""
+        results = self.simulator.simulate_presets(make_stats())
+        assert set(results) == set(PRESET_TARGETS)
+
+        with pytest.raises(ValueError):
+            self.simulator.simulate(make_stats(), PRESET_TARGETS["tank"], crit_mode="always")
+        with pytest.raises(ValueError):
+            CombatSimulator(windup=1.0)
@@ -0,0 +1,122 @@
+"""
+🔥 SmashBuilder - Testes do Dano Misto 🔥
+Testes do kernel de dano físico/mágico com penetração
+"""
+
+import numpy as np
+import pytest
+
+from calc.models import (
+    Build, DamageProfile, Item, ItemModifier, StatType, ModifierType,
+    PRESET_TARGETS, PRESET_RUNES, STAT_INDEX
+)
+from calc.formulas import FormulaEngine
+from calc.damage import DamageKernel, DAMAGE_METRICS
+from calc.dps import DPSCalculator
+from data_io.loader import DataLoader
+
+class TestDamageKernel:
+    """Testes para o DamageKernel"""
+
+    def setup_method(self):
+        """Setup para cada teste"""
+        self.loader = DataLoader()
+        self.engine = FormulaEngine()
+        self.kernel = DamageKernel(self.engine)
+        self.items = self.loader.load_items()
+        self.champion = self.loader.get_champion("jinx")
+        self.targets = list(PRESET_TARGETS.values())
+
+    def make_build(self, name, items, level=18, runes=None):
+        return Build(name=name, champion=self.champion, level=level, items=items, runes=runes)
+
+    def test_basic_attack_matches_scalar_dps(self):
+        """Sem penetração, o perfil basic_attack reproduz calculate_dps bit a bit"""
+        builds = [
+            self.make_build("Crit", [self.items["kraken slayer"], self.items["infinity edge"]],
+                            runes=PRESET_RUNES["ad_carry"]),
+            self.make_build("Mage", [self.items["rabadon's deathcap"]], level=6),
+        ]
+        result = self.kernel.evaluate(builds, self.targets)
+
+        assert result.shape == (2, len(self.targets))
+        assert np.all(result.magic_dps == 0)
+        for b, build in enumerate(builds):
+            stats = self.engine.calculate_final_stats(build)
+            for t, target in enumerate(self.targets):
+                assert result.dps[b, t] == self.engine.calculate_dps(stats, target)
+                assert result.ttk[b, t] == self.engine.calculate_ttk(stats, target)
+
+    def test_penetration_reduces_resistances(self):
+        """Letalidade e penetração mágica reduzem armor/MR até no mínimo 0"""
+        stats = np.zeros((1, len(STAT_INDEX)))
+        stats[0, STAT_INDEX[StatType.AD]] = 100
+        stats[0, STAT_INDEX[StatType.AS]] = 1
+        stats[0, STAT_INDEX[StatType.CRIT_DAMAGE]] = 200
+        stats[0, STAT_INDEX[StatType.AP]] = 100
+        stats[0, STAT_INDEX[StatType.LETHALITY]] = 20
+        stats[0, STAT_INDEX[StatType.MAGIC_PEN]] = 50
+        profile = DamageProfile(name="Teste", ability_damage=100, ability_ap_ratio=1, casts_per_second=1)
+
+        damage = self.kernel.damage_batch(stats, np.array([1000.0]), np.array([120.0]), np.array([40.0]), profile)
+
+        assert damage['physical_dps'][0] == pytest.approx(100 * (1 - 100 / 200))
+        assert damage['magic_dps'][0] == pytest.approx(200)  # MR 40 - 50 -> 0
+        assert damage['dps'][0] == pytest.approx(250)
+        assert damage['ttk'][0] == pytest.approx(4)
+
+    def test_penetration_items_change_damage(self):
+        """Itens com letalidade/penetração aumentam o dano contra alvos com resistência"""
+        piercing = Item(name="Piercing", cost=3000, modifiers=[
+            ItemModifier(stat=StatType.AP, value=80, modifier_type=ModifierType.FLAT),
+            ItemModifier(stat=StatType.LETHALITY, value=18, modifier_type=ModifierType.FLAT),
+            ItemModifier(stat=StatType.MAGIC_PEN, value=18, modifier_type=ModifierType.FLAT),
+        ])
+        plain = Item(name="Plain", cost=3000, modifiers=[
+            ItemModifier(stat=StatType.AP, value=80, modifier_type=ModifierType.FLAT),
+        ])
+        result = self.kernel.evaluate([self.make_build("Plain", [plain]), self.make_build("Piercing", [piercing])],
+                                      [PRESET_TARGETS["tank"], PRESET_TARGETS["dummy"]], profile="mage")
+
+        assert result.physical_dps[1, 0] > result.physical_dps[0, 0]
+        assert result.magic_dps[1, 0] > result.magic_dps[0, 0]
+        # Alvo sem resistência: penetração não tem efeito
+        assert result.dps[1, 1] == result.dps[0, 1]
+
+    def test_mage_template(self):
+        """O template burst_mage produz dano mágico com o perfil do template"""
+        build = self.loader.get_build_template("burst_mage", self.champion)
+        result = self.kernel.evaluate([build], [build.target],
+                                      profile=self.loader.get_template_damage_profile("burst_mage"))
+
+        assert result.profile == "Mago"
+        assert result.magic_dps[0, 0] > result.physical_dps[0, 0] > 0
+        assert result.dps[0, 0] > self.engine.calculate_dps(self.engine.calculate_final_stats(build), build.target)
+        assert [row['build'] for row in result.rows()] == [build.name]
+        assert set(DAMAGE_METRICS) <= set(result.rows()[0])
+
+    def test_template_profile_in_dps_analysis(self):
+        """calculate_mixed_damage usa o perfil do template; sem perfil, basic_attack"""
+        assert self.loader.get_template_damage_profile("on_hit_adc").name == "On-Hit"
+        assert self.loader.get_template_damage_profile("inexistente") is None
+
+        build = self.loader.get_build_template("crit_adc", self.champion)
+        profile = self.loader.get_template_damage_profile("crit_adc")
+        result = DPSCalculator().calculate_mixed_damage(build, profile, [build.target, PRESET_TARGETS["tank"]])
+
+        assert result['profile'] == profile.name
+        assert list(result['targets']) == [build.target.name, PRESET_TARGETS["tank"].name]
+        # basic_attack: mesmo DPS do cálculo escalar
+        stats = self.engine.calculate_final_stats(build)
+        assert result['targets'][build.target.name]['dps'] == stats.dps
+        assert result['targets'][build.target.name]['magic_dps'] == 0
+
+    def test_invalid_inputs(self):
+        """Perfis e métricas inválidos e lista de alvos vazia"""
+        build = self.make_build("Empty", [])
+        with pytest.raises(ValueError):
+            self.kernel.evaluate([build], [], profile="mage")
+        with pytest.raises(ValueError):
+            self.kernel.evaluate([build], self.targets, profile="inexistente")
+        with pytest.raises(ValueError):
+            self.kernel.evaluate([build], self.targets).metric("hp")
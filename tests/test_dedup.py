@@ -0,0 +1,89 @@
+"""
+🔥 SmashBuilder - Testes da Deduplicação 🔥
+Testes do agrupamento de builds com stats finais idênticos
+"""
+
+import numpy as np
+
+from calc.models import Build, Item, StatType, PRESET_TARGETS
+from calc.formulas import FormulaEngine
+from calc.batch import BuildMatrix
+from calc.dedup import group_rows
+from calc.distribution import kill_distribution, kill_distribution_from_stats
+from calc.pareto import ParetoAnalyzer
+from calc.optimizer import BuildOptimizer
+from data_io.loader import DataLoader
+
+class TestDedup:
+    """Testes para group_rows e os pontos de uso da deduplicação"""
+
+    def setup_method(self):
+        """Setup para cada teste"""
+        self.loader = DataLoader()
+        self.engine = FormulaEngine()
+        self.items = self.loader.load_items()
+        self.champion = self.loader.get_champion("jinx")
+
+    def make_builds(self):
+        """Builds com permutações (equivalentes) e variações de nível"""
+        orders = [["kraken slayer", "dagger"], ["dagger", "kraken slayer"], ["b.f. sword"], ["dagger"]]
+        return [
+            Build(name=f"{' + '.join(order)} {level}", champion=self.champion, level=level,
+                  items=[self.items[name] for name in order], target=PRESET_TARGETS["adc"])
+            for level in (6, 12) for order in orders
+        ]
+
+    def test_group_rows(self):
+        """Grupos na ordem de aparição; -0.0 == 0.0 e NaN == NaN"""
+        values = np.array([[1.0, 0.0], [2.0, np.nan], [1.0, -0.0], [2.0, np.nan], [3.0, 1.0]])
+        groups = group_rows(values)
+
+        assert len(groups) == 3 and groups.duplicates == 2
+        assert groups.first.tolist() == [0, 1, 4]
+        assert groups.inverse.tolist() == [0, 1, 0, 1, 2]
+        assert [members.tolist() for members in groups.members()] == [[0, 2], [1, 3], [4]]
+        assert np.array_equal(groups.expand(groups.unique(values[:, 0])), values[:, 0])
+
+    def test_batch_dedup_matches(self):
+        """Métricas deduplicadas são idênticas às calculadas linha a linha"""
+        matrix = BuildMatrix.from_builds(self.make_builds())
+        plain = self.engine.calculate_final_stats_batch(matrix)
+        deduped = self.engine.calculate_final_stats_batch(matrix, dedup=True)
+
+        assert plain.groups is None
+        assert len(deduped.groups) == 6
+        for name in ("dps", "ttk", "effective_hp_physical", "effective_hp_magical"):
+            assert np.array_equal(getattr(plain, name), getattr(deduped, name))
+
+    def test_kill_distribution_shares_rows(self):
+        """A distribuição de abate de builds equivalentes é calculada uma vez e fica igual"""
+        batch = self.engine.calculate_final_stats_batch(BuildMatrix.from_builds(self.make_builds()))
+        size = len(batch)
+        hp, armor = np.full(size, 2000.0), np.full(size, 70.0)
+
+        shared = kill_distribution_from_stats(batch.stats, hp, armor, self.engine)
+
+        ad = batch.column(StatType.AD)
+        reduction = self.engine.calculate_damage_reduction_batch(armor)
+        damage = ad * (1 - reduction)
+        bonus = ad * batch.column(StatType.CRIT_DAMAGE) / 100 * (1 - reduction) - damage
+        direct = kill_distribution(damage, bonus, batch.column(StatType.CRIT_CHANCE) / 100,
+                                   batch.column(StatType.AS), hp)
+        assert np.allclose(shared.expected_ttk(), direct.expected_ttk())
+
+    def test_frontier_and_optimizer_dedup(self):
+        """Fronteira e otimizador devolvem uma linha por grupo equivalente"""
+        builds = self.make_builds()
+        frontier = ParetoAnalyzer(self.engine).frontier(builds, dedup=True)
+        plain = ParetoAnalyzer(self.engine).frontier(builds)
+
+        assert len(frontier) < len(plain)
+        assert sum(1 + len(row['equivalent_builds']) for row in frontier) == len(plain)
+
+        sword = self.items["b.f. sword"]
+        clone = Item(name="B.F. Sword Copy", modifiers=sword.modifiers, cost=sword.cost)
+        result = BuildOptimizer(self.engine).optimize(self.champion, 11, [sword, clone], max_items=1,
+                                                      top_k=2, dedup=True)
+        assert len(result['results']) == 1
+        assert result['duplicates_removed'] == 1
+        assert len(result['results'][0]['equivalent_builds']) == 1
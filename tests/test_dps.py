@@ -0,0 +1,199 @@
+"""
+🔥 SmashBuilder - Testes de DPS 🔥
+Testes da simulação de Monte Carlo e da distribuição exata de abate
+"""
+
+from itertools import product
+
+import numpy as np
+import pytest
+
+from calc.models import FinalStats, Target, StatType, STAT_INDEX, PRESET_TARGETS
+from calc.formulas import FormulaEngine
+from calc.batch import BuildMatrix
+from calc.dps import DPSCalculator, critical_hits_needed
+from calc.distribution import kill_distribution, kill_distribution_from_stats, MAX_KILL_ATTACKS
+from tests.test_batch import random_builds
+
+def make_stats(crit_chance: float, crit_damage: float = 200) -> FinalStats:
+    """Stats finais de um atirador genérico"""
+    return FinalStats(level=18, ad=250, ap=0, as_=1.8, crit_chance=crit_chance, crit_damage=crit_damage,
+                      hp=2000, mana=0, armor=50, mr=30, ms=330)
+
+class TestMonteCarlo:
+    """Testes para DPSCalculator.simulate_burst_and_ttk"""
+
+    def setup_method(self):
+        """Setup para cada teste"""
+        self.calculator = DPSCalculator()
+        self.target = PRESET_TARGETS["bruiser"]
+
+    def test_seed_reproduces_results(self):
+        """A mesma seed gera as mesmas distribuições"""
+        stats = make_stats(40)
+
+        first = self.calculator.simulate_burst_and_ttk(stats, self.target, trials=20000, seed=3)
+        second = self.calculator.simulate_burst_and_ttk(stats, self.target, trials=20000, seed=3)
+
+        assert first == second
+
+    def test_without_crit_matches_deterministic(self):
+        """Sem chance de crítico a simulação é determinística"""
+        stats = make_stats(0)
+        burst = self.calculator.calculate_burst_damage(stats, self.target, num_attacks=4)
+        basic = self.calculator.calculate_basic_attack_dps(stats, self.target)
+
+        result = self.calculator.simulate_burst_and_ttk(stats, self.target, num_attacks=4, trials=1000, seed=1)
+
+        assert result['burst']['mean'] == burst['total_burst_damage']
+        assert result['burst']['std'] == 0
+        assert result['ttk']['attacks_mean'] == basic['attacks_to_kill']
+
+    def test_means_match_expectation(self):
+        """Médias convergem para os valores esperados"""
+        stats = make_stats(50, crit_damage=225)
+        result = self.calculator.simulate_burst_and_ttk(stats, self.target, num_attacks=3, trials=100000, seed=7)
+
+        basic = self.calculator.calculate_basic_attack_dps(stats, self.target)
+        assert result['burst']['mean'] == pytest.approx(3 * basic['avg_damage_per_attack'] * (1 - basic['armor_reduction'] / 100), rel=0.01)
+        assert result['burst']['critical_attacks_mean'] == pytest.approx(1.5, rel=0.01)
+
+        probabilities = list(result['kill_probability'].values())
+        assert probabilities == sorted(probabilities)
+        assert result['ttk']['percentiles'][5] <= result['ttk']['percentiles'][95]
+
+    def test_full_crit_kills_in_minimum_attacks(self):
+        """Com 100% de crítico todo ataque é crítico"""
+        stats = make_stats(100, crit_damage=250)
+        result = self.calculator.simulate_burst_and_ttk(stats, self.target, trials=5000, seed=2)
+
+        assert result['burst']['critical_attacks_mean'] == 3
+        assert result['ttk']['std'] == 0
+
+    def test_critical_hits_needed(self):
+        """Críticos mínimos por número de ataques"""
+        needed = critical_hits_needed(damage=100, crit_bonus=100, target_hp=500, max_attacks=5)
+        assert needed.tolist() == [4, 3, 2, 1, 0]
+
+        assert np.all(critical_hits_needed(100, 0, 300, 3) == [4, 4, 0])
+
+    def test_attacks_capped_like_exact_distribution(self):
+        """Tentativas que não matam em MAX_KILL_ATTACKS ataques ficam com TTK infinito"""
+        stats = FinalStats(level=1, ad=1, ap=0, as_=1.0, crit_chance=50, crit_damage=200,
+                           hp=500, mana=0, armor=0, mr=0, ms=330)
+        target = Target(name="Tanque", hp=1500)
+        times = (900.0, 1000.0)
+
+        simulated = self.calculator.simulate_burst_and_ttk(stats, target, trials=20000, seed=5, kill_times=times)
+        exact = self.calculator.calculate_kill_distribution(stats, target, kill_times=times)
+
+        assert simulated['ttk']['mean'] == exact['expected_ttk'] == float('inf')
+        assert simulated['ttk']['max'] == float('inf')
+        assert simulated['ttk']['min'] <= MAX_KILL_ATTACKS
+        for time in times:
+            assert simulated['kill_probability'][time] == pytest.approx(exact['kill_probability'][time], abs=0.01)
+
+        hopeless = self.calculator.simulate_burst_and_ttk(stats, target.model_copy(update={'hp': 1e7}), trials=1000)
+        assert hopeless['ttk']['min'] == float('inf')
+        assert all(value == float('inf') for value in hopeless['ttk']['percentiles'].values())
+        assert hopeless['kill_probability'][10.0] == 0
+
+    def test_invalid_trials(self):
+        """Número de tentativas deve ser positivo"""
+        with pytest.raises(ValueError):
+            self.calculator.simulate_burst_and_ttk(make_stats(20), self.target, trials=0)
+
+class TestKillDistribution:
+    """Testes para a distribuição exata de abate"""
+
+    def setup_method(self):
+        """Setup para cada teste"""
+        self.calculator = DPSCalculator()
+
+    def test_matches_sequence_enumeration(self):
+        """A cdf coincide com a enumeração de todas as sequências de críticos"""
+        damage, crit_bonus, crit_chance, hp = 100.0, 80.0, 0.3, 560.0
+        distribution = kill_distribution(np.array([damage]), np.array([crit_bonus]), np.array([crit_chance]),
+                                         np.array([1.0]), np.array([hp]))
+        attacks = distribution.cdf.shape[1]
+
+        expected = np.zeros(attacks)
+        for sequence in product([False, True], repeat=attacks):
+            probability = np.prod([crit_chance if crit else 1 - crit_chance for crit in sequence])
+            total = 0.0
+            for index, crit in enumerate(sequence):
+                total += damage + (crit_bonus if crit else 0)
+                if total >= hp:
+                    expected[index] += probability
+                    break
+
+        assert np.allclose(distribution.pmf[0], expected)
+
+    def test_mixed_lengths_match_single_rows(self):
+        """Builds com abates curtos e longos no mesmo lote dão a cdf de cada uma isolada"""
+        damage = np.array([400.0, 3.0, 0.0, 120.0])
+        crit_bonus = np.array([300.0, 2.0, 50.0, 0.0])
+        crit_chance = np.array([0.5, 0.25, 1.0, 0.7])
+        hp = np.full(4, 2400.0)
+        distribution = kill_distribution(damage, crit_bonus, crit_chance, np.ones(4), hp)
+
+        assert distribution.cdf.shape == (4, 800)
+        for row in range(4):
+            single = kill_distribution(damage[row:row + 1], crit_bonus[row:row + 1], crit_chance[row:row + 1],
+                                       np.ones(1), hp[row:row + 1])
+            width = single.cdf.shape[1]
+            assert np.array_equal(distribution.cdf[row, :width], single.cdf[0])
+            assert np.all(distribution.cdf[row, width:] == (1.0 if damage[row] > 0 else 0.0))
+
+    def test_width_capped(self):
+        """Dano baixo contra HP alto é truncado em MAX_KILL_ATTACKS sem afetar as outras builds"""
+        damage = np.array([1.0, 2.0, 100.0])
+        crit_bonus = np.array([0.0, 1e6, 80.0])
+        crit_chance = np.array([0.5, 0.01, 0.3])
+        hp = np.array([1e7, 1e6, 560.0])
+        distribution = kill_distribution(damage, crit_bonus, crit_chance, np.ones(3), hp)
+
+        assert distribution.cdf.shape == (3, MAX_KILL_ATTACKS)
+        assert np.all(distribution.cdf[0] == 0) and not distribution.kills[0]
+        # Um crítico basta: P(N <= n) = 1 - 0.99^n, ainda abaixo de 1 no fim
+        n = np.arange(1, MAX_KILL_ATTACKS + 1)
+        assert np.allclose(distribution.cdf[1], 1 - 0.99 ** n)
+        assert np.isinf(distribution.expected_ttk()[1])
+        assert distribution.quantiles((0.5,))[1, 0] == np.ceil(np.log(0.5) / np.log(0.99))
+
+        single = kill_distribution(damage[2:], crit_bonus[2:], crit_chance[2:], np.ones(1), hp[2:])
+        width = single.cdf.shape[1]
+        assert np.array_equal(distribution.cdf[2, :width], single.cdf[0])
+        assert distribution.expected_ttk()[2] == single.expected_ttk()[0]
+
+    def test_matches_monte_carlo(self):
+        """Esperança e P(abate até t) batem com a simulação"""
+        stats = make_stats(60, crit_damage=225)
+        target = PRESET_TARGETS["adc"]
+
+        exact = self.calculator.calculate_kill_distribution(stats, target, kill_times=(3.0, 5.0))
+        simulated = self.calculator.simulate_burst_and_ttk(stats, target, trials=100000, seed=4,
+                                                           kill_times=(3.0, 5.0))
+
+        assert exact['expected_ttk'] == pytest.approx(simulated['ttk']['mean'], abs=0.02)
+        for time in (3.0, 5.0):
+            assert exact['kill_probability'][time] == pytest.approx(simulated['kill_probability'][time], abs=0.01)
+        assert sum(exact['attacks_pmf'].values()) == pytest.approx(1.0)
+
+    def test_batch_from_stats(self):
+        """Uma linha por build do lote; builds sem dano nunca matam"""
+        builds = random_builds(40, seed=9)
+        engine = FormulaEngine()
+        batch = engine.calculate_final_stats_batch(BuildMatrix.from_builds(builds))
+        stats = batch.stats.copy()
+        stats[0, STAT_INDEX[StatType.AD]] = 0
+
+        hp = np.full(len(builds), 2500.0)
+        armor = np.full(len(builds), 60.0)
+        distribution = kill_distribution_from_stats(stats, hp, armor, engine)
+
+        assert len(distribution) == len(builds)
+        assert np.isinf(distribution.expected_ttk()[0])
+        assert np.all(np.isfinite(distribution.expected_ttk()[1:]))
+        quantiles = distribution.quantiles((0.1, 0.5, 0.9))
+        assert np.all(np.diff(quantiles[1:], axis=1) >= 0)
@@ -5,7 +5,7 @@ Testes unitários para o engine de fórmulas
 
 import pytest
 from calc.models import ChampionStats, Item, ItemModifier, StatType, ModifierType, Build, Target
-from calc.formulas import FormulaEngine
+from calc.formulas import FormulaEngine, SENSITIVITY_STATS, SENSITIVITY_MIXED_STATS
 
 class TestFormulaEngine:
     """Testes para o engine de fórmulas"""
@@ -187,5 +187,138 @@ class TestFormulaEngine:
         assert final_stats.dps is not None
         assert final_stats.dps > 0
 
+    def test_stat_vector_pipeline_in_place(self):
+        """Os estágios do pipeline operam in place sobre StatVector"""
+        from calc.models import StatVector
+
+        stats = self.engine.calculate_base_stats_at_level(self.test_champion, 1)
+        assert isinstance(stats, StatVector)
+
+        result = self.engine.apply_item_modifiers(stats, [self.test_item])
+        assert result is stats
+        assert stats[StatType.AD] == 99  # 59 + 40
+
+        capped = self.engine.apply_caps_and_limits(stats)
+        assert capped is stats
+
+    def test_stat_vector_dict_view(self):
+        """StatVector mantém a interface de dict por compatibilidade"""
+        from calc.models import StatVector
+
+        vector = StatVector.from_dict({StatType.AD: 100, StatType.AS: 1.0})
+
+        assert vector.get(StatType.AD) == 100
+        assert vector[StatType.HP] == 0
+        assert StatType.MAGIC_PEN in vector
+        assert vector.to_dict()[StatType.AS] == 1.0
+        assert vector == dict(vector.items())
+
+        copy = vector.copy()
+        copy[StatType.AD] = 50
+        assert vector[StatType.AD] == 100
+
+    def test_trusted_final_stats_match_validated(self):
+        """O caminho sem validação produz os mesmos valores"""
+        build = Build.trusted(
+            name="Trusted Build",
+            champion=self.test_champion,
+            level=11,
+            items=[self.test_item],
+            target=self.test_target
+        )
+
+        trusted = self.engine.calculate_final_stats(build, trusted=True)
+        validated = self.engine.calculate_final_stats(build)
+
+        assert trusted.model_dump() == validated.model_dump()
+        assert trusted.validated().model_dump() == validated.model_dump()
+
+    def test_trusted_build_validated_on_demand(self):
+        """validated() reaplica as regras, incluindo a de item mítico"""
+        mythic = Item(name="Mythic", modifiers=[], cost=3000, mythic=True)
+        build = Build.trusted(
+            name="Two Mythics",
+            champion=self.test_champion,
+            level=1,
+            items=[mythic, mythic]
+        )
+
+        with pytest.raises(ValueError):
+            build.validated()
+
+    def test_stat_sensitivity_table(self):
+        """Ganhos marginais por stat para várias builds em um lote"""
+        target = Target(name="Sensitivity", hp=2500, armor=60)
+        builds = [
+            Build(name=f"Level {level}", champion=self.test_champion, level=level,
+                  items=[self.test_item], target=target)
+            for level in (1, 9, 18)
+        ]
+
+        table = self.engine.calculate_stat_sensitivity(builds)
+        assert len(table) == len(builds) * len(SENSITIVITY_STATS)
+        assert {row['stat'] for row in table} == {stat.value for stat in SENSITIVITY_STATS}
+
+        rows = {(row['build'], row['stat']): row for row in table}
+        final = self.engine.calculate_final_stats(builds[0])
+        reduction = self.engine.calculate_damage_reduction(target.armor)
+        crit_factor = 1 + (final.crit_chance / 100) * (final.crit_damage / 100 - 1)
+
+        ad_row = rows[("Level 1", StatType.AD.value)]
+        assert ad_row['dps'] == pytest.approx(crit_factor * (1 - reduction) * final.as_, abs=1e-4)
+        assert ad_row['ttk'] < 0
+        assert rows[("Level 1", StatType.ARMOR.value)]['effective_hp_physical'] > 0
+
+        # Stats fora das probes padrão não mudam nenhuma métrica
+        explicit = self.engine.calculate_stat_sensitivity(builds[:1], probes=[StatType.MANA, StatType.AP])
+        for row in explicit:
+            assert row['dps'] == row['ttk'] == row['effective_hp_physical'] == row['effective_hp_magical'] == 0
+
+    def test_mixed_damage_sensitivity(self):
+        """Com um DamageKernel, AP e penetrações têm ganho no DPS misto"""
+        from calc.damage import DamageKernel
+
+        target = Target(name="Sensitivity", hp=2500, armor=60, mr=40)
+        build = Build(name="Mage", champion=self.test_champion, level=11, items=[self.test_item], target=target)
+        kernel = DamageKernel(self.engine)
+
+        table = self.engine.calculate_stat_sensitivity([build], damage_kernel=kernel, profile="mage")
+        rows = {row['stat']: row for row in table}
+        assert set(rows) == {stat.value for stat in SENSITIVITY_MIXED_STATS}
+        for stat in (StatType.AP, StatType.LETHALITY, StatType.MAGIC_PEN, StatType.AD):
+            assert rows[stat.value]['dps'] > 0
+            assert rows[stat.value]['ttk'] < 0
+
+        # AP rende o dano das habilidades reduzido pela MR do alvo
+        reduction = self.engine.calculate_damage_reduction(target.mr)
+        profile = kernel.resolve_profile("mage")
+        assert rows[StatType.AP.value]['dps'] == pytest.approx(
+            profile.ability_ap_ratio * profile.casts_per_second * (1 - reduction), abs=1e-4)
+
+        # O perfil basic_attack reproduz o DPS físico
+        physical = self.engine.calculate_stat_sensitivity([build], probes=[StatType.AD, StatType.AS])
+        basic = self.engine.calculate_stat_sensitivity([build], probes=[StatType.AD, StatType.AS],
+                                                       damage_kernel=kernel)
+        assert [row['dps'] for row in basic] == pytest.approx([row['dps'] for row in physical])
+
+    def test_sensitivity_respects_caps(self):
+        """Stats no limite não têm ganho marginal"""
+        import numpy as np
+        from calc.models import STAT_INDEX, NUM_STATS
+
+        stats = np.full((2, NUM_STATS), 100.0)
+        stats[:, STAT_INDEX[StatType.CRIT_DAMAGE]] = 200
+        stats[0, STAT_INDEX[StatType.AS]] = self.engine.MAX_ATTACK_SPEED
+        stats[1, STAT_INDEX[StatType.AS]] = 1.0
+
+        gradients = self.engine.calculate_sensitivity_batch(
+            stats, np.full(2, 2000.0), np.full(2, 50.0), [StatType.AS, StatType.CRIT_CHANCE]
+        )
+
+        assert gradients['dps'][0, 0] == 0
+        assert gradients['dps'][1, 0] > 0
+        assert np.all(gradients['dps'][:, 1] == 0)  # crítico já em 100%
+        assert gradients['units'][1, 0] == pytest.approx(0.01)
+
 if __name__ == "__main__":
     pytest.main([__file__])
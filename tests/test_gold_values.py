@@ -0,0 +1,190 @@
+"""
+🔥 SmashBuilder - Testes do Valor em Gold 🔥
+Testes dos valores de gold derivados do catálogo de itens
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from calc.models import Build, Item, ItemModifier, StatType, ModifierType, FinalStats
+from calc.formulas import FormulaEngine
+from calc import gold_values
+from calc.catalog import ItemCatalog
+from calc.gold_values import (
+    GoldValueSolver, DEFAULT_GOLD_VALUES, catalog_version, design_matrix, nonnegative_least_squares
+)
+from calc.dps import DPSCalculator
+from data_io.loader import DataLoader
+
+def make_item(name, cost, *modifiers):
+    """Item com modificadores (stat, valor, tipo)"""
+    return Item(
+        name=name,
+        cost=cost,
+        modifiers=[ItemModifier(stat=stat, value=value, modifier_type=kind) for stat, value, kind in modifiers]
+    )
+
+class TestGoldValueSolver:
+    """Testes para o GoldValueSolver"""
+
+    def setup_method(self):
+        """Setup para cada teste"""
+        self.solver = GoldValueSolver()
+        self.items = list(DataLoader().load_items().values())
+
+    def test_recovers_exact_prices(self):
+        """Um catálogo com preços consistentes é resolvido exatamente"""
+        items = [
+            make_item("Sword", 1300, (StatType.AD, 40, ModifierType.FLAT)),
+            make_item("Dagger", 300, (StatType.AS, 12, ModifierType.PERCENT)),
+            make_item("Both", 1600, (StatType.AD, 40, ModifierType.FLAT), (StatType.AS, 12, ModifierType.PERCENT)),
+        ]
+
+        values = self.solver.solve(items)
+
+        assert values.value(StatType.AD) == pytest.approx(32.5)
+        assert values.value(StatType.AS, ModifierType.PERCENT) == pytest.approx(25)
+        assert np.isnan(values.value(StatType.HP))
+        assert values.efficiency_values()['hp'] == DEFAULT_GOLD_VALUES['hp']
+
+    def test_values_are_nonnegative_and_cached(self):
+        """Nenhum stat vale gold negativo e a versão dos dados é reaproveitada"""
+        values = self.solver.solve(self.items)
+
+        priced = values.values[np.isfinite(values.values)]
+        assert np.all(priced >= 0)
+        assert self.solver.solve(list(reversed(self.items))) is values
+
+        changed = self.items[:-1] + [make_item("Cheap Vest", 300, (StatType.ARMOR, 40, ModifierType.FLAT))]
+        assert catalog_version(changed) != values.version
+        assert self.solver.solve(changed) is not values
+
+    def test_version_hashed_once_per_catalog(self, monkeypatch):
+        """Chamadas repetidas não recalculam o hash do conteúdo"""
+        calls = []
+        original = gold_values.catalog_version
+        monkeypatch.setattr(gold_values, "catalog_version", lambda items: calls.append(1) or original(items))
+
+        catalog = ItemCatalog(self.items)
+        values = self.solver.solve(catalog)
+        assert self.solver.solve(catalog) is values
+        assert self.solver.solve(self.items) is values
+        assert self.solver.solve(self.items) is values
+        assert len(calls) == 2
+
+        # Edição no lugar muda a chave da lista
+        edited = [item.model_copy(deep=True) for item in self.items]
+        edited[0].cost += 500
+        repriced = self.solver.solve(edited)
+        assert repriced is not values
+        edited[0].modifiers[0].value += 10
+        assert self.solver.solve(edited) is not repriced
+
+    def test_cache_is_bounded(self):
+        """Versões antigas saem do LRU; as usadas recentemente ficam"""
+        solver = GoldValueSolver(maxsize=2)
+        catalogs = [self.items[:-1] + [make_item(f"Vest {cost}", cost, (StatType.ARMOR, 40, ModifierType.FLAT))]
+                    for cost in (300, 400, 500)]
+
+        first = solver.solve(catalogs[0])
+        solver.solve(catalogs[1])
+        assert solver.solve(catalogs[0]) is first
+        solver.solve(catalogs[2])
+
+        assert len(solver._cache) == len(solver._by_items) == 2
+        assert solver.solve(catalogs[0]) is first
+        assert catalog_version(catalogs[1]) not in solver._cache
+        with pytest.raises(ValueError):
+            GoldValueSolver(maxsize=0)
+
+    def test_nonnegative_least_squares_matches_enumeration(self):
+        """O conjunto ativo encontra o ótimo de todos os suportes possíveis"""
+        rng = np.random.default_rng(7)
+        for _ in range(25):
+            matrix = rng.normal(size=(8, 4))
+            target = rng.normal(size=8)
+            solution = nonnegative_least_squares(matrix, target)
+
+            best = np.inf
+            for size in range(5):
+                for support in itertools.combinations(range(4), size):
+                    candidate = np.zeros(4)
+                    if support:
+                        candidate[list(support)] = np.linalg.lstsq(matrix[:, list(support)], target, rcond=None)[0]
+                    if np.all(candidate >= 0):
+                        best = min(best, np.linalg.norm(matrix @ candidate - target))
+
+            assert np.all(solution >= 0)
+            assert np.linalg.norm(matrix @ solution - target) == pytest.approx(best)
+
+    def test_catalog_efficiency_matches_per_item(self):
+        """A eficiência do catálogo inteiro bate com calculate_gold_efficiency item a item"""
+        calculator = DPSCalculator()
+        table = {row['item_name']: row for row in self.solver.catalog_efficiency(self.items)}
+        before = FinalStats(level=1, ad=0, ap=0, as_=1.0, hp=1, mana=0, armor=0, mr=0, ms=0, crit_chance=0)
+        gains = {
+            "Infinity Edge": {'ad': 70, 'crit_chance': 20},
+            "Dagger": {'as_': 1.12},  # AS em pontos de modificador: +12%
+            "Sunfire Aegis": {'hp': 451, 'armor': 60},  # HP parte de 1
+            "Void Staff": {'ap': 70},
+        }
+
+        assert len(table) == len(self.items)
+        for name, gain in gains.items():
+            after = before.model_copy(update=gain)
+            cost = table[name]['item_cost']
+            efficiency = calculator.calculate_gold_efficiency(before, after, cost, items=self.items)
+            assert efficiency['efficiency_percent'] == pytest.approx(table[name]['efficiency_percent'], abs=0.01)
+
+    def test_single_item_paths_agree(self):
+        """Um item sobre uma build real vale o mesmo nos dois caminhos, com o AS no piso"""
+        loader = DataLoader()
+        engine = FormulaEngine()
+        item = loader.get_item("rapid firecannon")
+        base = Build(name="Base", champion=loader.get_champion("kai'sa"), level=18, items=[])
+        before = engine.calculate_final_stats(base)
+        after = engine.calculate_final_stats(base.model_copy(update={'items': [item]}))
+        assert before.as_ == 1.0
+
+        table = {row['item_name']: row for row in self.solver.catalog_efficiency(self.items)}
+        efficiency = DPSCalculator().calculate_gold_efficiency(before, after, item.cost, items=self.items, item=item)
+        assert efficiency['efficiency_percent'] == table[item.name]['efficiency_percent']
+
+        # Sem piso, o ganho de AS lido dos stats é o mesmo
+        raised = [before.model_copy(update={'as_': 1.5}), after.model_copy(update={'as_': 1.875})]
+        assert DPSCalculator().calculate_gold_efficiency(*raised, item.cost, items=self.items) == \
+            DPSCalculator().calculate_gold_efficiency(*raised, item.cost, items=self.items, item=item)
+
+    def test_build_gold_efficiency(self):
+        """Cada item da build é valorado pelo ganho ao adicioná-lo por último"""
+        loader = DataLoader()
+        firecannon = loader.get_item("rapid firecannon")
+        build = Build(name="Build", champion=loader.get_champion("kai'sa"), level=18,
+                      items=[firecannon, loader.get_item("b.f. sword")])
+        table = {row['item_name']: row for row in self.solver.catalog_efficiency(self.items)}
+
+        rows = DPSCalculator().calculate_build_gold_efficiency(build, items=loader.get_item_catalog())
+
+        assert [row['item_name'] for row in rows] == ["Rapid Firecannon", "B.F. Sword"]
+        for row in rows:
+            assert row['efficiency_percent'] == table[row['item_name']]['efficiency_percent']
+
+    def test_default_values_without_catalog(self):
+        """Sem catálogo, calculate_gold_efficiency mantém os valores aproximados"""
+        before = FinalStats(level=1, ad=0, ap=0, as_=0, hp=1, mana=0, armor=0, mr=0, ms=0, crit_chance=0)
+        after = before.model_copy(update={'ad': 40})
+
+        efficiency = DPSCalculator().calculate_gold_efficiency(before, after, 1300)
+
+        assert efficiency['total_gold_value'] == 40 * DEFAULT_GOLD_VALUES['ad']
+
+    def test_default_attack_speed_gain_is_absolute(self):
+        """Sem catálogo nem item, o ganho de AS continua sendo (depois - antes) × 100"""
+        before = FinalStats(level=1, ad=0, ap=0, as_=1.5, hp=1, mana=0, armor=0, mr=0, ms=0, crit_chance=0)
+        after = before.model_copy(update={'as_': 1.8})
+
+        efficiency = DPSCalculator().calculate_gold_efficiency(before, after, 1000)
+
+        assert efficiency['total_gold_value'] == pytest.approx(30 * DEFAULT_GOLD_VALUES['as'])
@@ -0,0 +1,183 @@
+"""
+🔥 SmashBuilder - Testes do Otimizador 🔥
+Testes da busca branch-and-bound contra enumeração exaustiva
+"""
+
+from itertools import combinations_with_replacement
+
+import numpy as np
+import pytest
+
+from calc.models import Build, PRESET_TARGETS
+from calc.formulas import FormulaEngine
+from calc.optimizer import BuildOptimizer, SearchSpace
+from calc.parallel import ParallelBuildOptimizer, SharedArrays, partition_prefixes, balanced_prefixes, subtree_size
+from data_io.loader import DataLoader
+
+def brute_force_best_dps(champion, level, items, runes, target, max_items):
+    """Melhor DPS enumerando todos os multiconjuntos válidos"""
+    engine = FormulaEngine()
+    best = 0.0
+
+    for size in range(1, max_items + 1):
+        for combo in combinations_with_replacement(range(len(items)), size):
+            chosen = [items[index] for index in combo]
+            if sum(1 for item in chosen if item.mythic) > 1:
+                continue
+            if any(item.unique and combo.count(index) > 1 for index, item in zip(combo, chosen)):
+                continue
+
+            build = Build.trusted(name="Brute", champion=champion, level=level,
+                                  items=chosen, runes=runes, target=target)
+            best = max(best, engine.calculate_final_stats(build, trusted=True).dps)
+
+    return best
+
+class TestBuildOptimizer:
+    """Testes para o BuildOptimizer"""
+
+    def setup_method(self):
+        """Setup para cada teste"""
+        self.loader = DataLoader()
+        self.optimizer = BuildOptimizer()
+        self.items = list(self.loader.load_items().values())
+        self.runes = self.loader.get_rune_preset("ad_carry")
+
+    @pytest.mark.parametrize("champion_name,level", [("jinx", 18), ("garen", 9)])
+    def test_matches_brute_force(self, champion_name, level):
+        """A poda não descarta a melhor build"""
+        champion = self.loader.get_champion(champion_name)
+        items = self.items[:9]
+        target = PRESET_TARGETS["bruiser"]
+
+        result = self.optimizer.optimize(champion, level, items, runes=self.runes, target=target, max_items=3)
+        expected = brute_force_best_dps(champion, level, items, self.runes, target, 3)
+
+        assert result['results'][0]['dps'] == expected
+
+    def test_respects_unique_and_mythic(self):
+        """Itens únicos não se repetem e há no máximo um mítico"""
+        champion = self.loader.get_champion("vayne")
+        result = self.optimizer.optimize(champion, 18, self.items, target=PRESET_TARGETS["tank"], top_k=10)
+
+        assert len(result['results']) == 10
+        for entry in result['results']:
+            items = entry['build'].items
+            assert len(items) <= 6
+            assert sum(1 for item in items if item.mythic) <= 1
+            unique_names = [item.name for item in items if item.unique]
+            assert len(unique_names) == len(set(unique_names))
+
+    def test_results_sorted_and_pruned(self):
+        """Resultados ordenados por DPS e busca menor que a enumeração completa"""
+        champion = self.loader.get_champion("jinx")
+        result = self.optimizer.optimize(champion, 18, self.items, objective="ttk", top_k=5)
+
+        dps_values = [entry['dps'] for entry in result['results']]
+        assert dps_values == sorted(dps_values, reverse=True)
+        assert result['nodes_evaluated'] < 177100  # C(25, 6) multiconjuntos de 6 itens
+
+    def test_equal_dps_keeps_cheaper_build(self):
+        """Empate em DPS não poda a subárvore da build mais barata"""
+        champion = self.loader.get_champion("jinx")
+        base = self.loader.get_item("infinity edge")
+        expensive = base.model_copy(update={'name': "Lâmina Cara", 'cost': 4000, 'unique': False, 'mythic': False})
+        cheap = base.model_copy(update={'name': "Lâmina Barata", 'cost': 1000, 'unique': False, 'mythic': False})
+
+        result = self.optimizer.optimize(champion, 18, [expensive, cheap], max_items=2, top_k=1)
+        assert result['results'][0]['items'] == ["Lâmina Barata", "Lâmina Barata"]
+        assert result['results'][0]['cost'] == 2000
+
+        result = self.optimizer.optimize(champion, 18, [expensive, cheap], max_items=2, top_k=3)
+        assert len({entry['dps'] for entry in result['results']}) == 1
+        assert [entry['cost'] for entry in result['results']] == [2000, 5000, 8000]
+
+    def test_invalid_options(self):
+        """Parâmetros inválidos são rejeitados"""
+        champion = self.loader.get_champion("jinx")
+
+        with pytest.raises(ValueError):
+            self.optimizer.optimize(champion, 18, self.items, objective="hp")
+        with pytest.raises(ValueError):
+            self.optimizer.optimize(champion, 18, self.items, max_items=7)
+
+class TestParallelBuildOptimizer:
+    """Testes para o ParallelBuildOptimizer"""
+
+    def setup_method(self):
+        """Setup para cada teste"""
+        self.loader = DataLoader()
+        self.items = list(self.loader.load_items().values())
+
+    def test_matches_serial_search(self):
+        """Mesclar os heaps dos workers dá o mesmo top_k da busca serial"""
+        champion = self.loader.get_champion("vayne")
+        target = PRESET_TARGETS["tank"]
+
+        serial = BuildOptimizer().optimize(champion, 18, self.items, target=target, top_k=5)
+        parallel = ParallelBuildOptimizer(workers=2).optimize(champion, 18, self.items, target=target, top_k=5)
+
+        assert [entry['dps'] for entry in parallel['results']] == [entry['dps'] for entry in serial['results']]
+        # Só as subárvores grandes (primeiros índices) viram pares, em vez de ~n²/2 pares
+        space = SearchSpace(champion, 18, self.items, None, target, FormulaEngine())
+        assert parallel['partition_depth'] == 2
+        assert len(partition_prefixes(space, 1)) < parallel['partitions'] < len(partition_prefixes(space, 2))
+        assert parallel['partitions'] == len(balanced_prefixes(space, 6, 2)[0])
+
+    def test_ties_match_serial_order(self):
+        """Empates em DPS e custo saem na mesma ordem na busca serial e na paralela"""
+        champion = self.loader.get_champion("kai'sa")
+
+        serial = BuildOptimizer().optimize(champion, 18, self.items, top_k=3)
+        parallel = ParallelBuildOptimizer(workers=4).optimize(champion, 18, self.items, top_k=3)
+
+        assert len({(entry['dps'], entry['cost']) for entry in serial['results']}) == 1
+        assert [entry['items'] for entry in parallel['results']] == [entry['items'] for entry in serial['results']]
+
+    @pytest.mark.parametrize("workers", [2, 3])
+    def test_matches_brute_force(self, workers):
+        """A poda com limiar compartilhado não descarta a melhor build"""
+        champion = self.loader.get_champion("jinx")
+        items = self.items[:9]
+        runes = self.loader.get_rune_preset("ad_carry")
+        target = PRESET_TARGETS["bruiser"]
+
+        result = ParallelBuildOptimizer(workers=workers).optimize(champion, 18, items, runes=runes,
+                                                                  target=target, max_items=3)
+
+        space = SearchSpace(champion, 18, items, runes, target, FormulaEngine())
+        assert result['partition_depth'] == max(len(prefix) for prefix in balanced_prefixes(space, 3, workers)[0])
+        assert result['results'][0]['dps'] == brute_force_best_dps(champion, 18, items, runes, target, 3)
+
+    def test_balanced_prefixes(self):
+        """Subárvores grandes viram pares, maiores primeiro; cada build é coberta uma única vez"""
+        space = SearchSpace(self.loader.get_champion("jinx"), 18, self.items[:9], None,
+                            PRESET_TARGETS["bruiser"], FormulaEngine())
+        prefixes, split = balanced_prefixes(space, 3, 3)
+
+        assert 0 in split and all(len(prefix) == 2 for prefix in prefixes if prefix[0] in split)
+        sizes = [subtree_size(space, prefix, 3) for prefix in prefixes]
+        assert sizes == sorted(sizes, reverse=True)
+        for size in range(1, 4):
+            for build in partition_prefixes(space, size):
+                covering = [prefix for prefix in prefixes if build[:len(prefix)] == prefix]
+                covering += [build] if size == 1 and build[0] in split else []
+                assert len(covering) == 1
+
+        assert balanced_prefixes(space, 1, 3) == (partition_prefixes(space, 1), [])
+
+    def test_shared_arrays_round_trip(self):
+        """Arrays publicados são lidos sem cópia por quem anexa"""
+        arrays = {"a": np.arange(6, dtype=np.int64).reshape(2, 3), "b": np.array([True, False])}
+        shared = SharedArrays.publish(arrays)
+        try:
+            attached = SharedArrays.attach(shared.name, shared.layout)
+            assert np.array_equal(attached.arrays["a"], arrays["a"])
+            assert np.array_equal(attached.arrays["b"], arrays["b"])
+
+            shared.arrays["a"][0, 0] = 42
+            assert attached.arrays["a"][0, 0] == 42
+            attached.close()
+        finally:
+            shared.close()
+            shared.unlink()
@@ -0,0 +1,99 @@
+"""
+🔥 SmashBuilder - Testes da Fronteira de Pareto 🔥
+Testes de dominância vetorizada e da exportação da fronteira
+"""
+
+import csv
+
+import numpy as np
+import pytest
+
+from calc.pareto import ParetoAnalyzer, pareto_front_mask, non_dominated_ranks, dominance_counts
+from tests.test_batch import random_builds
+
+def brute_force_front(values, maximize):
+    """Fronteira por comparação par a par"""
+    costs = np.where(maximize, -values, values)
+    mask = []
+    for point in costs:
+        dominated = np.any(np.all(costs <= point, axis=1) & np.any(costs < point, axis=1))
+        mask.append(not dominated)
+    return np.array(mask)
+
+class TestParetoFront:
+    """Testes para pareto_front_mask e non_dominated_ranks"""
+
+    @pytest.mark.parametrize("objectives", [1, 2, 3, 4])
+    def test_matches_pairwise_dominance(self, objectives):
+        """A fronteira vetorizada coincide com a comparação par a par"""
+        rng = np.random.default_rng(objectives)
+        values = rng.integers(0, 12, size=(600, objectives)).astype(float)
+        maximize = [index % 2 == 0 for index in range(objectives)]
+
+        assert np.array_equal(pareto_front_mask(values, maximize), brute_force_front(values, maximize))
+
+    def test_all_nan_objective_without_warnings(self):
+        """Uma coluna sem valores finitos (ex.: TTK sem alvo) não emite avisos nem muda a fronteira"""
+        import warnings
+
+        rng = np.random.default_rng(5)
+        values = rng.random((200, 3))
+        with_nan = np.column_stack([values, np.full(200, np.nan)])
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            mask = pareto_front_mask(with_nan, [True, False, True, False])
+
+        assert np.array_equal(mask, pareto_front_mask(values, [True, False, True]))
+
+    def test_ranks_partition_all_rows(self):
+        """Cada linha recebe um nível; o nível 0 é a fronteira"""
+        rng = np.random.default_rng(3)
+        values = rng.random((300, 3))
+        maximize = [True, False, True]
+
+        ranks = non_dominated_ranks(values, maximize)
+
+        assert np.all(ranks >= 0)
+        assert np.array_equal(ranks == 0, pareto_front_mask(values, maximize))
+        assert np.all(non_dominated_ranks(values, maximize, max_rank=0)[ranks > 0] == -1)
+
+    def test_dominance_counts(self):
+        """Contagem de dominadores coincide com a comparação par a par"""
+        rng = np.random.default_rng(5)
+        values = rng.integers(0, 8, size=(700, 3)).astype(float)
+        maximize = [False, True, True]
+        costs = np.where(maximize, -values, values)
+
+        expected = [
+            int(np.count_nonzero(np.all(costs <= point, axis=1) & np.any(costs < point, axis=1)))
+            for point in costs
+        ]
+
+        counts = dominance_counts(values, maximize, chunk_size=64)
+        assert counts.tolist() == expected
+        assert np.array_equal(counts == 0, pareto_front_mask(values, maximize))
+
+class TestParetoAnalyzer:
+    """Testes para a fronteira sobre builds"""
+
+    def test_frontier_builds_and_export(self, tmp_path):
+        """Builds da fronteira não são dominadas e podem ser exportadas"""
+        from data_io.exporter import DataExporter
+
+        builds = [build for build in random_builds(120, seed=9) if build.target]
+        frontier = ParetoAnalyzer().frontier(builds)
+
+        assert frontier
+        dps = [row['dps'] for row in frontier]
+        assert dps == sorted(dps, reverse=True)
+
+        filepath = DataExporter(tmp_path).export_pareto_frontier_to_csv(frontier)
+        with open(filepath, encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        assert len(rows) == len(frontier) + 1
+
+    def test_invalid_objective(self):
+        """Objetivos desconhecidos são rejeitados"""
+        with pytest.raises(ValueError):
+            ParetoAnalyzer().frontier(random_builds(3), objectives=("mana",))
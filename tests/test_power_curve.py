@@ -0,0 +1,95 @@
+"""
+🔥 SmashBuilder - Testes das Curvas de Poder 🔥
+Testes do motor de curvas contra o cálculo escalar nível a nível
+"""
+
+import csv
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from calc.models import Build, PRESET_TARGETS, PRESET_RUNES
+from calc.formulas import FormulaEngine
+from calc.dps import DPSCalculator
+from calc.power_curve import PowerCurveEngine, POWER_CURVE_METRICS
+from data_io.loader import DataLoader
+from data_io.exporter import DataExporter
+
+class TestPowerCurveEngine:
+    """Testes para o PowerCurveEngine"""
+
+    def setup_method(self):
+        """Setup para cada teste"""
+        self.loader = DataLoader()
+        self.engine = FormulaEngine()
+        self.curves_engine = PowerCurveEngine(self.engine)
+        self.champions = list(self.loader.load_champions().values())[:3]
+        items = list(self.loader.load_items().values())
+        self.item_sets = [[]] + [list(combo) for combo in combinations(items[:8], 2)
+                                 if sum(item.mythic for item in combo) <= 1]
+
+    def test_matches_scalar_pipeline(self):
+        """Todas as curvas são idênticas ao cálculo build a build"""
+        target = PRESET_TARGETS["bruiser"]
+        runes = PRESET_RUNES["ad_carry"]
+        curves = self.curves_engine.compute(self.champions, self.item_sets, runes=runes, target=target)
+
+        assert curves.shape == (len(self.champions), len(self.item_sets), 18, len(POWER_CURVE_METRICS))
+        for k, champion in enumerate(self.champions):
+            for m, items in enumerate(self.item_sets[:6]):
+                for level in (1, 9, 18):
+                    build = Build(name="Curve", champion=champion, level=level, items=items, runes=runes, target=target)
+                    expected = self.engine.calculate_final_stats(build)
+                    row = curves.level_table(k, m)[level]
+                    assert row['ad'] == expected.ad
+                    assert row['as'] == expected.as_
+                    assert row['hp'] == expected.hp
+                    assert row['dps'] == expected.dps
+                    assert row['ttk'] == expected.ttk
+                    assert row['effective_hp_magical'] == expected.effective_hp_magical
+
+    def test_power_curve_uses_engine(self):
+        """calculate_power_curve mantém o formato e os valores do cálculo detalhado"""
+        calculator = DPSCalculator()
+        champion = self.champions[0]
+        items = self.item_sets[1]
+
+        curve = calculator.calculate_power_curve(champion, items)
+
+        assert list(curve) == [1, 6, 11, 16, 18]
+        build = Build(name="Curve", champion=champion, level=11, items=items, target=PRESET_TARGETS["dummy"])
+        stats = self.engine.calculate_final_stats(build)
+        detailed = calculator.calculate_basic_attack_dps(stats, PRESET_TARGETS["dummy"])
+        assert curve[11] == {'ad': stats.ad, 'as': stats.as_, 'hp': stats.hp,
+                             'dps': detailed['dps'], 'effective_damage': detailed['effective_damage']}
+
+    def test_metric_and_export(self, tmp_path):
+        """Métricas são fatias do tensor e as curvas podem ser exportadas"""
+        curves = self.curves_engine.compute(self.champions, self.item_sets[:2], levels=[18, 1, 6])
+
+        assert curves.levels == [1, 6, 18]
+        assert np.all(np.diff(curves.metric('hp'), axis=2) >= 0)
+        with pytest.raises(ValueError):
+            curves.metric('gold')
+
+        exporter = DataExporter(tmp_path)
+        with open(exporter.export_power_curves_to_csv(curves), encoding='utf-8') as f:
+            assert len(list(csv.reader(f))) == 1 + len(self.champions) * 2 * 3
+
+        filepath = exporter.export_level_table_to_csv(self.champions[0].name, [], curves.levels, curves)
+        with open(filepath, encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        assert [row[0] for row in rows[1:]] == ['1', '6', '18']
+
+    def test_empty_inputs(self):
+        """Sem campeões ou sem conjuntos de itens o resultado é vazio"""
+        for champions, item_sets in (([], self.item_sets), (self.champions, []), ([], [])):
+            curves = self.curves_engine.compute(champions, item_sets, levels=[1, 18])
+            assert curves.values.shape == (len(champions), len(item_sets), 2, len(POWER_CURVE_METRICS))
+            assert curves.rows() == []
+
+    def test_invalid_levels(self):
+        """Níveis fora de 1-18 são rejeitados"""
+        with pytest.raises(ValueError):
+            self.curves_engine.compute(self.champions, self.item_sets, levels=[0, 5])
@@ -0,0 +1,115 @@
+"""
+🔥 SmashBuilder - Testes do Recomendador 🔥
+Testes do recomendador de upgrades contra o cálculo escalar build a build
+"""
+
+from itertools import combinations_with_replacement
+
+import pytest
+
+from calc.models import Build, PRESET_TARGETS, PRESET_RUNES
+from calc.formulas import FormulaEngine
+from calc.dps import DPSCalculator
+from calc.recommender import UpgradeRecommender
+from calc.gold_values import gold_value_solver
+from data_io.loader import DataLoader
+
+class TestUpgradeRecommender:
+    """Testes para o UpgradeRecommender"""
+
+    def setup_method(self):
+        """Setup para cada teste"""
+        self.loader = DataLoader()
+        self.engine = FormulaEngine()
+        self.recommender = UpgradeRecommender(self.engine)
+        self.items = self.loader.load_items()
+        self.candidates = list(self.items.values())
+        self.base = Build(
+            name="Base",
+            champion=self.loader.get_champion("jinx"),
+            level=11,
+            items=[self.items["kraken slayer"], self.items["b.f. sword"]],
+            runes=PRESET_RUNES["ad_carry"],
+            target=PRESET_TARGETS["bruiser"]
+        )
+
+    def brute_force(self, combo_size):
+        """Todas as combinações válidas calculadas com calculate_final_stats"""
+        base_dps = self.engine.calculate_final_stats(self.base).dps
+        scores = []
+        for combo in combinations_with_replacement(range(len(self.candidates)), combo_size):
+            chosen = [self.candidates[index] for index in combo]
+            items = self.base.items + chosen
+            if sum(item.mythic for item in items) > 1:
+                continue
+            unique_names = [item.name for item in items if item.unique]
+            if len(unique_names) != len(set(unique_names)):
+                continue
+
+            build = self.base.model_copy(update={'items': items})
+            improvement = self.engine.calculate_final_stats(build).dps - base_dps
+            cost = sum(item.cost for item in chosen)
+            scores.append((improvement / cost, [item.name for item in chosen], improvement))
+        return scores
+
+    @pytest.mark.parametrize("combo_size", [1, 2, 3])
+    def test_matches_brute_force(self, combo_size):
+        """Top-k e melhorias de DPS idênticos à avaliação build a build"""
+        result = self.recommender.recommend(self.base, self.candidates, combo_size=combo_size, top_k=4)
+        expected = sorted(self.brute_force(combo_size), key=lambda entry: -entry[0])
+
+        assert result['combinations_evaluated'] == len(expected)
+        assert [row['dps_per_gold'] for row in result['recommendations']] == \
+            [round(score, 4) for score, _, _ in expected[:4]]
+        best = next(entry for entry in expected if entry[1] == result['recommendations'][0]['items'])
+        assert result['recommendations'][0]['dps_improvement'] == round(best[2], 2)
+
+    def test_ties_keep_candidate_order(self):
+        """Empates ficam com o candidato que vem primeiro, como na análise item a item"""
+        # Phantom Dancer e Rapid Firecannon dão o mesmo DPS pelo mesmo custo
+        base = self.base.model_copy(update={'items': [self.items["kraken slayer"]], 'runes': None})
+        result = DPSCalculator().analyze_build_optimization(base, self.candidates)
+        names = [row['item_name'] for row in result['recommendations']]
+        assert names[-1] == "Phantom Dancer" and "Rapid Firecannon" not in names
+
+        expected = sorted(self.brute_force(1), key=lambda entry: -entry[0])
+        result = self.recommender.recommend(self.base, self.candidates, combo_size=1, top_k=5)
+        assert [row['items'] for row in result['recommendations']] == [names for _, names, _ in expected[:5]]
+
+    def test_respects_free_slots(self):
+        """Sem slots livres suficientes não há recomendação"""
+        full = self.base.model_copy(update={'items': self.base.items + [self.items["dagger"]] * 3})
+
+        assert self.recommender.recommend(full, self.candidates, combo_size=1)['recommendations']
+        result = self.recommender.recommend(full, self.candidates, combo_size=2)
+        assert result['recommendations'] == []
+        assert result['free_slots'] == 1
+
+    def test_analyze_build_optimization_delegates(self):
+        """analyze_build_optimization mantém o formato e usa o recomendador"""
+        result = DPSCalculator().analyze_build_optimization(self.base, self.candidates)
+
+        assert len(result['recommendations']) == 5
+        assert result['base_dps'] == self.engine.calculate_final_stats(self.base).dps
+        assert result['total_cost'] == sum(item.cost for item in self.base.items)
+        scores = [row['dps_per_gold'] for row in result['recommendations']]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_gold_efficiency_matches_catalog(self):
+        """AS em pontos de modificador: a eficiência de um item bate com a do catálogo"""
+        item = self.items["rapid firecannon"]
+        base = self.base.model_copy(update={'champion': self.loader.get_champion("kai'sa"), 'level': 18,
+                                            'items': [], 'runes': None})
+        result = self.recommender.recommend(base, [item], metric="gold_efficiency", catalog=self.candidates)
+        table = {row['item_name']: row for row in gold_value_solver.catalog_efficiency(self.candidates)}
+
+        assert result['recommendations'][0]['gold_efficiency'] == table[item.name]['efficiency_percent']
+
+    def test_invalid_options(self):
+        """Parâmetros inválidos são rejeitados"""
+        with pytest.raises(ValueError):
+            self.recommender.recommend(self.base, self.candidates, combo_size=4)
+        with pytest.raises(ValueError):
+            self.recommender.recommend(self.base, self.candidates, metric="gold")
+        with pytest.raises(ValueError):
+            self.recommender.recommend(self.base, self.candidates, top_k=0)
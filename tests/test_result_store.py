@@ -0,0 +1,152 @@
+"""
+🔥 SmashBuilder - Testes do Armazenamento de Resultados 🔥
+Testes do cache persistente em SQLite
+"""
+
+import shutil
+import time
+
+import pytest
+
+from calc.models import Build, PRESET_TARGETS
+from calc.formulas import FormulaEngine
+from calc.cache import CachedFormulaEngine, canonical_build_hash
+from data_io.loader import DataLoader
+from data_io.result_store import ResultStore, default_result_store, RESULT_STORE_ENV
+
+class TestResultStore:
+    """Testes para o ResultStore"""
+
+    def setup_method(self):
+        """Setup para cada teste"""
+        self.loader = DataLoader()
+        self.items = self.loader.load_items()
+
+    def make_build(self, level=11):
+        """Build de teste contra um alvo (TTK finito)"""
+        return Build(name="Store", champion=self.loader.get_champion("jinx"), level=level,
+                     items=[self.items["kraken slayer"], self.items["dagger"]], target=PRESET_TARGETS["adc"])
+
+    def test_round_trip_across_instances(self, tmp_path):
+        """Entradas sobrevivem ao fechamento e são lidas por outra instância"""
+        build = self.make_build()
+        stats = FormulaEngine().calculate_final_stats(build)
+        key = canonical_build_hash(build)
+
+        store = ResultStore(tmp_path / "results.sqlite", loader=self.loader)
+        store.put(key, stats)
+        store.put("trusted", stats, validated=False)
+        store.close()
+
+        reopened = ResultStore(tmp_path / "results.sqlite", loader=self.loader)
+        assert len(reopened) == 1
+        assert reopened.get(key) == stats
+        assert reopened.get("trusted") is None
+        assert list(reopened.get_many([key, "missing"])) == [key]
+
+    def test_migrates_only_other_formats(self, tmp_path):
+        """Abrir o arquivo não apaga entradas; só um formato diferente é descartado"""
+        import sqlite3
+        from data_io.result_store import SCHEMA_VERSION
+
+        path = tmp_path / "results.sqlite"
+        legacy = sqlite3.connect(str(path))
+        legacy.executescript("""
+            CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE results (key TEXT PRIMARY KEY, payload TEXT NOT NULL);
+            INSERT INTO meta VALUES ('data_version', 'antiga');
+        """)
+        legacy.commit()
+        legacy.close()
+
+        stats = FormulaEngine().calculate_final_stats(self.make_build())
+        store = ResultStore(path, loader=self.loader)
+        store.put("build", stats)
+        store.close()
+        for _ in range(3):
+            reopened = ResultStore(path, loader=self.loader)
+            assert reopened.get("build") == stats
+            reopened.close()
+
+        connection = sqlite3.connect(str(path))
+        tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert tables == {"meta", "stats"}
+        assert connection.execute("SELECT value FROM meta WHERE name = 'schema_version'").fetchone() == \
+            (str(SCHEMA_VERSION),)
+        connection.close()
+
+    def test_invalidated_when_data_changes(self, tmp_path):
+        """Alterar um arquivo de dados descarta as entradas"""
+        shutil.copytree(self.loader.data_dir, tmp_path / "data")
+        loader = DataLoader(tmp_path / "data")
+        store = ResultStore(tmp_path / "results.sqlite", loader=loader)
+        store.put("build", FormulaEngine().calculate_final_stats(self.make_build()))
+        assert store.get("build") is not None
+
+        presets = tmp_path / "data" / "presets.json"
+        presets.write_text(presets.read_text(encoding="utf-8") + " ", encoding="utf-8")
+
+        assert store.get("build") is None
+        assert len(ResultStore(tmp_path / "results.sqlite", loader=loader)) == 0
+
+    def test_data_directories_share_file(self, tmp_path):
+        """Diretórios de dados diferentes não descartam as entradas um do outro"""
+        path = tmp_path / "results.sqlite"
+        shutil.copytree(self.loader.data_dir, tmp_path / "data")
+        presets = tmp_path / "data" / "presets.json"
+        presets.write_text(presets.read_text(encoding="utf-8") + " ", encoding="utf-8")
+        other = DataLoader(tmp_path / "data")
+        assert other.data_version() != self.loader.data_version()
+
+        stats = FormulaEngine().calculate_final_stats(self.make_build())
+        store = ResultStore(path, loader=self.loader)
+        other_store = ResultStore(path, loader=other)
+        store.put("build", stats)
+        other_store.put("build", stats)
+        for _ in range(2):
+            assert store.get("build") == stats
+            assert other_store.get("build") == stats
+            assert ResultStore(path, loader=self.loader).get("build") == stats
+
+        # Só as entradas antigas do diretório alterado são descartadas
+        presets.write_text(presets.read_text(encoding="utf-8") + " ", encoding="utf-8")
+        assert other_store.get("build") is None
+        assert store.get("build") == stats
+        assert other_store.connection.execute("SELECT COUNT(*) FROM stats").fetchone()[0] == 1
+
+    def test_default_store_opt_out(self, tmp_path, monkeypatch):
+        """RESULT_STORE_ENV escolhe o arquivo ou desativa o armazenamento"""
+        assert default_result_store(self.loader) is None
+
+        monkeypatch.setenv(RESULT_STORE_ENV, str(tmp_path / "results.sqlite"))
+        store = default_result_store(self.loader)
+        assert store.path == tmp_path / "results.sqlite"
+
+    def test_engine_uses_store_across_restarts(self, tmp_path):
+        """Um novo engine encontra no disco o que outro calculou"""
+        path = tmp_path / "results.sqlite"
+        build = self.make_build()
+
+        first = CachedFormulaEngine(store=ResultStore(path, loader=self.loader))
+        expected = first.calculate_final_stats(build)
+
+        second = CachedFormulaEngine(store=ResultStore(path, loader=self.loader))
+        assert second.calculate_final_stats(build) == expected
+        assert second.cache_stats()['store_hits'] == 1
+        second.calculate_final_stats(build)
+        assert second.cache_stats()['hits'] == 1
+
+    def test_warm_lookup_is_fast(self, tmp_path):
+        """Consultas a entradas existentes levam bem menos de um milissegundo"""
+        store = ResultStore(tmp_path / "results.sqlite", loader=self.loader)
+        engine = FormulaEngine()
+        entries = [(f"build-{level}", engine.calculate_final_stats(self.make_build(level))) for level in range(1, 19)]
+        store.put_many(entries)
+
+        start = time.perf_counter()
+        for _ in range(50):
+            for key, _ in entries:
+                store.get(key)
+        elapsed = (time.perf_counter() - start) / (50 * len(entries))
+
+        assert elapsed < 1e-3
@@ -0,0 +1,129 @@
+"""
+🔥 SmashBuilder - Testes do Snapshot do Catálogo 🔥
+Testes da carga compilada e da invalidação pelo conteúdo dos arquivos
+"""
+
+import json
+import pickle
+import shutil
+
+import numpy as np
+import pytest
+
+from calc.batch import compile_modifiers, level_table
+from data_io.loader import DataLoader
+from data_io.snapshot import DEFAULT_SNAPSHOT_ROOT, SNAPSHOT_ENV
+
+class TestCatalogSnapshot:
+    """Testes para o CatalogSnapshot via DataLoader"""
+
+    @pytest.fixture
+    def data_dir(self, tmp_path):
+        shutil.copytree(DataLoader().data_dir, tmp_path / "data")
+        return tmp_path / "data"
+
+    def load_all(self, loader):
+        return loader.load_champions(), loader.load_items(), loader.load_presets()
+
+    @staticmethod
+    def dump(models):
+        # Comparação sem atributos privados (arrays compilados)
+        return {key: model.model_dump() for key, model in models.items()}
+
+    def test_warm_load_matches_json(self, data_dir, tmp_path):
+        """A segunda carga vem do snapshot e é igual à carga dos JSON"""
+        cold = DataLoader(data_dir, snapshot_dir=tmp_path / "snapshots")
+        self.load_all(cold)
+        assert cold.snapshot.misses == 3
+
+        warm = DataLoader(data_dir, snapshot_dir=tmp_path / "snapshots")
+        champions, items, presets = self.load_all(warm)
+        assert warm.snapshot.hits == 3 and warm.snapshot.misses == 0
+
+        reference = DataLoader(data_dir, use_snapshot=False)
+        assert self.dump(champions) == self.dump(reference.load_champions())
+        assert self.dump(items) == self.dump(reference.load_items())
+        assert self.dump(presets["runes"]) == self.dump(reference.load_presets()["runes"])
+
+        # Arrays pré-calculados vêm prontos e somente leitura
+        item = items["infinity edge"]
+        assert np.array_equal(compile_modifiers(item).flat_vector,
+                              compile_modifiers(reference.get_item("infinity edge")).flat_vector)
+        names, tables = warm.get_level_tables()
+        assert names == reference.get_level_tables()[0]
+        assert np.array_equal(tables, reference.get_level_tables()[1])
+        assert not tables.flags.writeable
+        assert not level_table(champions[names[0]]).flags.writeable
+
+    def test_rebuilt_when_file_changes(self, data_dir, tmp_path):
+        """Alterar um arquivo recompila apenas a seção dele"""
+        self.load_all(DataLoader(data_dir, snapshot_dir=tmp_path / "snapshots"))
+
+        items_file = data_dir / "items.json"
+        data = json.loads(items_file.read_text(encoding="utf-8"))
+        data["items"][0]["cost"] = 1234
+        items_file.write_text(json.dumps(data), encoding="utf-8")
+
+        loader = DataLoader(data_dir, snapshot_dir=tmp_path / "snapshots")
+        champions, items, presets = self.load_all(loader)
+        assert loader.snapshot.hits == 2 and loader.snapshot.misses == 1
+        assert items[data["items"][0]["name"].lower()].cost == 1234
+
+    def test_errors_reported_and_kept(self, data_dir, tmp_path, capsys):
+        """Erros de validação são mostrados juntos, preservados no snapshot e mostrados de novo"""
+        items_file = data_dir / "items.json"
+        data = json.loads(items_file.read_text(encoding="utf-8"))
+        data["items"][0]["cost"] = -1
+        data["items"][1]["modifiers"][0]["stat"] = "inexistente"
+        items_file.write_text(json.dumps(data), encoding="utf-8")
+
+        cold = DataLoader(data_dir, snapshot_dir=tmp_path / "snapshots")
+        items = cold.load_items()
+        output = capsys.readouterr().out
+        assert "2 erro(s) ao carregar items.json" in output
+        assert len(cold.load_errors["items.json"]) == 2
+        assert len(items) == len(data["items"]) - 2
+
+        warm = DataLoader(data_dir, snapshot_dir=tmp_path / "snapshots")
+        warm.load_items()
+        assert warm.snapshot.hits == 1
+        assert capsys.readouterr().out == output
+        assert warm.load_errors["items.json"] == cold.load_errors["items.json"]
+
+    def test_corrupted_snapshot_falls_back(self, data_dir, tmp_path):
+        """Snapshot ilegível é ignorado e regravado"""
+        loader = DataLoader(data_dir, snapshot_dir=tmp_path / "snapshots")
+        expected = self.dump(loader.load_items())
+        loader.snapshot.section_path("items.json").write_bytes(b"lixo")
+
+        reloaded = DataLoader(data_dir, snapshot_dir=tmp_path / "snapshots")
+        assert self.dump(reloaded.load_items()) == expected
+        assert reloaded.snapshot.misses == 1
+        assert self.dump(DataLoader(data_dir, snapshot_dir=tmp_path / "snapshots").load_items()) == expected
+
+    def test_tampered_snapshot_not_unpickled(self, data_dir, tmp_path):
+        """Um pickle válido que não é o gravado (hash diferente) não é desserializado"""
+        loader = DataLoader(data_dir, snapshot_dir=tmp_path / "snapshots")
+        expected = self.dump(loader.load_items())
+        loader.snapshot.section_path("items.json").write_bytes(pickle.dumps(({}, ["alterado"])))
+
+        reloaded = DataLoader(data_dir, snapshot_dir=tmp_path / "snapshots")
+        assert self.dump(reloaded.load_items()) == expected
+        assert reloaded.snapshot.misses == 1 and reloaded.load_errors["items.json"] == []
+
+    def test_snapshots_are_opt_in(self, data_dir, tmp_path, monkeypatch):
+        """Sem pedido nada é gravado; use_snapshot=True usa o cache do usuário, a variável escolhe outra raiz"""
+        loader = DataLoader(data_dir)
+        self.load_all(loader)
+        assert loader.snapshot is None
+
+        requested = DataLoader(data_dir, use_snapshot=True)
+        assert requested.snapshot.root == DEFAULT_SNAPSHOT_ROOT
+        assert requested.snapshot.directory != DataLoader(tmp_path, use_snapshot=True).snapshot.directory
+
+        monkeypatch.setenv(SNAPSHOT_ENV, str(tmp_path / "env_snapshots"))
+        from_env = DataLoader(data_dir)
+        self.load_all(from_env)
+        assert from_env.snapshot.directory.parent == tmp_path / "env_snapshots"
+        assert from_env.snapshot.misses == 3
+        assert DataLoader(data_dir, use_snapshot=False).snapshot is None
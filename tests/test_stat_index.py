@@ -0,0 +1,180 @@
+"""
+🔥 SmashBuilder - Testes do Índice de Stats 🔥
+Testes do índice invertido de stats e da sua manutenção no DataLoader
+"""
+
+import shutil
+
+import numpy as np
+import pytest
+
+from calc.models import Item, ItemModifier, StatType, ModifierType
+from calc.catalog import ItemCatalog, STAT_COLUMNS
+from calc.stat_index import StatIndex
+from data_io.loader import DataLoader
+
+def brute_force(items, minimum=None, has=(), max_cost=None):
+    """Consulta de referência por varredura linear"""
+    catalog = ItemCatalog(items)
+    mask = np.ones(len(catalog), dtype=bool)
+    for key, value in (minimum or {}).items():
+        column = catalog.column(*key)
+        mask &= (column != 0) & (column >= value)
+    for key in has:
+        mask &= catalog.column(*key) != 0
+    if max_cost is not None:
+        mask &= catalog.cost <= max_cost
+    return np.flatnonzero(mask)
+
+class TestStatIndex:
+    """Testes para o StatIndex"""
+
+    def setup_method(self):
+        """Setup para cada teste"""
+        self.loader = DataLoader()
+        self.items = list(self.loader.load_items().values())
+        self.index = StatIndex(ItemCatalog(self.items))
+
+    def test_postings_sorted_by_value(self):
+        """Cada lista contém só os itens com o stat, em ordem de valor"""
+        catalog = ItemCatalog(self.items)
+        for key in STAT_COLUMNS:
+            ids = self.index.ids_with(key)
+            values = catalog.column(*key)[ids]
+            assert set(ids) == set(np.flatnonzero(catalog.column(*key) != 0))
+            assert np.all(np.diff(values) >= 0)
+
+        costs = catalog.cost[self.index.ids_by_cost(maximum=1000)]
+        assert np.all(costs <= 1000) and np.all(np.diff(costs) >= 0)
+
+    @pytest.mark.parametrize("query", [
+        {'minimum': {(StatType.AD, ModifierType.FLAT): 30}, 'has': [(StatType.CRIT_CHANCE, ModifierType.FLAT)],
+         'max_cost': 3000},
+        {'minimum': {(StatType.AD, ModifierType.FLAT): 30}, 'has': [(StatType.CRIT_CHANCE, ModifierType.FLAT)],
+         'max_cost': 3400},
+        {'has': [(StatType.AS, ModifierType.PERCENT)]},
+        {'minimum': {(StatType.AP, ModifierType.FLAT): 80}},
+        {'max_cost': 1300},
+        {},
+    ])
+    def test_query_matches_linear_scan(self, query):
+        """Consultas pelo índice equivalem à varredura de todos os itens"""
+        assert np.array_equal(self.index.query(**query), brute_force(self.items, **query))
+
+    def test_stat_type_in_has_matches_any_modifier(self):
+        """StatType sozinho em has aceita qualquer modificador do stat"""
+        for stat in StatType:
+            assert np.array_equal(self.index.query(has=[stat]), self.index.ids_modifying(stat))
+        assert np.array_equal(self.index.query(has=[StatType.AD, StatType.CRIT_CHANCE], max_cost=3400),
+                              np.intersect1d(np.intersect1d(self.index.ids_modifying(StatType.AD),
+                                                            self.index.ids_modifying(StatType.CRIT_CHANCE)),
+                                             self.index.ids_by_cost(maximum=3400)))
+
+    def test_stat_type_in_minimum_requires_modifier_type(self):
+        """Valores mínimos exigem o tipo de modificador"""
+        with pytest.raises(ValueError):
+            self.index.query({StatType.AS: 10})
+        with pytest.raises(ValueError):
+            self.index.ids_with(StatType.AD)
+
+    def test_bulk_add_matches_rebuild(self):
+        """Itens adicionados em massa dão as mesmas listas que um índice novo"""
+        extra = [item.model_copy(update={'name': f"{item.name} {copy}", 'cost': item.cost + copy})
+                 for copy in range(3) for item in self.items]
+        index = StatIndex(ItemCatalog(self.items[:5]))
+        for item_id, item in enumerate(self.items[5:] + extra, start=5):
+            index.add(item_id, item)
+        assert len(index) == len(self.items) + len(extra)
+
+        expected = StatIndex(ItemCatalog(self.items + extra))
+        for key in STAT_COLUMNS:
+            assert np.array_equal(index.ids_with(key), expected.ids_with(key))
+        assert np.array_equal(index.ids_by_cost(), expected.ids_by_cost())
+
+        index.add(len(index), self.items[0])
+        assert index.query(max_cost=self.items[0].cost)[-1] == len(index) - 1
+        with pytest.raises(ValueError):
+            index.add(0, self.items[0])
+
+class TestLoaderStatIndex:
+    """Manutenção do índice pelo DataLoader"""
+
+    @pytest.fixture
+    def loader(self, tmp_path):
+        shutil.copytree(DataLoader().data_dir, tmp_path / "data")
+        return DataLoader(tmp_path / "data", snapshot_dir=tmp_path / "snapshots")
+
+    def test_get_items_by_stat(self, loader):
+        """get_items_by_stat mantém o resultado da varredura linear"""
+        items = loader.load_items()
+        for stat in StatType:
+            expected = [item for item in items.values() if any(m.stat == stat for m in item.modifiers)]
+            assert loader.get_items_by_stat(stat) == expected
+
+    def test_get_items_by_stat_keeps_unique_and_zero_modifiers(self, loader):
+        """Modificadores UNIQUE ou de valor zero contam, como na varredura linear"""
+        loader.add_item(Item(name="Passiva Teste", cost=1000, modifiers=[
+            ItemModifier(stat=StatType.MS, value=5, modifier_type=ModifierType.UNIQUE),
+            ItemModifier(stat=StatType.MANA, value=0, modifier_type=ModifierType.FLAT),
+        ]))
+        loader.get_stat_index()
+        loader.add_item(Item(name="Zerada Teste", cost=800, modifiers=[
+            ItemModifier(stat=StatType.ARMOR, value=0, modifier_type=ModifierType.PERCENT),
+        ]), save=False)
+
+        reloaded = DataLoader(loader.data_dir, snapshot_dir=loader.snapshot.directory.parent)
+        for current in (loader, reloaded):
+            items = current.load_items()
+            for stat in StatType:
+                expected = [item for item in items.values() if any(m.stat == stat for m in item.modifiers)]
+                assert current.get_items_by_stat(stat) == expected
+        assert "Passiva Teste" in [item.name for item in loader.get_items_by_stat(StatType.MS)]
+        assert "Zerada Teste" in [item.name for item in loader.get_items_by_stat(StatType.ARMOR)]
+
+    def test_query_attack_speed(self, loader):
+        """Itens de AS (só percentuais) aparecem ao filtrar por StatType.AS"""
+        expected = loader.get_items_by_stat(StatType.AS)
+        assert expected
+        assert loader.query_items(has=[StatType.AS]) == expected
+        assert loader.query_items({(StatType.AS, ModifierType.PERCENT): 10}) == [
+            item for item in expected
+            if any(m.stat == StatType.AS and m.modifier_type == ModifierType.PERCENT and m.value >= 10
+                   for m in item.modifiers)
+        ]
+
+    def test_add_item_updates_index_and_file(self, loader):
+        """add_item insere no índice sem recriá-lo e grava items.json"""
+        index = loader.get_stat_index()
+        item = Item(name="Lâmina Teste", cost=2900, modifiers=[
+            ItemModifier(stat=StatType.AD, value=45, modifier_type=ModifierType.FLAT),
+            ItemModifier(stat=StatType.CRIT_CHANCE, value=20, modifier_type=ModifierType.FLAT),
+        ])
+        loader.add_item(item)
+
+        assert loader.get_stat_index() is index
+        results = loader.query_items({(StatType.AD, ModifierType.FLAT): 30},
+                                     has=[(StatType.CRIT_CHANCE, ModifierType.FLAT)], max_cost=3000)
+        assert item in results
+        expected = brute_force(list(loader.load_items().values()), {(StatType.AD, ModifierType.FLAT): 30},
+                               [(StatType.CRIT_CHANCE, ModifierType.FLAT)], 3000)
+        assert [r.name for r in results] == [loader.get_item_catalog()[i].name for i in expected]
+
+        # Nova carga (snapshot atualizado) enxerga o item
+        reloaded = DataLoader(loader.data_dir, snapshot_dir=loader.snapshot.directory.parent)
+        assert reloaded.get_item("lâmina teste").cost == 2900
+        assert reloaded.snapshot.hits == 1
+
+    def test_replace_and_reload_rebuild_index(self, loader):
+        """Substituir um item ou recarregar recria o índice"""
+        index = loader.get_stat_index()
+        loader.add_item(Item(name="Dagger", cost=300, modifiers=[
+            ItemModifier(stat=StatType.AP, value=10, modifier_type=ModifierType.FLAT),
+        ]), save=False)
+        replaced = loader.get_stat_index()
+        assert replaced is not index
+        assert "Dagger" in [item.name for item in loader.get_items_by_stat(StatType.AP)]
+        assert "Dagger" not in [item.name for item in loader.get_items_by_stat(StatType.AS)]
+
+        loader.load_items(force_reload=True)
+        assert loader.get_stat_index() is not replaced
+        assert "Dagger" in [item.name for item in loader.get_items_by_stat(StatType.AS)]
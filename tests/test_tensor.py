@@ -0,0 +1,87 @@
+"""
+🔥 SmashBuilder - Testes da Avaliação em Tensor 🔥
+Testes do tensor builds × alvos × níveis contra o cálculo escalar
+"""
+
+import numpy as np
+import pytest
+
+from calc.models import Build, PRESET_TARGETS, PRESET_RUNES
+from calc.formulas import FormulaEngine
+from calc.tensor import TensorEvaluator, TENSOR_METRICS
+from data_io.loader import DataLoader
+
+class TestTensorEvaluator:
+    """Testes para o TensorEvaluator"""
+
+    def setup_method(self):
+        """Setup para cada teste"""
+        self.loader = DataLoader()
+        self.engine = FormulaEngine()
+        self.evaluator = TensorEvaluator(self.engine)
+        items = self.loader.load_items()
+        self.builds = [
+            Build(name="Crit", champion=self.loader.get_champion("jinx"), level=1,
+                  items=[items["kraken slayer"], items["infinity edge"]], runes=PRESET_RUNES["ad_carry"]),
+            Build(name="Empty", champion=self.loader.get_champion("vayne"), level=18),
+            Build(name="Tank", champion=self.loader.get_champion("jinx"), level=9,
+                  items=[items["sunfire aegis"], items["chain vest"]], target=PRESET_TARGETS["adc"]),
+        ]
+        self.targets = list(PRESET_TARGETS.values())
+
+    def test_matches_scalar_pipeline(self):
+        """Cada célula é idêntica a calculate_final_stats com o alvo e o nível da célula"""
+        result = self.evaluator.evaluate(self.builds, self.targets, levels=[1, 7, 18])
+
+        assert result.shape == (3, len(self.targets), 3)
+        assert result.tensor().shape == (3, len(self.targets), 3, len(TENSOR_METRICS))
+        for b, build in enumerate(self.builds):
+            for t, target in enumerate(self.targets):
+                for l, level in enumerate(result.levels):
+                    cell = build.model_copy(update={'level': level, 'target': target})
+                    expected = self.engine.calculate_final_stats(cell)
+                    assert result.dps[b, t, l] == expected.dps
+                    assert result.ttk[b, t, l] == expected.ttk
+                    assert result.metric('effective_hp_physical')[b, t, l] == expected.effective_hp_physical
+
+    def test_default_levels_and_rows(self):
+        """Níveis padrão 1-18 e formato longo com uma linha por célula"""
+        result = self.evaluator.evaluate(self.builds[:1], self.targets[:2])
+
+        assert result.levels == list(range(1, 19))
+        rows = result.rows()
+        assert len(rows) == 2 * 18
+        assert rows[0]['build'] == "Crit" and rows[0]['level'] == 1
+        assert np.all(np.diff(result.dps[0], axis=1) >= 0)
+
+    def test_empty_builds(self):
+        """Sem builds o tensor é vazio, com os eixos de alvos e níveis"""
+        result = self.evaluator.evaluate([], self.targets, levels=[1, 9, 18])
+
+        assert result.shape == (0, len(self.targets), 3)
+        assert result.tensor().shape == (0, len(self.targets), 3, len(TENSOR_METRICS))
+        assert result.stats.shape[:2] == (0, 3)
+        assert result.rows() == []
+
+    def test_dps_batch_broadcasts_targets(self):
+        """calculate_dps_batch em broadcast dá o mesmo que uma linha por (build, alvo)"""
+        stats = self.evaluator.evaluate(self.builds, self.targets, levels=[18]).stats[:, 0, :]
+        hp = np.array([target.hp for target in self.targets], dtype=float)
+        armor = np.array([target.armor for target in self.targets], dtype=float)
+
+        dps, ttk = self.engine.calculate_dps_batch(stats[:, None, :], hp[None, :], armor[None, :])
+        flat_dps, flat_ttk = self.engine.calculate_dps_batch(np.repeat(stats, len(hp), axis=0),
+                                                             np.tile(hp, len(stats)), np.tile(armor, len(stats)))
+
+        assert dps.shape == (len(self.builds), len(self.targets))
+        assert np.array_equal(dps.ravel(), flat_dps)
+        assert np.array_equal(ttk.ravel(), flat_ttk)
+
+    def test_invalid_input(self):
+        """Níveis fora do intervalo, alvos ausentes e métricas desconhecidas são rejeitados"""
+        with pytest.raises(ValueError):
+            self.evaluator.evaluate(self.builds, self.targets, levels=[0])
+        with pytest.raises(ValueError):
+            self.evaluator.evaluate(self.builds, [])
+        with pytest.raises(ValueError):
+            self.evaluator.evaluate(self.builds, self.targets, levels=[5]).metric("gold")